@@ -26,7 +26,7 @@ from django.utils import timezone
 from django.utils.datetime_safe import date, datetime
 from django.utils.decorators import method_decorator
 from django.views.generic import (DetailView, CreateView, View,
-                                  ListView, UpdateView, TemplateView)
+                                  ListView, UpdateView)
 from django.views.generic.detail import SingleObjectMixin
 from django.shortcuts import get_object_or_404
 from django.views.generic.edit import FormMixin, DeleteView
@@ -51,6 +51,7 @@ from persona.forms import FisicoForm, AntecedenteForm, PersonaForm, \
 from persona.models import Fisico, Antecedente, AntecedenteFamiliar, \
     AntecedenteObstetrico, AntecedenteQuirurgico, EstiloVida, Persona
 from persona.views import PersonaFormMixin
+from statistics.reportes import Agregado, PeriodoView, ReportePeriodoView
 from users.mixins import LoginRequiredMixin, CurrentUserFormMixin
 
 
@@ -286,102 +287,62 @@ class CitaPersonaCreateView(CreateView, PersonaFormMixin, LoginRequiredMixin):
     form_class = CitaPersonaForm
 
 
-class CitaPeriodoView(TemplateView, LoginRequiredMixin):
+class CitaPeriodoView(PeriodoView, LoginRequiredMixin):
     """Muestra los contratos de un periodo"""
     template_name = 'clinique/cita_periodo.html'
-
-    def dispatch(self, request, *args, **kwargs):
-        self.form = PeriodoForm(request.GET, prefix='cita-periodo')
-
-        if self.form.is_valid():
-            self.inicio = self.form.cleaned_data['inicio']
-            self.fin = datetime.combine(self.form.cleaned_data['fin'], time.max)
-            self.citas = Cita.objects.filter(
-                fecha__gte=self.inicio,
-                fecha__lte=self.fin
-            )
-        return super(CitaPeriodoView, self).dispatch(request, *args, **kwargs)
+    prefijo = 'cita-periodo'
+    redireccion = 'consultorio-index'
 
     def get_context_data(self, **kwargs):
         context = super(CitaPeriodoView, self).get_context_data(**kwargs)
 
-        context['citas'] = self.citas
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
+        context['citas'] = Cita.objects.filter(
+            fecha__range=(self.inicio, self.fin)
+        ).select_related('persona', 'consultorio')
 
         return context
 
 
-class DiagnosticoPeriodoView(TemplateView, LoginRequiredMixin):
+class DiagnosticoPeriodoView(ReportePeriodoView, LoginRequiredMixin):
     """Muestra los :class:`DiagnosticoClinico` de un periodo"""
     template_name = 'clinique/diagnostico_periodo.html'
-
-    def dispatch(self, request, *args, **kwargs):
-        self.form = PeriodoForm(request.GET, prefix='diagnostico-periodo')
-
-        if self.form.is_valid():
-            self.inicio = self.form.cleaned_data['inicio']
-            self.fin = datetime.combine(self.form.cleaned_data['fin'], time.max)
-            self.diagnosticos = DiagnosticoClinico.objects.filter(
-                created__gte=self.inicio,
-                created__lte=self.fin
-            ).order_by('paciente__consultorio')
-        return super(DiagnosticoPeriodoView, self).dispatch(request, *args,
-                                                            **kwargs)
+    prefijo = 'diagnostico-periodo'
+    redireccion = 'consultorio-index'
+    reportes = {
+        'consultorios': Agregado(DiagnosticoClinico,
+                                 ('paciente__consultorio', ),
+                                 (('cantidad', Count('id')), ),
+                                 orden=('-cantidad', ),
+                                 relaciones={
+                                     'paciente__consultorio': Consultorio}),
+    }
 
     def get_context_data(self, **kwargs):
         context = super(DiagnosticoPeriodoView, self).get_context_data(**kwargs)
 
-        context['diagnosticos'] = self.diagnosticos
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
-        context['total'] = self.diagnosticos.count()
-
-        DiagnosticoClinico.objects.values('paciente__consultorio').annotate(
-            consultorio_count=Count('paciente__consultorio')
-        ).filter(created__gte=self.inicio, created__lte=self.fin)
-
-        cons = defaultdict(int)
-        consultorios = Consultorio.objects.all()
-        for consultorio in consultorios:
-            cons[consultorio] = DiagnosticoClinico.objects.filter(
-                created__gte=self.inicio, created__lte=self.fin,
-                paciente__consultorio=consultorio).count()
-
-        cons = dict((k, v) for k, v in cons.items() if v > 0)
-
-        context['consultorios'] = reversed(
-            sorted(cons.iteritems(), key=lambda x: x[1]))
-        context['consultorio_graph'] = reversed(
-            sorted(cons.iteritems(), key=lambda x: x[1]))
-        context['consultorio_graph2'] = reversed(
-            sorted(cons.iteritems(), key=lambda x: x[1]))
+        context['diagnosticos'] = DiagnosticoClinico.objects.filter(
+            created__range=(self.inicio, self.fin)
+        ).select_related(
+            'paciente__persona', 'paciente__consultorio'
+        ).order_by('paciente__consultorio')
+        context['total'] = sum(c[1] for c in context['consultorios'])
+        context['consultorio_graph'] = context['consultorios']
+        context['consultorio_graph2'] = context['consultorios']
 
         return context
 
 
-class CargoPeriodoView(TemplateView, LoginRequiredMixin):
+class CargoPeriodoView(PeriodoView, LoginRequiredMixin):
     """Muestra los :class:`Cargo` de un periodo"""
     template_name = 'clinique/cargo_periodo.html'
-
-    def dispatch(self, request, *args, **kwargs):
-        self.form = PeriodoForm(request.GET, prefix='cargo-periodo')
-
-        if self.form.is_valid():
-            self.inicio = self.form.cleaned_data['inicio']
-            self.fin = datetime.combine(self.form.cleaned_data['fin'], time.max)
-            self.cargos = Cargo.objects.filter(
-                created__gte=self.inicio,
-                created__lte=self.fin
-            )
-        return super(CargoPeriodoView, self).dispatch(request, *args, **kwargs)
+    prefijo = 'cargo-periodo'
+    redireccion = 'consultorio-index'
 
     def get_context_data(self, **kwargs):
         context = super(CargoPeriodoView, self).get_context_data(**kwargs)
 
-        context['cargos'] = self.cargos
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
+        context['cargos'] = Cargo.objects.filter(
+            created__range=(self.inicio, self.fin))
 
         context['cuenta'] = ItemTemplate.objects.values('descripcion').annotate(
             cargo_count=Count('consultorio_cargos')).filter(
@@ -430,29 +391,18 @@ class EvaluacionUpdateView(UpdateView, LoginRequiredMixin):
     form_class = EvaluacionForm
 
 
-class EvaluacionPeriodoView(TemplateView, LoginRequiredMixin):
+class EvaluacionPeriodoView(PeriodoView, LoginRequiredMixin):
     """Muestra los :class:`Evaluacion` de un periodo"""
     template_name = 'clinique/evaluacion_periodo.html'
-
-    def dispatch(self, request, *args, **kwargs):
-        self.form = PeriodoForm(request.GET, prefix='evaluacion-periodo')
-
-        if self.form.is_valid():
-            self.inicio = self.form.cleaned_data['inicio']
-            self.fin = datetime.combine(self.form.cleaned_data['fin'], time.max)
-            self.evaluaciones = Evaluacion.objects.filter(
-                created__gte=self.inicio,
-                created__lte=self.fin
-            ).order_by('paciente__consultorio')
-        return super(EvaluacionPeriodoView, self).dispatch(request, *args,
-                                                            **kwargs)
+    prefijo = 'evaluacion-periodo'
+    redireccion = 'consultorio-index'
 
     def get_context_data(self, **kwargs):
         context = super(EvaluacionPeriodoView, self).get_context_data(**kwargs)
 
-        context['evaluaciones'] = self.evaluaciones
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
+        context['evaluaciones'] = Evaluacion.objects.filter(
+            created__range=(self.inicio, self.fin)
+        ).order_by('paciente__consultorio')
 
         return context
 
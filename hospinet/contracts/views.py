@@ -445,7 +445,7 @@ class ContratoPeriodoView(TemplateView, LoginRequiredMixin):
                 inicio__gte=self.inicio,
                 inicio__lte=self.fin,
                 plan__empresarial=False
-            )
+            ).select_related('persona')
         return super(ContratoPeriodoView, self).dispatch(request, *args,
                                                          **kwargs)
 
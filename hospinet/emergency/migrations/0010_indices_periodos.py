@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Indices para los filtros por periodo y pendientes de facturar
+        db.execute('CREATE INDEX emergency_emergencia_created ON emergency_emergencia (created)')
+        db.execute('CREATE INDEX emergency_emergencia_pendiente ON emergency_emergencia (id) WHERE facturada = false')
+        db.execute('CREATE INDEX emergency_cobro_pendiente ON emergency_cobro (emergencia_id) WHERE facturado = false')
+
+
+    def backwards(self, orm):
+        db.execute('DROP INDEX emergency_emergencia_created')
+        db.execute('DROP INDEX emergency_emergencia_pendiente')
+        db.execute('DROP INDEX emergency_cobro_pendiente')
+
+
+    models = {
+        u'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        u'auth.permission': {
+            'Meta': {'ordering': "(u'content_type__app_label', u'content_type__model', u'codename')", 'unique_together': "((u'content_type', u'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['contenttypes.ContentType']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        u'auth.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Group']", 'symmetrical': 'False', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        u'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        u'emergency.cobro': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Cobro'},
+            'cantidad': ('django.db.models.fields.IntegerField', [], {'default': '1'}),
+            'cargo': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'cobros'", 'to': u"orm['inventory.ItemTemplate']"}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'emergencia': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'cobros'", 'to': u"orm['emergency.Emergencia']"}),
+            'facturado': ('django.db.models.fields.NullBooleanField', [], {'default': 'False', 'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'})
+        },
+        u'emergency.diagnostico': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Diagnostico'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'diagnostico': ('django.db.models.fields.TextField', [], {}),
+            'emergencia': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'diagnosticos'", 'to': u"orm['emergency.Emergencia']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'er_diagnosticos'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'emergency.emergencia': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Emergencia'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'facturada': ('django.db.models.fields.NullBooleanField', [], {'default': 'False', 'null': 'True', 'blank': 'True'}),
+            'frecuencia_cardiaca': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '8', 'decimal_places': '2', 'blank': 'True'}),
+            'frecuencia_respiratoria': ('django.db.models.fields.IntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'historia_enfermedad_actual': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'observacion': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'persona': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'emergencias'", 'to': u"orm['persona.Persona']"}),
+            'presion': ('django.db.models.fields.CharField', [], {'max_length': '100', 'null': 'True', 'blank': 'True'}),
+            'saturacion_de_oxigeno': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '8', 'decimal_places': '2', 'blank': 'True'}),
+            'temperatura': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '8', 'decimal_places': '2', 'blank': 'True'}),
+            'tipo_de_venta': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['inventory.TipoVenta']", 'null': 'True', 'blank': 'True'}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'emergencias'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'emergency.examenfisico': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'ExamenFisico'},
+            'cardiopulmonar': ('django.db.models.fields.TextField', [], {}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'emergencia': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'examenes_fisicos'", 'to': u"orm['emergency.Emergencia']"}),
+            'extremidades': ('django.db.models.fields.TextField', [], {}),
+            'gastrointestinal': ('django.db.models.fields.TextField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'orl': ('django.db.models.fields.TextField', [], {}),
+            'otras': ('django.db.models.fields.TextField', [], {}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'examenes_fisicos'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'emergency.hallazgo': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Hallazgo'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'emergencia': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'hallazgos'", 'to': u"orm['emergency.Emergencia']"}),
+            'hallazgo': ('django.db.models.fields.TextField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'hallazgos'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'emergency.remisionexterna': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'RemisionExterna'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'destino': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'diagnostico': ('django.db.models.fields.TextField', [], {}),
+            'emergencia': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'remisiones_externas'", 'to': u"orm['emergency.Emergencia']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'notas': ('django.db.models.fields.TextField', [], {}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'er_rexternas'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'emergency.remisioninterna': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'RemisionInterna'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'doctor': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'emergencia': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'remisiones_internas'", 'to': u"orm['emergency.Emergencia']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'er_rinternas'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'emergency.tratamiento': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Tratamiento'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'emergencia': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'tratamientos'", 'to': u"orm['emergency.Emergencia']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'indicaciones': ('django.db.models.fields.TextField', [], {}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'er_tratamientos'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'inventory.itemtemplate': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'ItemTemplate'},
+            'activo': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'comision': ('django.db.models.fields.DecimalField', [], {'default': "'30.00'", 'max_digits': '4', 'decimal_places': '2'}),
+            'costo': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'impuestos': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'item_type': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'items'", 'null': 'True', 'symmetrical': 'False', 'to': u"orm['inventory.ItemType']"}),
+            'marca': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'}),
+            'modelo': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'notas': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'precio_de_venta': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'suppliers': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'plantillas'", 'null': 'True', 'symmetrical': 'False', 'to': u"orm['inventory.Proveedor']"}),
+            'unidad_de_medida': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'})
+        },
+        u'inventory.itemtype': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'ItemType'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '255'})
+        },
+        u'inventory.proveedor': {
+            'Meta': {'object_name': 'Proveedor'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'})
+        },
+        u'inventory.tipoventa': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'TipoVenta'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'disminucion': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'incremento': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'})
+        },
+        u'persona.persona': {
+            'Meta': {'object_name': 'Persona'},
+            'apellido': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+            'celular': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'domicilio': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'email': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'estado_civil': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'}),
+            'fax': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'fotografia': ('sorl.thumbnail.fields.ImageField', [], {'max_length': '100', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'identificacion': ('django.db.models.fields.CharField', [], {'max_length': '20', 'blank': 'True'}),
+            'nacimiento': ('django.db.models.fields.DateField', [], {'default': 'datetime.date.today'}),
+            'nacionalidad': ('persona.fields.OrderedCountryField', [], {'max_length': '2', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+            'profesion': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'sexo': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'}),
+            'telefono': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'tipo_identificacion': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['emergency']
\ No newline at end of file
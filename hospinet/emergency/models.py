@@ -19,7 +19,7 @@ from collections import defaultdict
 
 from constance import config
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django_extensions.db.models import TimeStampedModel
@@ -67,10 +67,16 @@ class Emergencia(TimeStampedModel):
     def facturar(self):
         items = defaultdict(int)
 
-        for cargo in self.cobros.filter(facturado=False).all():
-            items[cargo.cargo] += cargo.cantidad
-            cargo.facturado = True
-            cargo.save()
+        with transaction.atomic():
+            pendientes = self.cobros.filter(facturado=False)
+            cobros = pendientes.order_by().values('cargo').annotate(
+                cantidad=models.Sum('cantidad'))
+            cobros = dict((c['cargo'], c['cantidad']) for c in cobros)
+
+            for item in ItemTemplate.objects.filter(pk__in=cobros.keys()):
+                items[item] += cobros[item.id]
+
+            pendientes.update(facturado=True)
 
         horas = self.tiempo()
 
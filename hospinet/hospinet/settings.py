@@ -164,6 +164,7 @@ MIDDLEWARE_CLASSES = (
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'statistics.middleware.PerfilConsultasMiddleware',
 )
 
 ROOT_URLCONF = 'hospinet.urls'
@@ -291,3 +292,11 @@ CONSTANCE_CONFIG = {
 #EMAIL_HOST_PASSWORD = 'password'
 
 CRISPY_TEMPLATE_PACK = 'bootstrap3'
+
+# Perfilado de consultas SQL por petición, ver el comando perfil_consultas
+PERFILADO_SQL = False
+PERFILADO_SQL_ARCHIVO = os.path.join(PROJECT_PATH, 'perfil_sql.log')
+PERFILADO_SQL_MUESTREO = 1.0
+
+# Registros que siembran las pruebas de presupuesto de consultas en cada paso
+RENDIMIENTO_ESCALA = 10
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Indices para los filtros por periodo y pendientes de facturar
+        db.execute('CREATE INDEX imaging_examen_fecha ON imaging_examen (fecha)')
+        db.execute('CREATE INDEX imaging_examen_pendiente ON imaging_examen (id) WHERE facturado = false')
+
+
+    def backwards(self, orm):
+        db.execute('DROP INDEX imaging_examen_fecha')
+        db.execute('DROP INDEX imaging_examen_pendiente')
+
+
+    models = {
+        u'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        u'auth.permission': {
+            'Meta': {'ordering': "(u'content_type__app_label', u'content_type__model', u'codename')", 'unique_together': "((u'content_type', u'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['contenttypes.ContentType']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        u'auth.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Group']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Permission']"}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        u'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        u'imaging.adjunto': {
+            'Meta': {'object_name': 'Adjunto'},
+            'archivo': ('django.db.models.fields.files.FileField', [], {'max_length': '100'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'examen': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'adjuntos'", 'to': u"orm['imaging.Examen']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'})
+        },
+        u'imaging.dicom': {
+            'Meta': {'object_name': 'Dicom'},
+            'archivo': ('django.db.models.fields.files.FileField', [], {'max_length': '100'}),
+            'convertido': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'examen': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'dicoms'", 'to': u"orm['imaging.Examen']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'imagen': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'blank': 'True'}),
+            'uuid': ('django.db.models.fields.CharField', [], {'max_length': '36', 'blank': 'True'})
+        },
+        u'imaging.estudio': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Estudio'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'examen': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'estudios'", 'to': u"orm['imaging.Examen']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'tipo_de_examen': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'estudios'", 'to': u"orm['imaging.TipoExamen']"})
+        },
+        u'imaging.estudioprogramado': {
+            'Meta': {'object_name': 'EstudioProgramado'},
+            'efectuado': ('django.db.models.fields.NullBooleanField', [], {'default': 'False', 'null': 'True', 'blank': 'True'}),
+            'fecha': ('django.db.models.fields.DateField', [], {'default': 'datetime.date.today'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'persona': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'estudios_progamados'", 'to': u"orm['persona.Persona']"}),
+            'radiologo': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'estudios'", 'to': u"orm['imaging.Radiologo']"}),
+            'remitio': ('django.db.models.fields.CharField', [], {'max_length': '200'}),
+            'tecnico': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'estudios'", 'null': 'True', 'to': u"orm['imaging.Tecnico']"}),
+            'tipo_de_examen': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'estudios_progamados'", 'to': u"orm['imaging.TipoExamen']"}),
+            'tipo_de_venta': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'estudios'", 'to': u"orm['inventory.TipoVenta']"}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'estudios_programados'", 'null': 'True', 'to': u"orm['auth.User']"})
+        },
+        u'imaging.examen': {
+            'Meta': {'object_name': 'Examen'},
+            'facturado': ('django.db.models.fields.NullBooleanField', [], {'default': 'False', 'null': 'True', 'blank': 'True'}),
+            'fecha': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'persona': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'examenes'", 'to': u"orm['persona.Persona']"}),
+            'radiologo': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'examenes'", 'to': u"orm['imaging.Radiologo']"}),
+            'remitio': ('django.db.models.fields.CharField', [], {'max_length': '200', 'null': 'True'}),
+            'tecnico': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'examenes'", 'null': 'True', 'to': u"orm['imaging.Tecnico']"}),
+            'tipo_de_examen': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'examenes'", 'to': u"orm['imaging.TipoExamen']"}),
+            'tipo_de_venta': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'examenes'", 'to': u"orm['inventory.TipoVenta']"}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'estudios_realizados'", 'null': 'True', 'to': u"orm['auth.User']"}),
+            'uuid': ('django.db.models.fields.CharField', [], {'max_length': '36', 'blank': 'True'})
+        },
+        u'imaging.imagen': {
+            'Meta': {'object_name': 'Imagen'},
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'examen': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'imagenes'", 'to': u"orm['imaging.Examen']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'imagen': ('django.db.models.fields.files.ImageField', [], {'max_length': '100'})
+        },
+        u'imaging.radiologo': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Radiologo'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'item': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['inventory.ItemTemplate']", 'null': 'True', 'blank': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'porcentaje': ('django.db.models.fields.IntegerField', [], {'default': '30'})
+        },
+        u'imaging.tecnico': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Tecnico'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'item': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['inventory.ItemTemplate']", 'null': 'True', 'blank': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'porcentaje': ('django.db.models.fields.IntegerField', [], {'default': '10'})
+        },
+        u'imaging.tipoexamen': {
+            'Meta': {'object_name': 'TipoExamen'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'item': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['inventory.ItemTemplate']", 'null': 'True', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '200'})
+        },
+        u'inventory.itemtemplate': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'ItemTemplate'},
+            'activo': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'comision': ('django.db.models.fields.DecimalField', [], {'default': "'30.00'", 'max_digits': '4', 'decimal_places': '2'}),
+            'comision2': ('django.db.models.fields.DecimalField', [], {'default': "'10.00'", 'max_digits': '4', 'decimal_places': '2'}),
+            'costo': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'impuestos': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'item_type': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'items'", 'null': 'True', 'symmetrical': 'False', 'to': u"orm['inventory.ItemType']"}),
+            'marca': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'}),
+            'modelo': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'notas': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'precio_de_venta': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'suppliers': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'plantillas'", 'null': 'True', 'symmetrical': 'False', 'to': u"orm['inventory.Proveedor']"}),
+            'unidad_de_medida': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'})
+        },
+        u'inventory.itemtype': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'ItemType'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '255'})
+        },
+        u'inventory.proveedor': {
+            'Meta': {'object_name': 'Proveedor'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'})
+        },
+        u'inventory.tipoventa': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'TipoVenta'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'disminucion': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'incremento': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'})
+        },
+        u'persona.persona': {
+            'Meta': {'object_name': 'Persona'},
+            'apellido': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+            'celular': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'domicilio': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'email': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'estado_civil': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'}),
+            'fax': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'fotografia': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'identificacion': ('django.db.models.fields.CharField', [], {'max_length': '20', 'blank': 'True'}),
+            'nacimiento': ('django.db.models.fields.DateField', [], {'default': 'datetime.date.today'}),
+            'nacionalidad': ('persona.fields.OrderedCountryField', [], {'max_length': '2', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+            'profesion': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'sexo': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'}),
+            'telefono': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'tipo_identificacion': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['imaging']
\ No newline at end of file
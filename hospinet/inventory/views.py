@@ -110,7 +110,7 @@ class InventarioDetailView(SingleObjectMixin, ListView, LoginRequiredMixin):
 
     def get_queryset(self):
         self.object = self.get_object(Inventario.objects.all())
-        return self.object.items.all()
+        return self.object.items.select_related('plantilla').all()
 
 
 class InventarioMixin(View):
@@ -102,6 +102,13 @@ class PeriodoForm(forms.Form):
     def set_action(self, action):
         self.helper.form_action = action
 
+    def permitir_segundo_plano(self):
+        """Agrega la opción de generar el reporte en segundo plano"""
+
+        self.helper.add_input(Submit('segundo_plano',
+                                     u'Generar en Segundo Plano',
+                                     css_class='btn-default'))
+
 
 class EmergenciaFacturarForm(FieldSetModelFormMixin):
     class Meta:
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import timedelta
+from decimal import Decimal
+from optparse import make_option
+import random
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from emergency.models import Emergencia, Cobro
+from imaging.models import Examen
+from inventory.models import ItemTemplate
+from invoice.models import Recibo, Venta, Pago, TipoPago
+from persona.models import Persona
+from spital.models import Admision
+
+# Tipos de recorrido que se deshabilitan para medir sin indices
+RECORRIDOS = ('enable_indexscan', 'enable_indexonlyscan', 'enable_bitmapscan')
+
+
+class Revertir(Exception):
+    pass
+
+
+class Command(BaseCommand):
+
+    """Ejecuta EXPLAIN ANALYZE sobre las consultas de los reportes con y sin
+    recorridos por indices, opcionalmente sobre :class:`Recibo`s sembrados
+
+    Los indices no se eliminan, las consultas sin indices se planifican luego
+    de deshabilitar los recorridos por indices únicamente para la transacción
+    mediante SET LOCAL. Cada consulta se ejecuta una vez antes de medirla y se
+    toma el menor de varios tiempos, de manera que ambas mediciones se hagan
+    con los datos ya en memoria.
+
+    Todo se efectua dentro de una transacción que se revierte al finalizar,
+    por lo que los datos sembrados no persisten"""
+
+    option_list = BaseCommand.option_list + (
+        make_option('--sembrar', type='int', default=0,
+                    help=u'Cantidad de recibos de prueba a crear'),
+        make_option('--dias', type='int', default=30,
+                    help=u'Duración del periodo consultado en días'),
+        make_option('--repeticiones', type='int', default=3,
+                    help=u'Veces que se mide cada consulta'),
+    )
+
+    def handle(self, *args, **options):
+
+        self.verbosity = int(options.get('verbosity', 1))
+        repeticiones = max(options['repeticiones'], 1)
+
+        try:
+            with transaction.atomic():
+                if options['sembrar']:
+                    self.sembrar(options['sembrar'])
+
+                fin = timezone.now()
+                inicio = fin - timedelta(days=options['dias'])
+
+                self.medir(inicio, fin, 1)
+                con_indices = self.medir(inicio, fin, repeticiones)
+                cursor = connection.cursor()
+                for recorrido in RECORRIDOS:
+                    cursor.execute('SET LOCAL {0} = off'.format(recorrido))
+                sin_indices = self.medir(inicio, fin, repeticiones)
+
+                raise Revertir()
+        except Revertir:
+            pass
+
+        self.stdout.write(u'{0:<35} {1:>12} {2:>12}'.format(
+            u'Consulta', u'Sin indices', u'Con indices'))
+        for nombre, tiempo in sin_indices:
+            self.stdout.write(u'{0:<35} {1:>10.3f}ms {2:>10.3f}ms'.format(
+                nombre, tiempo, dict(con_indices)[nombre]))
+
+    def consultas(self, inicio, fin):
+
+        recibos = Recibo.objects.filter(created__range=(inicio, fin))
+        cajero = User.objects.order_by('id').first()
+        item = ItemTemplate.objects.order_by('id').first()
+
+        return (
+            (u'Recibos del periodo', recibos),
+            (u'Recibos no anulados', recibos.filter(nulo=False)),
+            (u'Recibos del cajero', recibos.filter(cajero=cajero)),
+            (u'Ventas de un producto', Venta.objects.filter(
+                recibo__created__range=(inicio, fin), recibo__nulo=False,
+                item=item)),
+            (u'Pagos por tipo', Pago.objects.filter(
+                recibo__in=recibos.filter(cajero=cajero)).values(
+                'tipo').annotate(monto=models.Sum('monto')).order_by()),
+            (u'Admisiones del periodo', Admision.objects.filter(
+                admision__range=(inicio, fin))),
+            (u'Admisiones por momento', Admision.objects.filter(
+                momento__range=(inicio, fin))),
+            (u'Admisiones pendientes', Admision.objects.filter(
+                facturada=False).order_by('id')),
+            (u'Emergencias del periodo', Emergencia.objects.filter(
+                created__range=(inicio, fin))),
+            (u'Emergencias pendientes', Emergencia.objects.filter(
+                facturada=False).order_by('id')),
+            (u'Cobros pendientes', Cobro.objects.filter(
+                emergencia__facturada=False, facturado=False)),
+            (u'Examenes del periodo', Examen.objects.filter(
+                fecha__range=(inicio, fin))),
+            (u'Examenes pendientes', Examen.objects.filter(
+                facturado=False).order_by('-id')),
+        )
+
+    def medir(self, inicio, fin, repeticiones):
+        """Devuelve el menor tiempo de ejecución en milisegundos de cada
+        consulta"""
+
+        cursor = connection.cursor()
+        tiempos = list()
+
+        for nombre, consulta in self.consultas(inicio, fin):
+            sql, parametros = consulta.query.sql_with_params()
+            mediciones = list()
+
+            for n in range(repeticiones):
+                cursor.execute(u'EXPLAIN ANALYZE ' + sql, parametros)
+                plan = u'\n'.join(fila[0] for fila in cursor.fetchall())
+                tiempo = re.search(
+                    r'(?:Total runtime|Execution time): ([\d.]+)', plan, re.I)
+                mediciones.append(float(tiempo.group(1)) if tiempo else 0)
+
+            tiempos.append((nombre, min(mediciones)))
+
+            if self.verbosity > 1:
+                self.stdout.write(u'{0}\n{1}\n'.format(nombre, plan))
+
+        return tiempos
+
+    def sembrar(self, cantidad):
+        """Crea :class:`Recibo`s distribuidos durante el último año, cada uno
+        con una :class:`Venta` y un :class:`Pago`"""
+
+        cliente = Persona.objects.order_by('id').first()
+        item = ItemTemplate.objects.order_by('id').first()
+        tipo = TipoPago.objects.order_by('id').first()
+        cajeros = list(User.objects.values_list('id', flat=True))
+
+        if cliente is None or item is None or tipo is None or not cajeros:
+            raise CommandError(u'Se requiere al menos una Persona, un '
+                               u'ItemTemplate, un TipoPago y un Usuario')
+
+        ahora = timezone.now()
+        Recibo.objects.bulk_create(
+            Recibo(cliente=cliente, cajero_id=random.choice(cajeros),
+                   nulo=random.random() < 0.05,
+                   created=ahora - timedelta(minutes=random.randint(
+                       0, 365 * 24 * 60)))
+            for n in range(cantidad))
+
+        recibos = Recibo.objects.order_by('-id').values_list(
+            'id', flat=True)[:cantidad]
+        Venta.objects.bulk_create(
+            Venta(recibo_id=recibo, item=item, cantidad=1,
+                  precio=item.precio_de_venta, impuesto=item.impuestos)
+            for recibo in recibos)
+        Pago.objects.bulk_create(
+            Pago(recibo_id=recibo, tipo=tipo, monto=Decimal('100'))
+            for recibo in recibos)
+
+        cursor = connection.cursor()
+        cursor.execute('ANALYZE')
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from invoice.models import Recibo, Comision
+
+
+class Command(BaseCommand):
+
+    """Vuelve a generar las :class:`Comision`es de radiologos y médicos que
+    remiten de los :class:`Recibo`s creados en un rango de fechas
+
+    Las :class:`Comision`es de los técnicos solo se registran al facturar un
+    :class:`Examen`, por lo que no se reconstruyen"""
+
+    args = 'inicio [fin] (AAAA-MM-DD)'
+
+    def handle(self, *args, **options):
+
+        if not args or len(args) > 2:
+            raise CommandError(u'Indique la fecha de inicio y opcionalmente '
+                               u'la fecha final del periodo')
+
+        try:
+            fechas = [datetime.strptime(a, '%Y-%m-%d').date() for a in args]
+        except ValueError:
+            raise CommandError(u'Las fechas deben tener el formato AAAA-MM-DD')
+
+        zona = timezone.get_current_timezone()
+        inicio = timezone.make_aware(datetime.combine(fechas[0], time.min),
+                                     zona)
+        fin = timezone.make_aware(datetime.combine(fechas[-1], time.max), zona)
+
+        cantidad = 0
+        recibos = Recibo.objects.filter(created__range=(inicio, fin))
+        for recibo in recibos.iterator():
+            Comision.objects.registrar(recibo)
+            cantidad += 1
+
+        self.stdout.write(u'Comisiones de {0} recibos reconstruidas del {1} '
+                          u'al {2}'.format(cantidad, fechas[0], fechas[-1]))
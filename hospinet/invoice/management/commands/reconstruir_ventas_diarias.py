@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from invoice.models import VentaDiaria
+
+
+class Command(BaseCommand):
+
+    """Vuelve a calcular las :class:`VentaDiaria` de un rango de fechas"""
+
+    args = 'inicio [fin] (AAAA-MM-DD)'
+
+    def handle(self, *args, **options):
+
+        if not args or len(args) > 2:
+            raise CommandError(u'Indique la fecha de inicio y opcionalmente '
+                               u'la fecha final del periodo')
+
+        try:
+            fechas = [datetime.strptime(a, '%Y-%m-%d').date() for a in args]
+        except ValueError:
+            raise CommandError(u'Las fechas deben tener el formato AAAA-MM-DD')
+
+        inicio = fechas[0]
+        fin = fechas[-1]
+        VentaDiaria.objects.reconstruir(inicio, fin)
+
+        self.stdout.write(u'Ventas diarias reconstruidas del {0} al {1}'.format(
+            inicio, fin))
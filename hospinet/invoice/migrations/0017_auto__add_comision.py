@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'Comision'
+        db.create_table(u'invoice_comision', (
+            (u'id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('recibo', self.gf('django.db.models.fields.related.ForeignKey')(related_name='comisiones', to=orm['invoice.Recibo'])),
+            ('venta', self.gf('django.db.models.fields.related.ForeignKey')(blank=True, related_name='comisiones', null=True, to=orm['invoice.Venta'])),
+            ('tipo', self.gf('django.db.models.fields.CharField')(max_length=1)),
+            ('beneficiario', self.gf('django.db.models.fields.CharField')(max_length=255)),
+            ('fecha', self.gf('django.db.models.fields.DateTimeField')(db_index=True)),
+            ('base', self.gf('django.db.models.fields.DecimalField')(default=0, max_digits=11, decimal_places=2)),
+            ('porcentaje', self.gf('django.db.models.fields.DecimalField')(default=0, max_digits=7, decimal_places=2)),
+            ('monto', self.gf('django.db.models.fields.DecimalField')(default=0, max_digits=11, decimal_places=2)),
+        ))
+        db.send_create_signal(u'invoice', ['Comision'])
+
+
+    def backwards(self, orm):
+        # Deleting model 'Comision'
+        db.delete_table(u'invoice_comision')
+
+
+    models = {
+        u'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        u'auth.permission': {
+            'Meta': {'ordering': "(u'content_type__app_label', u'content_type__model', u'codename')", 'unique_together': "((u'content_type', u'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['contenttypes.ContentType']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        u'auth.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Group']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "u'user_set'", 'blank': 'True', 'to': u"orm['auth.Permission']"}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        u'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        u'inventory.itemtemplate': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'ItemTemplate'},
+            'activo': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'comision': ('django.db.models.fields.DecimalField', [], {'default': "'30.00'", 'max_digits': '4', 'decimal_places': '2'}),
+            'costo': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'impuestos': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'item_type': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'items'", 'null': 'True', 'symmetrical': 'False', 'to': u"orm['inventory.ItemType']"}),
+            'marca': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'}),
+            'modelo': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'notas': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'precio_de_venta': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'suppliers': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'plantillas'", 'null': 'True', 'symmetrical': 'False', 'to': u"orm['inventory.Proveedor']"}),
+            'unidad_de_medida': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'})
+        },
+        u'inventory.itemtype': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'ItemType'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '255'})
+        },
+        u'inventory.proveedor': {
+            'Meta': {'object_name': 'Proveedor'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '255'})
+        },
+        u'inventory.tipoventa': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'TipoVenta'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'descripcion': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'disminucion': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'incremento': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '10', 'decimal_places': '2'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'})
+        },
+        u'invoice.cierreturno': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'CierreTurno'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'monto': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '7', 'decimal_places': '2', 'blank': 'True'}),
+            'pago': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'cierres'", 'to': u"orm['invoice.TipoPago']"}),
+            'turno': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'cierres'", 'to': u"orm['invoice.TurnoCaja']"})
+        },
+        u'invoice.comision': {
+            'Meta': {'object_name': 'Comision'},
+            'base': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '11', 'decimal_places': '2'}),
+            'beneficiario': ('django.db.models.fields.CharField', [], {'max_length': '255'}),
+            'fecha': ('django.db.models.fields.DateTimeField', [], {'db_index': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'monto': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '11', 'decimal_places': '2'}),
+            'porcentaje': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '7', 'decimal_places': '2'}),
+            'recibo': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'comisiones'", 'to': u"orm['invoice.Recibo']"}),
+            'tipo': ('django.db.models.fields.CharField', [], {'max_length': '1'}),
+            'venta': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'comisiones'", 'null': 'True', 'to': u"orm['invoice.Venta']"})
+        },
+        u'invoice.pago': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Pago'},
+            'comprobante': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'monto': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '7', 'decimal_places': '2', 'blank': 'True'}),
+            'recibo': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'pagos'", 'to': u"orm['invoice.Recibo']"}),
+            'tipo': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'pagos'", 'to': u"orm['invoice.TipoPago']"})
+        },
+        u'invoice.recibo': {
+            'Meta': {'object_name': 'Recibo'},
+            'cajero': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'recibos'", 'null': 'True', 'to': u"orm['auth.User']"}),
+            'cerrado': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'cliente': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'recibos'", 'to': u"orm['persona.Persona']"}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'discount': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '7', 'decimal_places': '2'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'nulo': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'radiologo': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'remite': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'}),
+            'tipo_de_venta': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['inventory.TipoVenta']", 'null': 'True', 'blank': 'True'})
+        },
+        u'invoice.tipopago': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'TipoPago'},
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '255', 'null': 'True', 'blank': 'True'})
+        },
+        u'invoice.turnocaja': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'TurnoCaja'},
+            'apertura': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '7', 'decimal_places': '2', 'blank': 'True'}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'fin': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'finalizado': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'inicio': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'usuario': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'turno_caja'", 'to': u"orm['auth.User']"})
+        },
+        u'invoice.venta': {
+            'Meta': {'ordering': "('-modified', '-created')", 'object_name': 'Venta'},
+            'cantidad': ('django.db.models.fields.IntegerField', [], {}),
+            'created': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'descontable': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'descripcion': ('django.db.models.fields.TextField', [], {'null': 'True', 'blank': 'True'}),
+            'descuento': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'impuesto': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '7', 'decimal_places': '2', 'blank': 'True'}),
+            'item': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'ventas'", 'null': 'True', 'to': u"orm['inventory.ItemTemplate']"}),
+            'modified': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now', 'blank': 'True'}),
+            'placas': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'precio': ('django.db.models.fields.DecimalField', [], {'null': 'True', 'max_digits': '7', 'decimal_places': '2', 'blank': 'True'}),
+            'recibo': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'ventas'", 'to': u"orm['invoice.Recibo']"})
+        },
+        u'invoice.ventadiaria': {
+            'Meta': {'unique_together': "(('fecha', 'item', 'item_type', 'cajero', 'remite'),)", 'object_name': 'VentaDiaria'},
+            'cajero': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'ventas_diarias'", 'null': 'True', 'to': u"orm['auth.User']"}),
+            'cantidad': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'descuento': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '11', 'decimal_places': '2'}),
+            'fecha': ('django.db.models.fields.DateField', [], {'db_index': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'impuesto': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '11', 'decimal_places': '2'}),
+            'item': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'ventas_diarias'", 'null': 'True', 'to': u"orm['inventory.ItemTemplate']"}),
+            'item_type': ('django.db.models.fields.related.ForeignKey', [], {'blank': 'True', 'related_name': "'ventas_diarias'", 'null': 'True', 'to': u"orm['inventory.ItemType']"}),
+            'monto': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '11', 'decimal_places': '2'}),
+            'remite': ('django.db.models.fields.CharField', [], {'max_length': '255', 'blank': 'True'}),
+            'total': ('django.db.models.fields.DecimalField', [], {'default': '0', 'max_digits': '11', 'decimal_places': '2'}),
+            'ventas': ('django.db.models.fields.IntegerField', [], {'default': '0'})
+        },
+        u'persona.persona': {
+            'Meta': {'object_name': 'Persona'},
+            'apellido': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+            'celular': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'domicilio': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'email': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'estado_civil': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'}),
+            'fax': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'fotografia': ('sorl.thumbnail.fields.ImageField', [], {'max_length': '100', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'identificacion': ('django.db.models.fields.CharField', [], {'max_length': '20', 'blank': 'True'}),
+            'nacimiento': ('django.db.models.fields.DateField', [], {'default': 'datetime.date.today'}),
+            'nacionalidad': ('persona.fields.OrderedCountryField', [], {'max_length': '2', 'blank': 'True'}),
+            'nombre': ('django.db.models.fields.CharField', [], {'max_length': '50', 'blank': 'True'}),
+            'profesion': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'sexo': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'}),
+            'telefono': ('django.db.models.fields.CharField', [], {'max_length': '200', 'blank': 'True'}),
+            'tipo_identificacion': ('django.db.models.fields.CharField', [], {'max_length': '1', 'blank': 'True'})
+        }
+    }
+
+    complete_apps = ['invoice']
\ No newline at end of file
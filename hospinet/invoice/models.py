@@ -15,24 +15,201 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 from collections import defaultdict
+from datetime import datetime, time, timedelta
 from decimal import Decimal
 
 from constance import config
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
 from django.contrib.auth.models import User
+from django.db.models.signals import (pre_save, post_save, pre_delete,
+                                      post_delete)
 from django.db.models.fields.related import ForeignKey
+from django.db.models.query import QuerySet
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django_extensions.db.models import TimeStampedModel
 
 from persona.models import Persona
-from inventory.models import ItemTemplate, TipoVenta
+from inventory.models import ItemTemplate, ItemType, TipoVenta
 from spital.models import Deposito
 
 
 dot01 = Decimal("0.01")
 
 
+def redondear(expresion):
+    """Genera el SQL que redondea una expresión al centavo utilizando el mismo
+    criterio que :meth:`Decimal.quantize`, es decir redondeo bancario"""
+
+    return (u'SIGN({0}) * (ROUND(ABS({0}), 2) - CASE '
+            u'WHEN MOD(ABS({0}) * 100, 1) = 0.5 '
+            u'AND MOD(FLOOR(ABS({0}) * 100), 2) = 0 '
+            u'THEN 0.01 ELSE 0 END)').format(expresion)
+
+
+MONTOS_VENTA = u"""
+SELECT id, recibo_id, item_id, cantidad,
+       CASE WHEN nulo THEN 0 ELSE monto END AS monto,
+       descuento,
+       CASE WHEN nulo THEN 0 ELSE impuesto END AS impuesto,
+       CASE WHEN nulo THEN 0 ELSE impuesto + monto - descuento END AS total
+FROM (
+    SELECT id, recibo_id, item_id, cantidad, nulo, monto, descuento,
+           {impuesto} AS impuesto
+    FROM (
+        SELECT id, recibo_id, item_id, cantidad, nulo, tasa,
+               precio_unitario * cantidad AS monto,
+               {descuento} AS descuento
+        FROM (
+            SELECT id, recibo_id, item_id, cantidad, nulo, tasa, disminucion,
+                   {precio_unitario} AS precio_unitario
+            FROM (
+                SELECT v.id, v.recibo_id, v.item_id, v.cantidad, r.nulo,
+                       v.impuesto AS tasa,
+                       v.precio + v.precio * CASE WHEN v.descontable
+                           THEN COALESCE(t.incremento, 0) ELSE 0
+                       END AS precio,
+                       CASE WHEN v.descontable
+                           THEN COALESCE(t.disminucion, 0) ELSE 0
+                       END AS disminucion
+                FROM invoice_venta v
+                INNER JOIN invoice_recibo r ON r.id = v.recibo_id
+                LEFT OUTER JOIN inventory_tipoventa t
+                    ON t.id = r.tipo_de_venta_id
+            ) precios
+        ) unitarios
+    ) montos
+) impuestos
+""".format(precio_unitario=redondear(u'precio'),
+           descuento=redondear(u'precio_unitario * disminucion * cantidad'),
+           impuesto=redondear(u'(monto - descuento) * tasa'))
+"""Calcula en la base de datos los montos de cada :class:`Venta` siguiendo las
+mismas reglas que :meth:`Venta.monto`, :meth:`Venta.descuento_tipo`,
+:meth:`Venta.tax` y :meth:`Venta.total`"""
+
+
+class ReciboQuerySet(QuerySet):
+    # Cantidad de Recibos cuyos totales se obtienen en cada consulta
+    TAMANO_BLOQUE = 500
+
+    def __init__(self, *args, **kwargs):
+        super(ReciboQuerySet, self).__init__(*args, **kwargs)
+        self._con_totales = False
+
+    def _clone(self, klass=None, setup=False, **kwargs):
+        clone = super(ReciboQuerySet, self)._clone(klass, setup, **kwargs)
+        clone._con_totales = kwargs.get('_con_totales', self._con_totales)
+        return clone
+
+    def con_totales(self):
+        """Anota a cada :class:`Recibo` su subtotal, impuesto, descuento,
+        total y placas calculados en la base de datos mediante una sola
+        consulta agrupada por :class:`Recibo`"""
+
+        return self._clone(_con_totales=True)
+
+    def iterator(self):
+        recibos = super(ReciboQuerySet, self).iterator()
+        if not self._con_totales:
+            return recibos
+
+        return self._iterar_con_totales(recibos)
+
+    def _iterar_con_totales(self, recibos):
+        """Anota los totales por bloques de TAMANO_BLOQUE :class:`Recibo`s,
+        de modo que la memoria utilizada no crece con el periodo"""
+
+        bloque = list()
+        for recibo in recibos:
+            bloque.append(recibo)
+
+            if len(bloque) >= self.TAMANO_BLOQUE:
+                self._anotar_totales(bloque)
+                for anotado in bloque:
+                    yield anotado
+                bloque = list()
+
+        self._anotar_totales(bloque)
+        for anotado in bloque:
+            yield anotado
+
+    def _anotar_totales(self, recibos):
+        """Obtiene los montos de los :class:`Recibo`s indicados con un solo
+        recorrido de sus :class:`Venta`s"""
+
+        if not recibos:
+            return
+
+        cursor = connection.cursor()
+        cursor.execute(
+            u'SELECT m.recibo_id, COALESCE(SUM(m.monto), 0), '
+            u'COALESCE(SUM(m.impuesto), 0), COALESCE(SUM(m.descuento), 0), '
+            u'COALESCE(SUM(m.total), 0), COALESCE(SUM(v.placas), 0) '
+            u'FROM ({0}) m INNER JOIN invoice_venta v ON v.id = m.id '
+            u'WHERE m.recibo_id = ANY(%s) '
+            u'GROUP BY m.recibo_id'.format(MONTOS_VENTA),
+            [[recibo.id for recibo in recibos]])
+        totales = dict((fila[0], fila[1:]) for fila in cursor.fetchall())
+
+        for recibo in recibos:
+            subtotal, impuesto, descuento, total, placas = totales.get(
+                recibo.id, (0, 0, 0, 0, 0))
+            if recibo.nulo:
+                subtotal = impuesto = descuento = total = 0
+
+            recibo.anotado_subtotal = subtotal
+            recibo.anotado_impuesto = impuesto
+            recibo.anotado_descuento = descuento
+            recibo.anotado_total = total
+            recibo.anotado_placas = placas
+
+
+class ReciboManager(models.Manager):
+    def get_queryset(self):
+        return ReciboQuerySet(self.model, using=self._db)
+
+    def con_totales(self):
+        return self.get_queryset().con_totales()
+
+
+class VentaQuerySet(QuerySet):
+    def con_montos(self):
+        """Anota a cada :class:`Venta` su monto, descuento, impuesto y total
+        calculados en la base de datos"""
+
+        return self.extra(select=dict(
+            ('anotado_{0}'.format(monto),
+             u'SELECT m.{0} FROM ({1}) m '
+             u'WHERE m.id = invoice_venta.id'.format(monto, MONTOS_VENTA))
+            for monto in ('monto', 'descuento', 'impuesto', 'total')))
+
+    def sumar_montos(self):
+        """Suma en una sola consulta el monto, descuento, impuesto y total de
+        las :class:`Venta`s seleccionadas"""
+
+        consulta, parametros = self.order_by().values(
+            'id').query.sql_with_params()
+        cursor = connection.cursor()
+        cursor.execute(
+            u'SELECT COALESCE(SUM(m.monto), 0), '
+            u'COALESCE(SUM(m.descuento), 0), '
+            u'COALESCE(SUM(m.impuesto), 0), COALESCE(SUM(m.total), 0) '
+            u'FROM ({0}) m WHERE m.id IN ({1})'.format(MONTOS_VENTA, consulta),
+            parametros)
+
+        return dict(zip(('monto', 'descuento', 'impuesto', 'total'),
+                        cursor.fetchone()))
+
+
+class VentaManager(models.Manager):
+    def get_queryset(self):
+        return VentaQuerySet(self.model, using=self._db)
+
+    def con_montos(self):
+        return self.get_queryset().con_montos()
+
+
 class TipoPago(TimeStampedModel):
     nombre = models.CharField(max_length=255, blank=True, null=True)
 
@@ -58,6 +235,8 @@ class Recibo(TimeStampedModel):
                                related_name='recibos')
     tipo_de_venta = models.ForeignKey(TipoVenta, blank=True, null=True)
 
+    objects = ReciboManager()
+
     def get_absolute_url(self):
 
         """Obtiene la URL absoluta"""
@@ -77,6 +256,7 @@ class Recibo(TimeStampedModel):
         for pago in self.pagos.all():
             pago.delete()
         self.save()
+        self.refrescar_totales()
 
     def cerrar(self):
 
@@ -95,49 +275,64 @@ class Recibo(TimeStampedModel):
 
         return self.cliente.nombre_completo()
 
+    def totales(self):
+
+        """Obtiene los :class:`TotalesRecibo` de este :class:`Recibo`,
+        calculandolos una sola vez por instancia"""
+
+        if getattr(self, '_totales', None) is None:
+            self._totales = TotalesRecibo(self)
+
+        return self._totales
+
+    def refrescar_totales(self):
+
+        """Descarta los montos calculados para que se vuelvan a obtener en la
+        siguiente consulta"""
+
+        self._totales = None
+        for monto in ('subtotal', 'impuesto', 'descuento', 'total', 'placas'):
+            self.__dict__.pop('anotado_{0}'.format(monto), None)
+
+    def _anotado(self, monto):
+
+        """Utiliza el monto anotado mediante :meth:`ReciboQuerySet.con_totales`
+        en caso de estar disponible, de lo contrario lo calcula mediante
+        :class:`TotalesRecibo`"""
+
+        anotado = getattr(self, 'anotado_{0}'.format(monto), None)
+        if anotado is None:
+            return getattr(self.totales(), monto)
+
+        return Decimal(anotado).quantize(dot01)
+
     def subtotal(self):
 
         """Calcula el monto antes de impuestos"""
 
-        if self.nulo:
-            return Decimal(0)
-
-        subtotal = sum(v.monto() for v in self.ventas.all())
-        return Decimal(subtotal).quantize(dot01)
+        return self._anotado('subtotal')
 
     def impuesto(self):
 
         """Calcula los impuestos que se deben pagar por este :class:`Recibo`"""
 
-        if self.nulo:
-            return Decimal(0)
-
-        tax = sum(v.tax() for v in self.ventas.all())
-        return Decimal(tax).quantize(dot01)
+        return self._anotado('impuesto')
 
     def descuento(self):
 
         """Calcula el descuento que se debe restar a este :class:`Recibo`"""
 
-        if self.nulo:
-            return Decimal(0)
-
-        discount = sum(v.discount() for v in self.ventas.all())
-        return Decimal(discount).quantize(dot01)
+        return self._anotado('descuento')
 
     def conceptos(self):
 
-        return ', '.join(v.item.descripcion for v in self.ventas.all())
+        return self.totales().conceptos
 
     def total(self):
 
         """Calcula el monto que será mostrado en los cálculos financieros"""
 
-        if self.nulo:
-            return Decimal(0)
-
-        total = sum(v.total() for v in self.ventas.all())
-        return Decimal(total).quantize(dot01)
+        return self._anotado('total')
 
     def comision_doctor(self):
 
@@ -145,11 +340,15 @@ class Recibo(TimeStampedModel):
 
     def comision_radiologo(self):
 
-        return sum(v.radiologo() for v in self.ventas.all())
+        return self.totales().comision_radiologo
 
     def placas(self):
 
-        return sum(v.placas for v in self.ventas.all())
+        anotado = getattr(self, 'anotado_placas', None)
+        if anotado is None:
+            return self.totales().placas
+
+        return anotado
 
     def fractional(self):
         """Obtiene la parte decimal del total del :class:`Recibo`"""
@@ -163,13 +362,60 @@ class Recibo(TimeStampedModel):
 
     def pagado(self):
 
-        return sum(p.monto for p in self.pagos.all())
+        return self.totales().pagado
 
     def debido(self):
 
         return self.total() - self.pagado()
 
 
+class TotalesRecibo(object):
+    """Calcula todos los montos de un :class:`Recibo` en una sola pasada,
+    obteniendo sus :class:`Venta`s, su :class:`TipoVenta` y sus
+    :class:`Pago`s una única vez"""
+
+    def __init__(self, recibo):
+        self.subtotal = Decimal(0)
+        self.impuesto = Decimal(0)
+        self.descuento = Decimal(0)
+        self.total = Decimal(0)
+        self.comision_radiologo = Decimal(0)
+        self.placas = 0
+        self.pagado = sum(p.monto for p in recibo.pagos.all())
+
+        ventas = list(recibo.ventas.select_related('item').all())
+        self.conceptos = ', '.join(v.item.descripcion for v in ventas)
+
+        subtotal = Decimal(0)
+        impuesto = Decimal(0)
+        descuento = Decimal(0)
+        total = Decimal(0)
+
+        for venta in ventas:
+            # Todas las ventas comparten el mismo recibo y su tipo de venta
+            venta.recibo = recibo
+            self.placas += venta.placas
+            self.comision_radiologo += venta.radiologo()
+
+            if recibo.nulo:
+                continue
+
+            monto = venta.monto()
+            disminucion = venta.descuento_tipo()
+            tax = ((monto - disminucion) * venta.impuesto).quantize(dot01)
+
+            subtotal += monto
+            impuesto += tax
+            descuento += disminucion
+            total += (tax + monto - disminucion).quantize(dot01)
+
+        if not recibo.nulo:
+            self.subtotal = subtotal.quantize(dot01)
+            self.impuesto = impuesto.quantize(dot01)
+            self.descuento = descuento.quantize(dot01)
+            self.total = total.quantize(dot01)
+
+
 class Venta(TimeStampedModel):
     """Relaciona :class:`Producto` a un :class:`Recibo` lo cual permite
     realizar los cobros asociados"""
@@ -187,6 +433,8 @@ class Venta(TimeStampedModel):
     placas = models.IntegerField(default=0)
     descontable = models.BooleanField(default=True)
 
+    objects = VentaManager()
+
     def __unicode__(self):
 
         return u"{0} a {1}".format(self.item.descripcion, self.recibo.id)
@@ -324,58 +572,111 @@ class TurnoCaja(TimeStampedModel):
         return Deposito.objects.filter(created__gte=self.inicio,
                                        created__lte=fin).all()
 
+    def resumen(self):
+
+        """Obtiene el :class:`ResumenTurno`, calculándolo una sola vez por
+        instancia"""
+
+        if getattr(self, '_resumen', None) is None:
+            self._resumen = ResumenTurno(self)
+
+        return self._resumen
+
     def venta(self):
 
-        return sum(r.total() for r in self.recibos())
+        return self.resumen().venta
 
     def depositado(self):
 
-        return sum(d.monto for d in self.depositos())
+        return self.resumen().depositado
 
     def ingresos(self):
-        return sum(r.pagado() for r in self.recibos())
+        return self.resumen().ingresos
 
     def pagos(self):
 
-        metodos = defaultdict(Decimal)
-        for tipo in TipoPago.objects.all():
-            metodos[tipo] = 0
+        return self.resumen().pagos.iteritems()
 
-        for recibo in self.recibos():
+    def total_cierres(self):
 
-            for pago in recibo.pagos.all():
-                metodos[pago.tipo] += pago.monto
+        return self.resumen().total_cierres
 
-        return metodos.iteritems()
+    def diferencia(self):
 
-    def total_cierres(self):
+        return self.resumen().diferencia.iteritems()
 
-        return sum(c.monto for c in self.cierres.all())
+    def diferencia_total(self):
 
-    def diferencia(self):
+        return self.resumen().diferencia_total
 
-        metodos = defaultdict(Decimal)
-        for recibo in self.recibos():
 
-            for pago in recibo.pagos.all():
-                metodos[pago.tipo] += pago.monto
+class ResumenTurno(object):
+    """Calcula las cifras del cierre de un :class:`TurnoCaja` agrupando los
+    :class:`Pago`s de sus :class:`Recibo`s y sus :class:`CierreTurno`s por
+    :class:`TipoPago` en una sola consulta cada uno
 
-        cierres = defaultdict(Decimal)
-        for cierre in self.cierres.all():
-            cierres[cierre.pago] += cierre.monto
+    Cada cifra se calcula la primera vez que se utiliza, de modo que una
+    página que solo muestra la venta no consulta los pagos ni los cierres"""
 
-        diferencia = defaultdict(Decimal)
-        for tipo in TipoPago.objects.all():
-            diferencia[tipo] = cierres[tipo] - metodos[tipo]
+    def __init__(self, turno):
+        self.turno = turno
 
-        return diferencia.iteritems()
+    @cached_property
+    def tipos(self):
+        return list(TipoPago.objects.all())
 
+    def agrupar(self, filas, campo):
+        por_id = dict((tipo.id, tipo) for tipo in self.tipos)
+
+        montos = defaultdict(Decimal)
+        for fila in filas:
+            montos[por_id[fila[campo]]] += fila['monto'] or 0
+
+        return montos
+
+    @cached_property
+    def pagos(self):
+        pagos = Pago.objects.filter(recibo__in=self.turno.recibos()).order_by(
+        ).values('tipo').annotate(monto=models.Sum('monto'))
+
+        montos = self.agrupar(pagos, 'tipo')
+        for tipo in self.tipos:
+            montos.setdefault(tipo, Decimal(0))
+
+        return montos
+
+    @cached_property
+    def cierres(self):
+        cierres = self.turno.cierres.order_by().values('pago').annotate(
+            monto=models.Sum('monto'))
+
+        return self.agrupar(cierres, 'pago')
+
+    @cached_property
+    def diferencia(self):
+        return dict((tipo, self.cierres[tipo] - self.pagos[tipo])
+                    for tipo in self.tipos)
+
+    @cached_property
+    def ingresos(self):
+        return sum(self.pagos.values())
+
+    @cached_property
+    def total_cierres(self):
+        return sum(self.cierres.values())
+
+    @cached_property
     def diferencia_total(self):
+        return self.total_cierres - self.ingresos - self.turno.apertura
 
-        cierre = sum(c.monto for c in self.cierres.all())
-        pagos = sum(r.pagado() for r in self.recibos())
+    @cached_property
+    def venta(self):
+        return sum(r.total() for r in self.turno.recibos().con_totales())
 
-        return cierre - pagos - self.apertura
+    @cached_property
+    def depositado(self):
+        return self.turno.depositos().aggregate(
+            total=models.Sum('monto'))['total'] or 0
 
 
 class CierreTurno(TimeStampedModel):
@@ -389,3 +690,376 @@ class CierreTurno(TimeStampedModel):
 
         return reverse('invoice-turno', args=[self.turno.id])
 
+
+
+
+class VentaDiariaManager(models.Manager):
+    LLAVE = ('fecha', 'item', 'item_type', 'cajero', 'remite')
+    MONTOS = ('ventas', 'cantidad', 'monto', 'impuesto', 'descuento', 'total')
+
+    def areas(self, items=None):
+        """Obtiene el área de cada producto, que es la primera de sus
+        :class:`ItemType`, igual que en ReporteTipoView
+
+        Cuando se indican los productos solo se consultan las áreas de los
+        mismos"""
+
+        areas = {}
+        relaciones = ItemTemplate.item_type.through.objects.order_by(
+            'itemtemplate', '-itemtype__modified', '-itemtype__created')
+        if items is not None:
+            relaciones = relaciones.filter(itemtemplate__in=items)
+        for relacion in relaciones.values('itemtemplate', 'itemtype'):
+            areas.setdefault(relacion['itemtemplate'], relacion['itemtype'])
+
+        return areas
+
+    def resumir(self, ventas, areas=None):
+        """Agrupa los montos de las :class:`Venta`s indicadas por cada llave
+        de :class:`VentaDiaria`, sin tomar en cuenta los :class:`Recibo`s
+        anulados
+
+        Las áreas de los productos se agregan al :class:`dict` areas, de modo
+        que al reutilizarlo solo se consultan las de productos nuevos"""
+
+        if areas is None:
+            areas = {}
+
+        zona = timezone.get_current_timezone()
+        ventas = list(ventas.filter(recibo__nulo=False).con_montos().values(
+            'item', 'cantidad', 'recibo__created', 'recibo__cajero',
+            'recibo__remite', 'anotado_monto', 'anotado_impuesto',
+            'anotado_descuento', 'anotado_total'))
+
+        faltantes = set(venta['item'] for venta in ventas) - set(areas)
+        if faltantes:
+            areas.update(dict.fromkeys(faltantes))
+            areas.update(self.areas(faltantes))
+
+        resumen = defaultdict(lambda: [0] * len(self.MONTOS))
+        for venta in ventas:
+            fecha = timezone.localtime(venta['recibo__created'], zona).date()
+            llave = (fecha, venta['item'], areas.get(venta['item']),
+                     venta['recibo__cajero'],
+                     (venta['recibo__remite'] or u'').upper())
+
+            montos = resumen[llave]
+            montos[0] += 1
+            montos[1] += venta['cantidad']
+            montos[2] += venta['anotado_monto'] or 0
+            montos[3] += venta['anotado_impuesto'] or 0
+            montos[4] += venta['anotado_descuento'] or 0
+            montos[5] += venta['anotado_total'] or 0
+
+        return resumen
+
+    def registrar(self, anteriores, actuales):
+        """Aplica a cada :class:`VentaDiaria` la diferencia entre dos
+        resúmenes obtenidos mediante :meth:`resumir`
+
+        Los cambios se suman en la base de datos mediante :class:`F`, por lo
+        que dos transacciones que modifiquen el mismo día no se pisan"""
+
+        cero = [0] * len(self.MONTOS)
+        for llave in set(anteriores) | set(actuales):
+            diferencia = [actual - anterior for actual, anterior in
+                          zip(actuales.get(llave, cero),
+                              anteriores.get(llave, cero))]
+            if not any(diferencia):
+                continue
+
+            fecha, item, item_type, cajero, remite = llave
+            filas = self.filter(fecha=fecha, item=item, item_type=item_type,
+                                cajero=cajero, remite=remite)
+            cambios = dict((campo, models.F(campo) + valor) for campo, valor
+                           in zip(self.MONTOS, diferencia))
+
+            if not filas.update(**cambios):
+                try:
+                    with transaction.atomic():
+                        self.create(fecha=fecha, item_id=item,
+                                    item_type_id=item_type, cajero_id=cajero,
+                                    remite=remite,
+                                    **dict(zip(self.MONTOS, diferencia)))
+                except IntegrityError:
+                    filas.update(**cambios)
+
+            if diferencia[0] < 0:
+                filas.filter(ventas=0).delete()
+
+    def reconstruir(self, inicio, fin):
+        """Vuelve a calcular las :class:`VentaDiaria` de todos los días
+        comprendidos entre las fechas indicadas
+
+        Reemplaza los días completos, por lo que no debe ejecutarse mientras
+        se facturan :class:`Venta`s de esos días"""
+
+        zona = timezone.get_current_timezone()
+        desde = timezone.make_aware(datetime.combine(inicio, time.min), zona)
+        hasta = timezone.make_aware(datetime.combine(fin, time.max), zona)
+
+        resumen = self.resumir(
+            Venta.objects.filter(recibo__created__range=(desde, hasta)))
+
+        with transaction.atomic():
+            self.filter(fecha__range=(inicio, fin)).delete()
+            self.bulk_create(
+                VentaDiaria(fecha=fecha, item_id=item, item_type_id=item_type,
+                            cajero_id=cajero, remite=remite,
+                            **dict(zip(self.MONTOS, montos)))
+                for (fecha, item, item_type, cajero, remite), montos
+                in resumen.items())
+
+    def periodo(self, inicio, fin, campo):
+        """Agrupa por ``campo`` los montos de las :class:`Venta`s realizadas
+        entre los momentos indicados
+
+        Los días completos se obtienen de las :class:`VentaDiaria` y las
+        horas de los días incompletos en los extremos directamente de las
+        :class:`Venta`s"""
+
+        zona = timezone.get_current_timezone()
+        primero = timezone.localtime(inicio, zona).date()
+        if timezone.make_aware(datetime.combine(primero, time.min),
+                               zona) < inicio:
+            primero += timedelta(days=1)
+        ultimo = timezone.localtime(fin, zona).date()
+        if timezone.make_aware(datetime.combine(ultimo, time.max),
+                               zona) > fin:
+            ultimo -= timedelta(days=1)
+
+        resumen = defaultdict(lambda: dict.fromkeys(self.MONTOS, 0))
+
+        if primero > ultimo:
+            bordes = models.Q(recibo__created__range=(inicio, fin))
+        else:
+            diario = self.filter(fecha__range=(primero, ultimo)).values(
+                campo).annotate(**dict((monto, models.Sum(monto))
+                                       for monto in self.MONTOS))
+            for fila in diario:
+                for monto in self.MONTOS:
+                    resumen[fila[campo]][monto] += fila[monto]
+
+            bordes = models.Q(
+                recibo__created__gte=inicio,
+                recibo__created__lt=timezone.make_aware(
+                    datetime.combine(primero, time.min), zona)) | models.Q(
+                recibo__created__gt=timezone.make_aware(
+                    datetime.combine(ultimo, time.max), zona),
+                recibo__created__lte=fin)
+
+        posicion = self.LLAVE.index(campo)
+        for llave, montos in self.resumir(
+                Venta.objects.filter(bordes)).items():
+            for monto, valor in zip(self.MONTOS, montos):
+                resumen[llave[posicion]][monto] += valor
+
+        return resumen
+
+
+class VentaDiaria(models.Model):
+    """Resume las :class:`Venta`s de un día agrupadas por
+    :class:`ItemTemplate`, :class:`ItemType`, cajero y médico que remite, de
+    manera que los reportes de un periodo no necesiten recorrer cada
+    :class:`Recibo`
+
+    Se mantiene actualizada mediante señales que suman la diferencia de cada
+    :class:`Venta` o :class:`Recibo` modificado, los :class:`Recibo`s anulados
+    no se toman en cuenta"""
+
+    class Meta:
+        unique_together = ('fecha', 'item', 'item_type', 'cajero', 'remite')
+
+    fecha = models.DateField(db_index=True)
+    item = models.ForeignKey(ItemTemplate, blank=True, null=True,
+                             related_name='ventas_diarias')
+    item_type = models.ForeignKey(ItemType, blank=True, null=True,
+                                  related_name='ventas_diarias')
+    cajero = models.ForeignKey(User, blank=True, null=True,
+                               related_name='ventas_diarias')
+    remite = models.CharField(max_length=255, blank=True)
+    ventas = models.IntegerField(default=0)
+    cantidad = models.IntegerField(default=0)
+    monto = models.DecimalField(max_digits=11, decimal_places=2, default=0)
+    impuesto = models.DecimalField(max_digits=11, decimal_places=2, default=0)
+    descuento = models.DecimalField(max_digits=11, decimal_places=2,
+                                    default=0)
+    total = models.DecimalField(max_digits=11, decimal_places=2, default=0)
+
+    objects = VentaDiariaManager()
+
+    def __unicode__(self):
+        return u"{0} {1} {2}".format(self.fecha, self.item, self.total)
+
+
+class ComisionManager(models.Manager):
+    def registrar(self, recibo):
+        """Vuelve a generar las :class:`Comision`es del radiologo y del médico
+        que remite a partir de las :class:`Venta`s del :class:`Recibo`
+
+        Cuando el :class:`Recibo` ha sido anulado se revierten todas sus
+        :class:`Comision`es, incluyendo las de los técnicos"""
+
+        comisiones = list()
+        radiologo = u'{0}'.format(recibo.radiologo or u'').upper()
+        remite = u'{0}'.format(recibo.remite or u'').upper()
+
+        if not recibo.nulo:
+            ventas = Venta.objects.filter(recibo=recibo).con_montos().values(
+                'id', 'descuento', 'item__comision', 'anotado_monto',
+                'anotado_total')
+            total = Decimal(0)
+
+            for venta in ventas:
+                total += venta['anotado_total']
+                if not radiologo:
+                    continue
+
+                # Las mismas reglas que Venta.radiologo
+                bruto = venta['anotado_monto'] * venta['item__comision'] / \
+                        Decimal("100")
+                neto = bruto - bruto * venta['descuento'] / Decimal("100")
+                comisiones.append(Comision(
+                    recibo=recibo, venta_id=venta['id'],
+                    tipo=Comision.RADIOLOGO, beneficiario=radiologo,
+                    fecha=recibo.created, base=venta['anotado_monto'],
+                    porcentaje=venta['item__comision'],
+                    monto=neto.quantize(dot01)))
+
+            if remite and ventas:
+                comisiones.append(Comision(
+                    recibo=recibo, tipo=Comision.REMITE, beneficiario=remite,
+                    fecha=recibo.created, base=total, porcentaje=Decimal('7'),
+                    monto=(total * Decimal('0.07')).quantize(dot01)))
+
+        with transaction.atomic():
+            anteriores = self.filter(recibo=recibo)
+            if not recibo.nulo:
+                anteriores = anteriores.exclude(tipo=Comision.TECNICO)
+            anteriores.delete()
+            self.bulk_create(comisiones)
+
+    def registrar_tecnico(self, recibo, tecnico, items):
+        """Registra las :class:`Comision`es del técnico que realizó un
+        :class:`Examen` por cada :class:`ItemTemplate` facturado"""
+
+        self.bulk_create(
+            Comision(recibo=recibo, tipo=Comision.TECNICO,
+                     beneficiario=u'{0}'.format(tecnico).upper(),
+                     fecha=recibo.created, base=item.precio_de_venta,
+                     porcentaje=item.comision2,
+                     monto=(item.precio_de_venta * item.comision2 *
+                            dot01).quantize(dot01))
+            for item in items)
+
+
+class Comision(models.Model):
+    """Registra los honorarios que corresponden a radiologos, técnicos y
+    médicos que remiten por cada :class:`Recibo`, de manera que los reportes
+    de comisiones no necesiten recorrer cada :class:`Venta`
+
+    Se mantiene actualizada mediante señales al guardar o eliminar
+    :class:`Venta`s y al guardar :class:`Recibo`s, al anular un
+    :class:`Recibo` se eliminan sus :class:`Comision`es. Las vistas que crean
+    :class:`Venta`s sin enviar señales deben llamar a
+    :meth:`ComisionManager.registrar`"""
+
+    RADIOLOGO = 'R'
+    TECNICO = 'T'
+    REMITE = 'M'
+    TIPOS = (
+        (RADIOLOGO, u'Radiologo'),
+        (TECNICO, u'Técnico'),
+        (REMITE, u'Médico que Remite'),
+    )
+
+    recibo = models.ForeignKey(Recibo, related_name='comisiones')
+    venta = models.ForeignKey(Venta, blank=True, null=True,
+                              related_name='comisiones')
+    tipo = models.CharField(max_length=1, choices=TIPOS)
+    beneficiario = models.CharField(max_length=255)
+    fecha = models.DateTimeField(db_index=True)
+    base = models.DecimalField(max_digits=11, decimal_places=2, default=0)
+    porcentaje = models.DecimalField(max_digits=7, decimal_places=2,
+                                     default=0)
+    monto = models.DecimalField(max_digits=11, decimal_places=2, default=0)
+
+    objects = ComisionManager()
+
+    def __unicode__(self):
+        return u"{0} {1} {2}".format(self.beneficiario, self.recibo_id,
+                                     self.monto)
+
+
+def areas_recibo(instance):
+    """Obtiene el :class:`dict` de áreas que comparten las señales de un
+    :class:`Recibo`, o de todas las :class:`Venta`s cuyo :class:`Recibo` se
+    encuentra cargado en memoria, para consultar una sola vez por
+    :class:`Recibo` el área de cada producto"""
+
+    if isinstance(instance, Venta):
+        instance = getattr(instance, Venta._meta.get_field(
+            'recibo').get_cache_name(), None) or instance
+
+    if getattr(instance, '_areas', None) is None:
+        instance._areas = {}
+
+    return instance._areas
+
+
+def venta_diaria_antes_recibo(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+
+    instance._ventas_diarias = VentaDiaria.objects.resumir(
+        Venta.objects.filter(recibo=instance.pk), areas_recibo(instance))
+
+
+def venta_diaria_recibo(sender, instance, created=False, **kwargs):
+    if created:
+        return
+
+    VentaDiaria.objects.registrar(
+        getattr(instance, '_ventas_diarias', {}),
+        VentaDiaria.objects.resumir(Venta.objects.filter(recibo=instance),
+                                    areas_recibo(instance)))
+
+
+def venta_diaria_antes_venta(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+
+    instance._ventas_diarias = VentaDiaria.objects.resumir(
+        Venta.objects.filter(pk=instance.pk), areas_recibo(instance))
+
+
+def venta_diaria_venta(sender, instance, **kwargs):
+    VentaDiaria.objects.registrar(
+        getattr(instance, '_ventas_diarias', {}),
+        VentaDiaria.objects.resumir(Venta.objects.filter(pk=instance.pk),
+                                    areas_recibo(instance)))
+
+
+def comision_recibo(sender, instance, created=False, **kwargs):
+    if created:
+        return
+
+    Comision.objects.registrar(instance)
+
+
+def comision_venta(sender, instance, **kwargs):
+    recibo = Recibo.objects.filter(pk=instance.recibo_id).first()
+
+    if recibo is not None:
+        Comision.objects.registrar(recibo)
+
+
+pre_save.connect(venta_diaria_antes_recibo, sender=Recibo)
+post_save.connect(venta_diaria_recibo, sender=Recibo)
+pre_save.connect(venta_diaria_antes_venta, sender=Venta)
+post_save.connect(venta_diaria_venta, sender=Venta)
+pre_delete.connect(venta_diaria_antes_venta, sender=Venta)
+post_delete.connect(venta_diaria_venta, sender=Venta)
+post_save.connect(comision_recibo, sender=Recibo)
+post_save.connect(comision_venta, sender=Venta)
+post_delete.connect(comision_venta, sender=Venta)
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 """
 This file demonstrates writing tests using the unittest module. These will pass
 when you run "manage.py test".
@@ -5,7 +6,27 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
+import csv
+from datetime import timedelta
+from decimal import Decimal
+
+from constance import config
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.http import QueryDict
 from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.views.generic import ListView
+
+from imaging.models import Examen, Radiologo, TipoExamen
+from inventory.models import ItemTemplate, ItemType, TipoVenta
+from invoice.models import (Recibo, Venta, Pago, TipoPago, Comision,
+                            VentaDiaria, TurnoCaja, CierreTurno, dot01)
+from invoice.views import VentaKeysetMixin, crear_ventas, preparar_ventas
+from persona.models import Persona
 
 
 class SimpleTest(TestCase):
@@ -14,3 +35,462 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class ReciboTestMixin(object):
+    """Crea los datos necesarios para calcular los montos de un
+    :class:`Recibo`"""
+
+    def crear_recibo(self, ventas, tipo_de_venta=None, radiologo=u''):
+        recibo = Recibo.objects.create(cliente=self.persona,
+                                       cajero=self.usuario,
+                                       tipo_de_venta=tipo_de_venta,
+                                       radiologo=radiologo)
+
+        for n in range(ventas):
+            item = self.items[n % len(self.items)]
+            Venta.objects.create(recibo=recibo, item=item, cantidad=n + 1,
+                                 precio=item.precio_de_venta,
+                                 impuesto=item.impuestos,
+                                 descuento=n % 3 * 5,
+                                 descontable=bool(n % 2))
+
+        Pago.objects.create(recibo=recibo, tipo=self.tipo_pago,
+                            monto=Decimal('10.00'))
+
+        return recibo
+
+    def setUp(self):
+        self.usuario = User.objects.create_user('cajero', 'caja@example.com',
+                                                'cajero')
+        self.persona = Persona.objects.create(nombre=u'Juan',
+                                              apellido=u'Pérez')
+        self.tipo_pago = TipoPago.objects.create(nombre=u'Efectivo')
+        self.tipo_de_venta = TipoVenta.objects.create(
+            descripcion=u'Aseguradora', incremento=Decimal('0.15'),
+            disminucion=Decimal('0.10'))
+        self.items = [
+            ItemTemplate.objects.create(descripcion=u'Item {0}'.format(n),
+                                        precio_de_venta=Decimal('12.35') * n,
+                                        impuestos=Decimal('0.15') * (n % 2),
+                                        comision=Decimal('30.00'))
+            for n in range(1, 6)]
+
+
+class TotalesReciboTest(ReciboTestMixin, TestCase):
+    def referencia(self, recibo):
+        """Calcula los montos del :class:`Recibo` a partir de cada
+        :class:`Venta` tal como se hacía antes de :class:`TotalesRecibo`"""
+
+        ventas = Venta.objects.filter(recibo=recibo)
+        nulo = Recibo.objects.get(pk=recibo.pk).nulo
+        if nulo:
+            return Decimal(0), Decimal(0), Decimal(0), Decimal(0)
+
+        return (Decimal(sum(v.monto() for v in ventas)).quantize(dot01),
+                Decimal(sum(v.tax() for v in ventas)).quantize(dot01),
+                Decimal(sum(v.discount() for v in ventas)).quantize(dot01),
+                Decimal(sum(v.total() for v in ventas)).quantize(dot01))
+
+    def test_paridad(self):
+        for tipo_de_venta in (None, self.tipo_de_venta):
+            recibo = self.crear_recibo(7, tipo_de_venta, u'Dr. House')
+            recibo = Recibo.objects.get(pk=recibo.pk)
+
+            self.assertEqual(
+                (recibo.subtotal(), recibo.impuesto(), recibo.descuento(),
+                 recibo.total()),
+                self.referencia(recibo))
+            self.assertEqual(recibo.pagado(), Decimal('10.00'))
+            self.assertEqual(recibo.debido(),
+                             recibo.total() - Decimal('10.00'))
+            self.assertEqual(
+                recibo.comision_radiologo(),
+                sum(v.radiologo() for v in
+                    Venta.objects.filter(recibo=recibo)))
+
+    def test_anulado(self):
+        recibo = self.crear_recibo(3, self.tipo_de_venta)
+        recibo.total()
+        recibo.anular()
+
+        self.assertEqual(recibo.total(), Decimal(0))
+        self.assertEqual(recibo.pagado(), 0)
+
+    def test_consultas_constantes(self):
+        for cantidad in (1, 10, 50):
+            recibo = self.crear_recibo(cantidad, self.tipo_de_venta,
+                                       u'Dr. House')
+            recibo = Recibo.objects.get(pk=recibo.pk)
+
+            # pagos, ventas con sus items y el tipo de venta
+            with self.assertNumQueries(3):
+                recibo.subtotal()
+                recibo.impuesto()
+                recibo.descuento()
+                recibo.total()
+                recibo.pagado()
+                recibo.debido()
+                recibo.comision_radiologo()
+                recibo.placas()
+                recibo.conceptos()
+
+
+class ReciboQuerySetTest(ReciboTestMixin, TestCase):
+    def setUp(self):
+        super(ReciboQuerySetTest, self).setUp()
+        self.items.append(
+            ItemTemplate.objects.create(descripcion=u'Empate',
+                                        precio_de_venta=Decimal('10.25'),
+                                        impuestos=Decimal('0.15')))
+        tipos = [None, self.tipo_de_venta,
+                 TipoVenta.objects.create(descripcion=u'Empleado',
+                                          incremento=Decimal('0.10'),
+                                          disminucion=Decimal('0.25'))]
+
+        for n in range(30):
+            recibo = self.crear_recibo(n % 7 + 1, tipos[n % len(tipos)])
+            if n % 10 == 0:
+                recibo.anular()
+
+    def test_paridad(self):
+        for recibo in Recibo.objects.con_totales():
+            referencia = Recibo.objects.get(pk=recibo.pk)
+
+            self.assertEqual(recibo.subtotal(), referencia.subtotal())
+            self.assertEqual(recibo.impuesto(), referencia.impuesto())
+            self.assertEqual(recibo.descuento(), referencia.descuento())
+            self.assertEqual(recibo.total(), referencia.total())
+            self.assertEqual(recibo.placas(), referencia.placas())
+
+    def test_paridad_ventas(self):
+        for venta in Venta.objects.con_montos():
+            self.assertEqual(venta.anotado_monto, venta.monto())
+            self.assertEqual(venta.anotado_descuento, venta.discount())
+            self.assertEqual(venta.anotado_impuesto, venta.tax())
+            self.assertEqual(venta.anotado_total, venta.total())
+
+    def test_consultas_constantes(self):
+        # los recibos y sus totales agrupados
+        with self.assertNumQueries(2):
+            sum(r.total() for r in Recibo.objects.con_totales())
+
+    def test_bloques(self):
+        recibos = Recibo.objects.con_totales().order_by('id')
+        recibos.TAMANO_BLOQUE = 7
+
+        # los recibos y los totales de cada bloque de 7 de los 30 recibos
+        with self.assertNumQueries(6):
+            totales = [r.total() for r in recibos.iterator()]
+
+        self.assertEqual(totales, [Recibo.objects.get(pk=r.pk).total()
+                                   for r in recibos])
+
+
+class VentaDiariaTest(ReciboTestMixin, TestCase):
+    def resumen(self):
+        return sorted(VentaDiaria.objects.values_list(
+            'fecha', 'item', 'item_type', 'cajero', 'remite', 'ventas',
+            'cantidad', 'monto', 'impuesto', 'descuento', 'total'))
+
+    def assertResumenCompleto(self):
+        actual = self.resumen()
+        hoy = timezone.localtime(timezone.now()).date()
+        VentaDiaria.objects.reconstruir(hoy, hoy)
+
+        self.assertEqual(actual, self.resumen())
+
+    def test_diferencias(self):
+        recibo = self.crear_recibo(4, self.tipo_de_venta)
+        otro = self.crear_recibo(3)
+        self.assertResumenCompleto()
+
+        venta = recibo.ventas.all()[0]
+        venta.cantidad += 2
+        venta.save()
+        self.assertResumenCompleto()
+
+        venta.recibo = otro
+        venta.save()
+        otro.ventas.all()[1].delete()
+        self.assertResumenCompleto()
+
+        recibo.anular()
+        self.assertResumenCompleto()
+
+        otro.delete()
+        self.assertEqual(self.resumen(), [])
+
+    def test_areas_por_recibo(self):
+        for item in self.items:
+            item.item_type.add(ItemType.objects.create(
+                nombre=u'Área {0}'.format(item.id)))
+
+        with CaptureQueriesContext(connection) as consultas:
+            self.crear_recibo(10, self.tipo_de_venta)
+        areas = [consulta for consulta in consultas.captured_queries
+                 if 'inventory_itemtemplate_item_type' in consulta['sql']]
+
+        # una consulta por producto distinto, no una por cada Venta
+        self.assertEqual(len(self.items), len(areas))
+        self.assertResumenCompleto()
+
+    def test_periodo(self):
+        for n in range(3):
+            self.crear_recibo(n + 2, self.tipo_de_venta)
+        recibos = list(Recibo.objects.order_by('created', 'id'))
+        hoy = timezone.localtime(recibos[0].created)
+        medianoche = hoy.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        # un día incompleto y otro completo desde la medianoche
+        for inicio in (recibos[1].created, medianoche):
+            fin = inicio + timedelta(days=2)
+            esperado = Venta.objects.filter(
+                recibo__created__range=(inicio, fin))
+            resumen = VentaDiaria.objects.periodo(inicio, fin, 'item')
+
+            self.assertEqual(sum(f['total'] for f in resumen.values()),
+                             esperado.sumar_montos()['total'])
+            self.assertEqual(sum(f['ventas'] for f in resumen.values()),
+                             esperado.count())
+
+
+class ComisionTest(ReciboTestMixin, TestCase):
+    def crear_recibo(self, ventas, tipo_de_venta=None, radiologo=u''):
+        recibo = super(ComisionTest, self).crear_recibo(ventas, tipo_de_venta,
+                                                        radiologo)
+        recibo.remite = u'Dr. Wilson'
+        recibo.save()
+        return recibo
+
+    def test_eliminar_venta(self):
+        recibo = self.crear_recibo(3, self.tipo_de_venta, u'Dr. House')
+        recibo.ventas.all()[0].delete()
+        recibo = Recibo.objects.get(pk=recibo.pk)
+
+        self.assertEqual(Comision.objects.filter(
+            recibo=recibo, tipo=Comision.RADIOLOGO).count(), 2)
+        self.assertEqual(Comision.objects.get(
+            recibo=recibo, tipo=Comision.REMITE).base, recibo.total())
+
+    def test_eliminar_recibo(self):
+        recibo = self.crear_recibo(3, self.tipo_de_venta, u'Dr. House')
+        pk = recibo.pk
+        recibo.delete()
+
+        self.assertFalse(Comision.objects.filter(recibo_id=pk).exists())
+
+
+class ResumenTurnoTest(ReciboTestMixin, TestCase):
+    def test_resumen(self):
+        inicio = timezone.now()
+        recibos = [self.crear_recibo(n + 2, self.tipo_de_venta)
+                   for n in range(3)]
+        turno = TurnoCaja.objects.create(usuario=self.usuario, inicio=inicio,
+                                         apertura=Decimal('100.00'))
+        CierreTurno.objects.create(turno=turno, pago=self.tipo_pago,
+                                   monto=Decimal('150.00'))
+
+        venta = sum(r.total() for r in recibos)
+
+        with self.assertNumQueries(0):
+            resumen = turno.resumen()
+
+        # los recibos y sus totales agrupados, sin los pagos ni los cierres
+        with self.assertNumQueries(2):
+            self.assertEqual(venta, turno.venta())
+
+        self.assertEqual(Decimal('30.00'), turno.ingresos())
+        self.assertEqual(Decimal('150.00'), turno.total_cierres())
+        self.assertEqual(Decimal('20.00'), turno.diferencia_total())
+        self.assertEqual([(self.tipo_pago, Decimal('120.00'))],
+                         list(turno.diferencia()))
+        self.assertIs(resumen, turno.resumen())
+
+
+class CrearVentasTest(ReciboTestMixin, TestCase):
+    """Las :class:`Venta`s guardadas con bulk_create deben producir los mismos
+    montos, :class:`VentaDiaria`s y :class:`Comision`es que al guardarlas una
+    por una"""
+
+    def nuevo_recibo(self, cajero):
+        return Recibo.objects.create(cliente=self.persona, cajero=cajero,
+                                     tipo_de_venta=self.tipo_de_venta,
+                                     radiologo=u'Dr. House',
+                                     remite=u'Dr. Wilson')
+
+    def ventas(self, recibo):
+        return list(recibo.ventas.order_by('item', 'id').values_list(
+            'item', 'cantidad', 'precio', 'impuesto', 'descuento',
+            'descontable'))
+
+    def comisiones(self, recibo):
+        return sorted(Comision.objects.filter(recibo=recibo).values_list(
+            'venta__item', 'tipo', 'beneficiario', 'base', 'porcentaje',
+            'monto'))
+
+    def ventas_diarias(self, cajero):
+        return sorted(VentaDiaria.objects.filter(cajero=cajero).values_list(
+            'fecha', 'item', 'item_type', 'remite', 'ventas', 'cantidad',
+            'monto', 'impuesto', 'descuento', 'total'))
+
+    def test_igual_que_save(self):
+        for item in self.items:
+            item.item_type.add(ItemType.objects.create(
+                nombre=u'Área {0}'.format(item.id)))
+        items = dict((item, n + 1) for n, item in enumerate(self.items))
+        otro = User.objects.create_user('otro', 'otro@example.com', 'otro')
+
+        masivo = self.nuevo_recibo(self.usuario)
+        crear_ventas(masivo, preparar_ventas(items, masivo), [
+            Pago(recibo=masivo, tipo=self.tipo_pago, monto=Decimal('10.00'))])
+
+        individual = self.nuevo_recibo(otro)
+        for venta in preparar_ventas(items, individual):
+            venta.save()
+        Pago.objects.create(recibo=individual, tipo=self.tipo_pago,
+                            monto=Decimal('10.00'))
+
+        self.assertEqual(self.ventas(individual), self.ventas(masivo))
+        self.assertEqual(
+            list(individual.pagos.values_list('tipo', 'monto')),
+            list(masivo.pagos.values_list('tipo', 'monto')))
+        for monto in ('subtotal', 'impuesto', 'descuento', 'total'):
+            self.assertEqual(getattr(individual, monto)(),
+                             getattr(masivo, monto)())
+        self.assertEqual(individual.pagado(), masivo.pagado())
+        self.assertTrue(self.comisiones(masivo))
+        self.assertEqual(self.comisiones(individual),
+                         self.comisiones(masivo))
+        self.assertEqual(len(self.items),
+                         VentaDiaria.objects.filter(cajero=otro).count())
+        self.assertEqual(self.ventas_diarias(otro),
+                         self.ventas_diarias(self.usuario))
+
+
+class VentaKeysetTest(ReciboTestMixin, TestCase):
+    class Vista(VentaKeysetMixin, ListView):
+        por_pagina = 3
+
+        def get_queryset(self):
+            return Venta.objects.all()
+
+    def setUp(self):
+        super(VentaKeysetTest, self).setUp()
+        for n in range(3):
+            self.crear_recibo(3)
+        # todas las ventas comparten la fecha, solo las distingue el id
+        Recibo.objects.update(created=timezone.now())
+        self.ventas = list(Venta.objects.order_by('id').values_list(
+            'id', flat=True))
+
+    def pagina(self, parametros=''):
+        request = RequestFactory().get('/ventas/', QueryDict(parametros))
+        return self.Vista.as_view()(request).context_data
+
+    def test_paginas(self):
+        vistas = list()
+        paginas = 0
+        context = self.pagina()
+        while True:
+            paginas += 1
+            vistas.extend(venta.id for venta in context['ventas'])
+            if 'siguiente' not in context:
+                break
+            context = self.pagina(context['siguiente'])
+
+        self.assertEqual(3, paginas)
+        self.assertEqual(self.ventas, vistas)
+        # la última página está completa pero no ofrece una siguiente
+        self.assertEqual(3, len(context['ventas']))
+        self.assertEqual('', context['primera'])
+
+    def test_ultima_pagina(self):
+        context = self.pagina('despues={0}'.format(self.ventas[-2]))
+
+        self.assertEqual([self.ventas[-1]],
+                         [venta.id for venta in context['ventas']])
+        self.assertNotIn('siguiente', context)
+
+    def test_cursor_invalido(self):
+        for cursor in ('abc', '', str(self.ventas[-1] + 100)):
+            context = self.pagina(u'despues={0}'.format(cursor))
+
+            self.assertEqual(self.ventas[:3],
+                             [venta.id for venta in context['ventas']])
+            self.assertEqual('despues={0}'.format(self.ventas[2]),
+                             context['siguiente'])
+
+
+class ExamenFacturarTest(ReciboTestMixin, TestCase):
+    def test_facturar(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        self.client.login(username='admin', password='admin')
+        radiologo = Radiologo.objects.create(nombre=u'Dr. House',
+                                             item=self.items[0])
+        tipo = TipoExamen.objects.create(nombre=u'Rayos X',
+                                         item=self.items[1])
+        examen = Examen.objects.create(persona=self.persona,
+                                       tipo_de_examen=tipo,
+                                       radiologo=radiologo,
+                                       tipo_de_venta=self.tipo_de_venta)
+
+        respuesta = self.client.post(
+            reverse('examen-invoice', args=[examen.id]),
+            {'facturado': 'True', 'radiologo': radiologo.id,
+             'remitio': u'Dr. Wilson'})
+        self.assertEqual(302, respuesta.status_code)
+
+        recibo = Recibo.objects.get()
+        self.assertEqual(u'Dr. House', recibo.radiologo)
+        self.assertEqual(2, recibo.ventas.count())
+        self.assertEqual([u'DR. HOUSE'], list(Comision.objects.filter(
+            recibo=recibo, tipo=Comision.RADIOLOGO).values_list(
+            'beneficiario', flat=True).distinct()))
+        self.assertTrue(Examen.objects.get(pk=examen.pk).facturado)
+
+
+class ReporteCSVTest(ReciboTestMixin, TestCase):
+    def setUp(self):
+        super(ReporteCSVTest, self).setUp()
+        User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        self.client.login(username='admin', password='admin')
+
+    def test_exportar(self):
+        recibos = [self.crear_recibo(n + 1, self.tipo_de_venta)
+                   for n in range(3)]
+        recibos[1].anular()
+        hoy = timezone.localtime(timezone.now()).date()
+
+        respuesta = self.client.get(reverse('invoice-periodo-csv'), {
+            'recibo-inicio': (hoy - timedelta(days=1)).isoformat(),
+            'recibo-fin': (hoy + timedelta(days=1)).isoformat()})
+        self.assertEqual(200, respuesta.status_code)
+        filas = list(csv.reader(
+            ''.join(respuesta.streaming_content).splitlines()))
+
+        self.assertEqual([u'Número', u'Fecha', u'Cliente', u'Subtotal',
+                          u'Impuesto', u'Descuento', u'Total', u'Nulo'],
+                         [c.decode('utf-8') for c in filas[0]])
+        esperadas = list()
+        for recibo in recibos:
+            recibo = Recibo.objects.get(pk=recibo.pk)
+            esperadas.append([
+                config.INVOICE_OFFSET + recibo.id,
+                self.persona.nombre_completo(), recibo.subtotal(),
+                recibo.impuesto(), recibo.descuento(), recibo.total(),
+                str(recibo.nulo)])
+        self.assertEqual(esperadas, sorted(
+            [int(f[0]), f[2].decode('utf-8')] +
+            [Decimal(monto) for monto in f[3:7]] + [f[7]]
+            for f in filas[1:]))
+
+    def test_formulario_invalido(self):
+        for nombre in ('invoice-periodo-csv', 'invoice-periodo-producto-csv',
+                       'invoice-periodo-remite-csv',
+                       'invoice-periodo-radiologo-csv',
+                       'periodo-venta-area-csv'):
+            respuesta = self.client.get(reverse(nombre))
+
+            self.assertEqual(respuesta.status_code, 400)
+            self.assertIn('inicio', respuesta.content)
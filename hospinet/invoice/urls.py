@@ -32,7 +32,10 @@ from invoice.views import (IndexView, ReciboPersonaCreateView, ReciboAnularView,
                            TurnoCajaDetailView, CierreTurnoCreateView,
                            DepositoDetailView, TurnoCajaUpdateView,
                            ExamenFacturarView, DepositoFacturarView,
-                           VentaDeleteView, VentaListView, VentaAreaListView)
+                           VentaDeleteView, VentaListView, VentaAreaListView,
+                           ReporteReciboCSVView, ReporteProductoCSVView,
+                           VentaAreaCSVView, ReciboRemiteCSVView,
+                           ReciboRadCSVView)
 
 
 urlpatterns = patterns('',
@@ -82,6 +85,10 @@ urlpatterns = patterns('',
            ReporteReciboView.as_view(),
            name='invoice-periodo'),
 
+       url(r'^periodo/csv$',
+           ReporteReciboCSVView.as_view(),
+           name='invoice-periodo-csv'),
+
        url(r'^periodo/detalle$',
            ReporteReciboDetailView.as_view(),
            name='invoice-periodo-detail'),
@@ -94,14 +101,26 @@ urlpatterns = patterns('',
            ReporteProductoView.as_view(),
            name='invoice-periodo-producto'),
 
+       url(r'^periodo/producto/csv$',
+           ReporteProductoCSVView.as_view(),
+           name='invoice-periodo-producto-csv'),
+
        url(r'^periodo/remite$',
            ReciboRemiteView.as_view(),
            name='invoice-periodo-remite'),
 
+       url(r'^periodo/remite/csv$',
+           ReciboRemiteCSVView.as_view(),
+           name='invoice-periodo-remite-csv'),
+
        url(r'^periodo/radiologo$',
            ReciboRadView.as_view(),
            name='invoice-periodo-radiologo'),
 
+       url(r'^periodo/radiologo/csv$',
+           ReciboRadCSVView.as_view(),
+           name='invoice-periodo-radiologo-csv'),
+
        url(r'^periodo/emergencia$',
            EmergenciaPeriodoView.as_view(),
            name='invoice-periodo-emergencia'),
@@ -114,6 +133,10 @@ urlpatterns = patterns('',
            VentaAreaListView.as_view(),
            name='periodo-venta-area'),
 
+       url(r'^periodo/venta/area/csv$',
+           VentaAreaCSVView.as_view(),
+           name='periodo-venta-area-csv'),
+
        url(r'^dia/emergencia$',
            EmergenciaDiaView.as_view(),
            name='invoice-dia-emergencia'),
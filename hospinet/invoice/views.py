@@ -21,10 +21,10 @@ from decimal import Decimal
 
 from constance import config
 from django.contrib import messages
-from django.db import models
+from django.db import models, transaction
 from django.core.urlresolvers import reverse
-from django.http import HttpResponseRedirect
-from django.shortcuts import get_object_or_404, redirect
+from django.http import HttpResponseBadRequest, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.generic import (CreateView, UpdateView, TemplateView,
@@ -40,14 +40,16 @@ from emergency.models import Emergencia
 from imaging.models import Examen
 from persona.models import Persona
 from invoice.models import (Recibo, Venta, Pago, TurnoCaja, CierreTurno,
-                            TipoPago, dot01)
+                            TipoPago, VentaDiaria, Comision, dot01)
 from invoice.forms import (ReciboForm, VentaForm, PeriodoForm,
                            EmergenciaFacturarForm, AdmisionFacturarForm,
                            CorteForm, ExamenFacturarForm, InventarioForm,
                            PagoForm, PersonaForm, TurnoCajaForm,
                            CierreTurnoForm, TurnoCajaCierreForm,
                            VentaPeriodoForm, PeriodoAreaForm)
-from inventory.models import ItemTemplate
+from inventory.models import ItemTemplate, ItemType
+from statistics.reportes import respuesta_csv, fecha_local, PeriodoView
+from statistics.views import SegundoPlanoMixin
 
 
 class InvoicePermissionMixin(LoginRequiredMixin):
@@ -84,6 +86,7 @@ class IndexView(TemplateView, InvoicePermissionMixin):
         self.create_periodo_form(context, 'productoperiodoform', 'producto',
                                  u'Productos Facturados en un Periodo',
                                  'invoice-periodo-producto')
+        context['productoperiodoform'].permitir_segundo_plano()
 
         self.create_periodo_form(context, 'remiteperiodoform', 'remite',
                                  u'Referencias de un Periodo',
@@ -371,7 +374,7 @@ class ReciboPeriodoView(TemplateView):
             self.recibos = Recibo.objects.filter(
                 created__gte=self.inicio,
                 created__lte=self.fin,
-            )
+            ).select_related('cliente').con_totales()
 
         return super(ReciboPeriodoView, self).dispatch(request, *args, **kwargs)
 
@@ -398,7 +401,8 @@ class ReporteReciboView(ReciboPeriodoView, LoginRequiredMixin):
         context['recibos'] = self.recibos
         context['inicio'] = self.inicio
         context['fin'] = self.fin
-        context['total'] = sum(r.total() for r in self.recibos.all())
+        context['total'] = sum(r.total() for r in self.recibos)
+        context['offset'] = config.INVOICE_OFFSET
 
         return context
 
@@ -423,10 +427,11 @@ class ReporteReciboDetailView(ReciboPeriodoView):
         context = super(ReporteReciboDetailView, self).get_context_data(
             **kwargs)
 
-        context['recibos'] = self.recibos
+        recibos = list(self.recibos.prefetch_related('ventas__item'))
+        context['recibos'] = recibos
         context['inicio'] = self.inicio
         context['fin'] = self.fin
-        context['total'] = sum(r.total() for r in self.recibos.all())
+        context['total'] = sum(r.total() for r in recibos)
 
         return context
 
@@ -455,17 +460,19 @@ class ReporteTipoView(ReciboPeriodoView):
         context['total'] = Decimal('0')
         categorias = defaultdict(lambda: defaultdict(Decimal))
         self.recibos = self.recibos.filter(nulo=False)
-        for recibo in self.recibos.all():
 
-            for venta in recibo.ventas.all():
-                monto = venta.total()
-                categoria = venta.item.item_type.first()
+        resumen = VentaDiaria.objects.periodo(self.inicio, self.fin,
+                                              'item_type')
+        areas = ItemType.objects.in_bulk([a for a in resumen if a])
+
+        for area, fila in resumen.items():
+            categoria = areas.get(area)
 
-                categorias[categoria]['monto'] += monto
-                categorias[categoria]['cantidad'] += 1
+            categorias[categoria]['monto'] += fila['total']
+            categorias[categoria]['cantidad'] += fila['ventas']
 
-                context['cantidad'] += 1
-                context['total'] += monto
+            context['cantidad'] += fila['ventas']
+            context['total'] += fila['total']
 
         context['recibos'] = self.recibos
         context['categorias'] = categorias.items()
@@ -474,7 +481,8 @@ class ReporteTipoView(ReciboPeriodoView):
         return context
 
 
-class ReporteProductoView(ReciboPeriodoView, LoginRequiredMixin):
+class ReporteProductoView(SegundoPlanoMixin, ReciboPeriodoView,
+                          LoginRequiredMixin):
     """Muestra los ingresos captados mediante :class:`Recibo`s, distribuyendo
     los mismos de acuerdo al :class:`Producto` que se facturó, tomando en
     cuenta el periodo especificado"""
@@ -497,27 +505,70 @@ class ReporteProductoView(ReciboPeriodoView, LoginRequiredMixin):
         context = super(ReporteProductoView, self).get_context_data(**kwargs)
 
         context['cantidad'] = 0
-        context['total'] = Decimal('0')
         productos = defaultdict(lambda: defaultdict(Decimal))
 
-        for recibo in self.recibos.all():
+        resumen = VentaDiaria.objects.periodo(self.inicio, self.fin, 'item')
+        items = ItemTemplate.objects.in_bulk([i for i in resumen if i])
 
-            for venta in recibo.ventas.all():
-                productos[venta.item]['monto'] += venta.monto()
-                productos[venta.item]['cantidad'] += 1
+        for pk, fila in resumen.items():
+            item = items.get(pk)
+            productos[item]['monto'] += fila['monto']
+            productos[item]['cantidad'] += fila['ventas']
 
-                context['cantidad'] += 1
+            context['cantidad'] += fila['ventas']
 
         context['recibos'] = self.recibos
         context['productos'] = productos.items()
-        context['impuesto'] = sum(r.impuesto() for r in self.recibos.all())
-        context['total'] = sum(r.total() for r in self.recibos.all())
+        context['impuesto'] = sum((f['impuesto'] for f in resumen.values()),
+                                  Decimal('0'))
+        context['total'] = sum((f['total'] for f in resumen.values()),
+                               Decimal('0'))
         context['inicio'] = self.inicio
         context['fin'] = self.fin
         return context
 
 
-class VentaListView(ListView):
+class VentaKeysetMixin(object):
+    """Pagina las :class:`Venta`s de un reporte utilizando como cursor la
+    fecha del :class:`Recibo` y el id de la última :class:`Venta` mostrada,
+    de manera que las páginas posteriores no requieran un OFFSET"""
+
+    por_pagina = 100
+
+    def get_context_data(self, **kwargs):
+        context = super(VentaKeysetMixin, self).get_context_data(**kwargs)
+
+        ventas = self.object_list.order_by('recibo__created', 'id')
+        parametros = self.request.GET.copy()
+
+        try:
+            despues = int(parametros.pop('despues', [None])[0])
+        except (TypeError, ValueError):
+            despues = None
+
+        if despues is not None:
+            creado = Venta.objects.filter(pk=despues).values_list(
+                'recibo__created', flat=True).first()
+            if creado is not None:
+                ventas = ventas.filter(
+                    models.Q(recibo__created__gt=creado) |
+                    models.Q(recibo__created=creado, id__gt=despues))
+            context['primera'] = parametros.urlencode()
+
+        pagina = list(ventas[:self.por_pagina + 1])
+        if len(pagina) > self.por_pagina:
+            pagina = pagina[:self.por_pagina]
+            parametros['despues'] = pagina[-1].id
+            context['siguiente'] = parametros.urlencode()
+
+        context['ventas'] = context['object_list'] = pagina
+        context['total'] = self.object_list.sumar_montos()['total']
+        context['offset'] = config.INVOICE_OFFSET
+
+        return context
+
+
+class VentaListView(VentaKeysetMixin, ListView):
     context_object_name = 'ventas'
 
     def dispatch(self, request, *args, **kwargs):
@@ -535,14 +586,13 @@ class VentaListView(ListView):
             recibo__created__lte=self.fin,
             recibo__nulo=False,
             item=self.item,
-        )
+        ).select_related('recibo__tipo_de_venta', 'recibo__cliente', 'item')
 
     def get_context_data(self, **kwargs):
         context = super(VentaListView, self).get_context_data(**kwargs)
         context['item'] = self.item
         context['inicio'] = self.inicio
         context['fin'] = self.fin
-        context['total'] = sum(v.total() for v in self.object_list)
         return context
 
 
@@ -565,20 +615,24 @@ class ReciboRemiteView(ReciboPeriodoView, LoginRequiredMixin):
 
         context = super(ReciboRemiteView, self).get_context_data(**kwargs)
 
-        context['cantidad'] = Decimal('0')
-        doctores = defaultdict(lambda: defaultdict(Decimal))
+        comisiones = Comision.objects.filter(
+            tipo=Comision.REMITE,
+            fecha__gte=self.inicio,
+            fecha__lte=self.fin,
+        )
 
-        for recibo in self.recibos.all():
-            doctores[recibo.remite.upper()]['monto'] += recibo.total()
-            doctores[recibo.remite.upper()]['cantidad'] += 1
-            doctores[recibo.remite.upper()][
-                'comision'] += recibo.comision_doctor()
+        doctores = comisiones.order_by('beneficiario').values(
+            'beneficiario').annotate(cantidad=models.Count('id'),
+                                     total=models.Sum('base'),
+                                     comision=models.Sum('monto'))
 
-        context['cantidad'] = sum(doctores[d]['comision'] for d in doctores)
+        context['cantidad'] = comisiones.aggregate(
+            total=models.Sum('monto'))['total'] or Decimal(0)
 
-        context['recibos'] = self.recibos
+        context['comisiones'] = comisiones.select_related('recibo').order_by(
+            'fecha', 'id')
         context['inicio'] = self.inicio
-        context['doctores'] = doctores.items()
+        context['doctores'] = doctores
         context['fin'] = self.fin
         return context
 
@@ -603,65 +657,53 @@ class ReciboRadView(ReciboPeriodoView, LoginRequiredMixin):
 
         context = super(ReciboRadView, self).get_context_data(**kwargs)
 
-        context['cantidad'] = Decimal('0')
-        doctores = defaultdict(lambda: defaultdict(Decimal))
-
-        for recibo in self.recibos.all():
-            radiologo = recibo.radiologo.upper()
-
-            if not radiologo in doctores:
-                doctores[radiologo]['recibos'] = list()
-
-            doctores[radiologo]['recibos'].append(recibo)
-            doctores[radiologo]['monto'] += recibo.total()
-            doctores[radiologo]['cantidad'] += 1
-            doctores[radiologo]['comision'] += recibo.comision_radiologo()
-
-        context['cantidad'] = sum(doctores[d]['comision'] for d in doctores)
-        context['costo'] = sum(r.total() for r in self.recibos.all())
+        comisiones = Comision.objects.filter(
+            tipo=Comision.RADIOLOGO,
+            fecha__gte=self.inicio,
+            fecha__lte=self.fin,
+        )
 
-        context['recibos'] = self.recibos
+        # El costo del estudio sigue siendo el total de los recibos
+        facturado = defaultdict(Decimal)
+        for recibo in self.recibos:
+            facturado[(recibo.radiologo or u'').upper()] += recibo.total()
+
+        doctores = list(comisiones.order_by('beneficiario').values(
+            'beneficiario').annotate(cantidad=models.Count('recibo',
+                                                           distinct=True),
+                                     comision=models.Sum('monto')))
+        for doctor in doctores:
+            doctor['total'] = facturado[doctor['beneficiario']]
+
+        totales = comisiones.aggregate(base=models.Sum('base'),
+                                       comision=models.Sum('monto'))
+        context['cantidad'] = totales['comision'] or Decimal(0)
+        context['base'] = totales['base'] or Decimal(0)
+        context['costo'] = sum(facturado.values(), Decimal(0))
+
+        context['comisiones'] = comisiones.select_related(
+            'recibo__cliente', 'venta__item').order_by('fecha', 'id')
+        context['offset'] = config.INVOICE_OFFSET
         context['inicio'] = self.inicio
-        context['doctores'] = doctores.items()
+        context['doctores'] = doctores
         context['fin'] = self.fin
         return context
 
 
-class EmergenciaPeriodoView(TemplateView, LoginRequiredMixin):
-    """Muestra las opciones disponibles para la aplicación"""
+class EmergenciaPeriodoView(PeriodoView, LoginRequiredMixin):
+    """Muestra las :class:`Emergencia`s atendidas durante un periodo"""
 
     template_name = 'invoice/emergencia_list.html'
-
-    def dispatch(self, request, *args, **kwargs):
-
-        """Filtra las :class:`Emergencia` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        self.form = PeriodoForm(request.GET, prefix='emergencia')
-        if self.form.is_valid():
-
-            self.inicio = self.form.cleaned_data['inicio']
-            self.fin = datetime.combine(self.form.cleaned_data['fin'], time.max)
-            self.emergencias = Emergencia.objects.filter(
-                created__gte=self.inicio,
-                created__lte=self.fin
-            )
-
-        else:
-
-            return redirect('invoice-index')
-
-        return super(EmergenciaPeriodoView, self).dispatch(request, *args,
-                                                           **kwargs)
+    prefijo = 'emergencia'
+    redireccion = 'invoice-index'
 
     def get_context_data(self, **kwargs):
 
         """Permite utilizar las :class:`Emergencia`s en la vista"""
 
         context = super(EmergenciaPeriodoView, self).get_context_data(**kwargs)
-        context['emergencias'] = self.emergencias
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
+        context['emergencias'] = Emergencia.objects.filter(
+            created__range=(self.inicio, self.fin))
         return context
 
 
@@ -689,13 +731,14 @@ class ExamenView(ListView, LoginRequiredMixin):
         return Examen.objects.filter(facturado=False)
 
 
-def crear_ventas(items, recibo, examen=False, tecnico=False):
+def preparar_ventas(items, recibo, examen=False, tecnico=False):
     """Permite convertir un :class:`dict` de :class:`ItemTemplate` y sus
-    cantidades en una las :class:`Venta`s de un :class:`Recibo`
+    cantidades en una las :class:`Venta`s de un :class:`Recibo`, sin guardarlas
 
     Toma en consideración las indicaciones acerca de los cobros de comisiones
     indicados por los examenes"""
 
+    ventas = list()
     for item in items:
         venta = Venta()
         venta.item = item
@@ -713,8 +756,24 @@ def crear_ventas(items, recibo, examen=False, tecnico=False):
             venta.precio = precio
         venta.impuesto = item.impuestos
 
-        venta.save()
-        recibo.ventas.add(venta)
+        ventas.append(venta)
+
+    return ventas
+
+
+def crear_ventas(recibo, ventas, pagos=()):
+    """Guarda de una sola vez las :class:`Venta`s y :class:`Pago`s de un
+    :class:`Recibo` recién creado
+
+    Como bulk_create no envía señales, suma las :class:`Venta`s a las
+    :class:`VentaDiaria` y registra las :class:`Comision`es una sola vez"""
+
+    Venta.objects.bulk_create(ventas)
+    Pago.objects.bulk_create(pagos)
+    VentaDiaria.objects.registrar({}, VentaDiaria.objects.resumir(
+        Venta.objects.filter(recibo=recibo)))
+    Comision.objects.registrar(recibo)
+    recibo.refrescar_totales()
 
 
 class EmergenciaFacturarView(UpdateView, LoginRequiredMixin):
@@ -731,6 +790,7 @@ class EmergenciaFacturarView(UpdateView, LoginRequiredMixin):
     def dispatch(self, *args, **kwargs):
         return super(EmergenciaFacturarView, self).dispatch(*args, **kwargs)
 
+    @transaction.atomic
     def form_valid(self, form):
         self.object = form.save(commit=False)
 
@@ -743,7 +803,7 @@ class EmergenciaFacturarView(UpdateView, LoginRequiredMixin):
 
         recibo.save()
 
-        crear_ventas(items, recibo)
+        crear_ventas(recibo, preparar_ventas(items, recibo))
 
         self.object.facturado = True
         self.object.save()
@@ -765,6 +825,7 @@ class AdmisionFacturarView(UpdateView, LoginRequiredMixin):
     def dispatch(self, *args, **kwargs):
         return super(AdmisionFacturarView, self).dispatch(*args, **kwargs)
 
+    @transaction.atomic
     def form_valid(self, form):
         self.object = form.save(commit=False)
 
@@ -777,9 +838,9 @@ class AdmisionFacturarView(UpdateView, LoginRequiredMixin):
 
         recibo.save()
 
-        crear_ventas(items, recibo)
+        ventas = preparar_ventas(items, recibo)
 
-        for honorario in self.object.honorarios.all():
+        for honorario in self.object.honorarios.select_related('item').all():
             venta = Venta()
             venta.item = honorario.item
             venta.recibo = recibo
@@ -788,15 +849,20 @@ class AdmisionFacturarView(UpdateView, LoginRequiredMixin):
             venta.impuesto = honorario.item.impuestos
             venta.descontable = False
 
-            venta.save()
-            recibo.ventas.add(venta)
+            ventas.append(venta)
 
-        for deposito in self.object.depositos.all():
+        pagos = list()
+        depositos = list(self.object.depositos.all())
+        if depositos:
+            tipo = TipoPago.objects.get(pk=config.DEPOSIT_PAYMENT)
+        for deposito in depositos:
             pago = Pago()
             pago.recibo = recibo
             pago.monto = deposito.monto
-            pago.tipo = TipoPago.objects.get(pk=config.DEPOSIT_PAYMENT)
-            pago.save()
+            pago.tipo = tipo
+            pagos.append(pago)
+
+        crear_ventas(recibo, ventas, pagos)
 
         self.object.ultimo_cobro = timezone.now()
         self.object.save()
@@ -818,6 +884,7 @@ class ExamenFacturarView(UpdateView, LoginRequiredMixin):
     def dispatch(self, *args, **kwargs):
         return super(ExamenFacturarView, self).dispatch(*args, **kwargs)
 
+    @transaction.atomic
     def form_valid(self, form):
         self.object = form.save(commit=False)
 
@@ -826,7 +893,7 @@ class ExamenFacturarView(UpdateView, LoginRequiredMixin):
         recibo = Recibo()
         recibo.cajero = self.request.user
         recibo.cliente = self.object.persona
-        recibo.radiologo = self.object.radiologo
+        recibo.radiologo = u'{0}'.format(self.object.radiologo)
         recibo.tipo_de_venta = self.object.tipo_de_venta
         recibo.save()
 
@@ -838,7 +905,7 @@ class ExamenFacturarView(UpdateView, LoginRequiredMixin):
         venta.cantidad = 1
         venta.item = self.object.radiologo.item
         venta.impuesto = self.object.radiologo.item.impuestos
-        venta.save()
+        ventas = [venta]
 
         venta_tecnico = False
         if not self.object.tecnico is None:
@@ -851,10 +918,15 @@ class ExamenFacturarView(UpdateView, LoginRequiredMixin):
             venta.cantidad = 1
             venta.item = self.object.tecnico.item
             venta.impuesto = self.object.tecnico.item.impuestos
-            venta.save()
+            ventas.append(venta)
             venta_tecnico = True
 
-        crear_ventas(items, recibo, True, venta_tecnico)
+        ventas.extend(preparar_ventas(items, recibo, True, venta_tecnico))
+        crear_ventas(recibo, ventas)
+
+        if venta_tecnico:
+            Comision.objects.registrar_tecnico(recibo, self.object.tecnico,
+                                               items)
 
         self.object.save()
 
@@ -880,10 +952,11 @@ class CorteView(ReciboPeriodoView):
     def get_context_data(self, **kwargs):
         context = super(CorteView, self).get_context_data(**kwargs)
         context['cajero'] = self.form.cleaned_data['usuario']
-        context['recibos'] = self.recibos.filter(cajero=context['cajero'])
+        context['recibos'] = self.recibos.filter(
+            cajero=context['cajero']).prefetch_related('pagos__tipo')
         context['inicio'] = self.inicio
         context['fin'] = self.fin
-        context['total'] = sum(r.total() for r in context['recibos'].all())
+        context['total'] = sum(r.total() for r in context['recibos'])
         return context
 
     def dispatch(self, request, *args, **kwargs):
@@ -937,6 +1010,8 @@ class PagoCreateView(ReciboFormMixin, LoginRequiredMixin):
 class TurnoCajaDetailView(DetailView, LoginRequiredMixin):
     model = TurnoCaja
     context_object_name = "turno"
+    queryset = TurnoCaja.objects.select_related('usuario').prefetch_related(
+        'cierres__pago')
 
 
 class TurnoCajaCreateView(CreateView, CurrentUserFormMixin):
@@ -1000,7 +1075,7 @@ class DepositoFacturarView(UpdateView, LoginRequiredMixin):
         return HttpResponseRedirect(recibo.get_absolute_url())
 
 
-class VentaAreaListView(ListView):
+class VentaAreaListView(VentaKeysetMixin, ListView):
     context_object_name = 'ventas'
 
     def dispatch(self, request, *args, **kwargs):
@@ -1018,12 +1093,132 @@ class VentaAreaListView(ListView):
             recibo__created__lte=self.fin,
             recibo__nulo=False,
             item__item_type=self.item_type,
-        )
+        ).select_related('recibo__tipo_de_venta', 'recibo__cliente', 'item')
 
     def get_context_data(self, **kwargs):
         context = super(VentaAreaListView, self).get_context_data(**kwargs)
         context['item_type'] = self.item_type
         context['inicio'] = self.inicio
         context['fin'] = self.fin
-        context['total'] = sum(v.total() for v in self.object_list)
         return context
+
+
+class ReporteCSVMixin(object):
+    """Permite descargar un reporte de un periodo como archivo CSV, las clases
+    derivadas deben indicar sus encabezados y proporcionar un método filas
+    que genere cada fila del reporte
+
+    Cuando el formulario del periodo es inválido se responden sus errores"""
+
+    encabezados = ()
+    nombre = 'reporte'
+
+    def get(self, request, *args, **kwargs):
+        if not self.form.is_valid():
+            return HttpResponseBadRequest(self.form.errors.as_text(),
+                                          content_type='text/plain; '
+                                                       'charset=utf-8')
+
+        return respuesta_csv(self.nombre, self.encabezados, self.filas())
+
+
+class ReporteReciboCSVView(ReporteCSVMixin, ReporteReciboView):
+    """Exporta los :class:`Recibo`s de un periodo"""
+
+    nombre = 'recibos'
+    encabezados = (u'Número', u'Fecha', u'Cliente', u'Subtotal', u'Impuesto',
+                   u'Descuento', u'Total', u'Nulo')
+
+    def filas(self):
+        offset = config.INVOICE_OFFSET
+
+        for recibo in self.recibos.iterator():
+            yield (offset + recibo.id, fecha_local(recibo.created),
+                   recibo.cliente.nombre_completo(), recibo.subtotal(),
+                   recibo.impuesto(), recibo.descuento(), recibo.total(),
+                   recibo.nulo)
+
+
+class ReporteProductoCSVView(ReporteCSVMixin, ReporteProductoView):
+    """Exporta los productos facturados durante un periodo"""
+
+    nombre = 'productos'
+    encabezados = (u'Código', u'Producto', u'Ventas', u'Cantidad', u'Monto',
+                   u'Impuesto', u'Total')
+
+    def filas(self):
+        resumen = VentaDiaria.objects.periodo(self.inicio, self.fin, 'item')
+        descripciones = dict(ItemTemplate.objects.filter(
+            pk__in=[i for i in resumen if i]).values_list('id',
+                                                          'descripcion'))
+
+        for item in sorted(resumen, key=descripciones.get):
+            producto = resumen[item]
+            yield (item, descripciones.get(item), producto['ventas'],
+                   producto['cantidad'], producto['monto'],
+                   producto['impuesto'], producto['total'])
+
+
+class VentaAreaCSVView(ReporteCSVMixin, VentaAreaListView):
+    """Exporta las :class:`Venta`s de un :class:`ItemType` en un periodo"""
+
+    nombre = 'ventas-area'
+    encabezados = (u'Recibo', u'Fecha', u'Producto', u'Cantidad', u'Monto',
+                   u'Descuento', u'Impuesto', u'Total')
+
+    def filas(self):
+        offset = config.INVOICE_OFFSET
+        ventas = self.get_queryset().con_montos().values(
+            'recibo', 'recibo__created', 'item__descripcion', 'cantidad',
+            'anotado_monto', 'anotado_descuento', 'anotado_impuesto',
+            'anotado_total').order_by('recibo__created', 'id')
+
+        for venta in ventas.iterator():
+            yield (offset + venta['recibo'],
+                   fecha_local(venta['recibo__created']),
+                   venta['item__descripcion'], venta['cantidad'],
+                   venta['anotado_monto'], venta['anotado_descuento'],
+                   venta['anotado_impuesto'], venta['anotado_total'])
+
+
+class ReciboRemiteCSVView(ReporteCSVMixin, ReciboRemiteView):
+    """Exporta las :class:`Comision`es de los médicos que remitieron
+    :class:`Recibo`s durante un periodo"""
+
+    nombre = 'referencias'
+    encabezados = (u'Remite', u'Recibo', u'Fecha', u'Total', u'Comisión')
+
+    def filas(self):
+        offset = config.INVOICE_OFFSET
+        comisiones = Comision.objects.filter(
+            tipo=Comision.REMITE,
+            fecha__gte=self.inicio,
+            fecha__lte=self.fin,
+        ).values_list('beneficiario', 'recibo', 'fecha', 'base',
+                      'monto').order_by('beneficiario', 'fecha', 'id')
+
+        for remite, recibo, fecha, base, monto in comisiones.iterator():
+            yield remite, offset + recibo, fecha_local(fecha), base, monto
+
+
+class ReciboRadCSVView(ReporteCSVMixin, ReciboRadView):
+    """Exporta las :class:`Comision`es de los radiologos por cada
+    :class:`Venta` de un periodo"""
+
+    nombre = 'comisiones'
+    encabezados = (u'Radiologo', u'Recibo', u'Fecha', u'Producto', u'Base',
+                   u'Porcentaje', u'Comisión')
+
+    def filas(self):
+        offset = config.INVOICE_OFFSET
+        comisiones = Comision.objects.filter(
+            tipo=Comision.RADIOLOGO,
+            fecha__gte=self.inicio,
+            fecha__lte=self.fin,
+        ).values_list('beneficiario', 'recibo', 'fecha',
+                      'venta__item__descripcion', 'base', 'porcentaje',
+                      'monto').order_by('beneficiario', 'fecha', 'id')
+
+        for comision in comisiones.iterator():
+            yield ((comision[0], offset + comision[1],
+                    fecha_local(comision[2])) + comision[3:])
@@ -18,42 +18,43 @@
 from datetime import timedelta
 from decimal import Decimal
 
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.signals import post_init, post_save, post_delete
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
 from django_extensions.db.models import TimeStampedModel
 
 from spital.models import Admision
-from inventory.models import ItemTemplate
+from inventory.models import ItemTemplate, TipoVenta
 
 
 dot01 = Decimal('0.01')
 
 
 class Precio(object):
-    def precio_unitario(self):
-
-        tipo_de_venta = self.admision.tipo_de_venta
-        precio_de_venta = self.cargo.precio_de_venta
-
-        if not tipo_de_venta:
-            return precio_de_venta
+    """Calcula los precios mediante el :class:`ContextoPrecio` asignado al
+    registro o, en su defecto, el de su :class:`Admision`
 
-        aumento = tipo_de_venta.incremento * precio_de_venta
+    Cada modelo define su propio descuento, ya que la cantidad y la base del
+    descuento no son las mismas en un :class:`Cargo` que en una
+    :class:`OxigenoTerapia`"""
 
-        return (precio_de_venta + aumento).quantize(dot01)
+    contexto_precio = None
 
-    def descuento(self):
+    def obtener_contexto_precio(self):
 
-        tipo_de_venta = self.admision.tipo_de_venta
+        if self.contexto_precio is None:
+            return self.admision.contexto_precio()
 
-        if not tipo_de_venta:
-            return Decimal(0)
+        return self.contexto_precio
 
-        disminucion = tipo_de_venta.disminucion * self.cantidad
+    def precio_unitario(self):
 
-        return disminucion * self.cargo.precio_de_venta
+        return self.obtener_contexto_precio().precio_unitario(
+            self.cargo.precio_de_venta)
 
 
 class Turno(object):
@@ -98,24 +99,72 @@ class SignoVital(models.Model, Turno):
         super(SignoVital, self).save(*args, **kwargs)
 
 
-Admision.temperatura_promedio = property(lambda a:
-sum(s.temperatura for s
-    in a.signos_vitales.all())
-/ a.signos_vitales.count())
+# Signos vitales que se resumen para cada Admision
+CAMPOS_SIGNOS = ('temperatura', 'pulso', 'presion_sistolica',
+                 'presion_diastolica', 'respiracion', 'saturacion_de_oxigeno')
+
+# Segundos que se conserva el resumen de signos en la cache
+VIGENCIA_SIGNOS = 60 * 60
+
+
+def llave_signos(admision_id):
+    return 'nightingale:signos:{0}'.format(admision_id)
+
+
+def llave_version_signos(admision_id):
+    return 'nightingale:signos:version:{0}'.format(admision_id)
+
+
+def resumen_signos(admision_id):
+    """Obtiene la cantidad de :class:`SignoVital`es de una :class:`Admision`,
+    el promedio, mínimo y máximo de cada signo y la última lectura
 
-Admision.pulso_promedio = property(lambda a:
-sum(s.pulso for s in a.signos_vitales.all())
-/ a.signos_vitales.count())
+    El resumen guarda la versión de los :class:`SignoVital`es con la que se
+    calculó y solo se utiliza mientras la versión no cambie, de modo que un
+    resumen calculado al mismo tiempo que se modifica un registro no se
+    conserva en la cache
 
-Admision.presion_sistolica_promedio = property(lambda a:
-sum(s.presion_sistolica for s
-    in a.signos_vitales.all())
-/ a.signos_vitales.count())
+    La última fecha y el último id registrados permiten identificar la
+    versión de los datos en las respuestas HTTP"""
 
-Admision.presion_diastolica_promedio = property(lambda a:
-sum(s.presion_diastolica for s
-    in a.signos_vitales.all())
-/ a.signos_vitales.count())
+    llave = llave_signos(admision_id)
+    llave_version = llave_version_signos(admision_id)
+    guardados = cache.get_many([llave, llave_version])
+    version = guardados.get(llave_version, 0)
+    resumen = guardados.get(llave)
+
+    if resumen is None or resumen['version'] != version:
+        agregados = {'cantidad': Count('id'), 'ultimo_id': Max('id'),
+                     'ultima_fecha': Max('fecha_y_hora')}
+        for campo in CAMPOS_SIGNOS:
+            agregados[campo + '_promedio'] = Avg(campo)
+            agregados[campo + '_minimo'] = Min(campo)
+            agregados[campo + '_maximo'] = Max(campo)
+
+        signos = SignoVital.objects.filter(admision_id=admision_id)
+        resumen = signos.aggregate(**agregados)
+        resumen['version'] = version
+        resumen['ultimo'] = None
+
+        if resumen['cantidad']:
+            resumen['ultimo'] = signos.order_by('-fecha_y_hora').values(
+                'fecha_y_hora', *CAMPOS_SIGNOS).first()
+
+        cache.set(llave, resumen, VIGENCIA_SIGNOS)
+
+    return resumen
+
+
+def invalidar_resumen_signos(sender, instance, **kwargs):
+    llave = llave_version_signos(instance.admision_id)
+    try:
+        cache.incr(llave)
+    except ValueError:
+        cache.set(llave, 1, None)
+
+
+post_save.connect(invalidar_resumen_signos, sender=SignoVital)
+post_delete.connect(invalidar_resumen_signos, sender=SignoVital)
 
 
 class Evolucion(models.Model):
@@ -156,12 +205,23 @@ class Cargo(TimeStampedModel, Precio):
 
         return reverse('enfermeria-cargo-agregar', args=[self.admision.id])
 
+    def cotizar(self):
+
+        """Obtiene la :class:`Cotizacion` de la cantidad cargada"""
+
+        return self.obtener_contexto_precio().cotizar(
+            self.cargo.precio_de_venta, self.cantidad)
+
+    def descuento(self):
+
+        return self.cotizar().descuento
+
     def subtotal(self):
 
-        return (self.cantidad * self.precio_unitario()).quantize(dot01)
+        return self.cotizar().subtotal
 
     def valor(self):
-        return (self.subtotal() - self.descuento()).quantize(dot01)
+        return self.cotizar().valor
 
 
 class OrdenMedica(models.Model):
@@ -496,12 +556,8 @@ class OxigenoTerapia(TimeStampedModel, Precio):
 
     def descuento(self):
 
-        if not self.admision.tipo_de_venta:
-            return Decimal(0)
-
-        disminucion = self.admision.tipo_de_venta.disminucion * self.litros()
-
-        return disminucion * self.precio_unitario()
+        return self.obtener_contexto_precio().descuento(
+            self.precio_unitario(), self.litros())
 
     def valor(self):
         return self.subtotal() - self.descuento()
@@ -529,3 +585,70 @@ class Honorario(TimeStampedModel):
         """Obtiene la URL absoluta"""
 
         return reverse('enfermeria-honorarios', args=[self.admision.id])
+
+
+def recordar_admision(sender, instance, **kwargs):
+    instance._admision_id = instance.__dict__.get('admision_id')
+
+
+def actualizar_saldo_admision(sender, instance, **kwargs):
+    """Recalcula el saldo de la :class:`Admision` afectado por el registro y,
+    cuando el registro se cambió de :class:`Admision`, también el de la
+    anterior"""
+
+    anterior = getattr(instance, '_admision_id', None)
+    for admision in Admision.objects.filter(
+            pk__in=set([instance.admision_id, anterior]) - set([None])):
+        admision.actualizar_saldo(SALDOS[sender])
+
+    instance._admision_id = instance.admision_id
+
+
+SALDOS = {
+    Cargo: 'cargos',
+    OxigenoTerapia: 'oxigeno',
+    Honorario: 'honorarios',
+}
+
+for modelo in SALDOS:
+    post_init.connect(recordar_admision, sender=modelo)
+    post_save.connect(actualizar_saldo_admision, sender=modelo)
+    post_delete.connect(actualizar_saldo_admision, sender=modelo)
+
+
+def recordar_precios(sender, instance, **kwargs):
+    instance._precios = tuple(instance.__dict__.get(campo)
+                              for campo in PRECIOS[sender])
+
+
+def actualizar_saldos_precios(sender, instance, created=False, **kwargs):
+    """Recalcula los cargos y el oxígeno de las :class:`Admision`es abiertas
+    que utilizan el :class:`ItemTemplate` o :class:`TipoVenta` cuyo precio
+    cambió"""
+
+    precios = tuple(getattr(instance, campo) for campo in PRECIOS[sender])
+    anteriores = getattr(instance, '_precios', precios)
+    instance._precios = precios
+    if created or precios == anteriores:
+        return
+
+    if sender is TipoVenta:
+        admisiones = Admision.objects.filter(tipo_de_venta=instance)
+    else:
+        admisiones = Admision.objects.filter(
+            models.Q(cargos__cargo=instance) |
+            models.Q(oxigeno_terapias__cargo=instance)).distinct()
+
+    for admision in admisiones.exclude(estado__in=('C', 'Q')).select_related(
+            'tipo_de_venta'):
+        admision.actualizar_saldo('cargos', 'oxigeno')
+
+
+PRECIOS = {
+    ItemTemplate: ('precio_de_venta', ),
+    TipoVenta: ('incremento', 'disminucion'),
+}
+
+for modelo in PRECIOS:
+    post_init.connect(recordar_precios, sender=modelo)
+    post_save.connect(actualizar_saldos_precios, sender=modelo)
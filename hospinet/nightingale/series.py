@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+
+def reducir_serie(x, y, puntos):
+    """Selecciona los índices de una serie que mejor conservan su forma al
+    mostrar solamente la cantidad indicada de puntos
+
+    Utiliza el algoritmo Largest-Triangle-Three-Buckets: conserva el primer y
+    el último punto y de cada grupo intermedio toma el punto que forma el
+    triángulo de mayor área con el punto elegido anteriormente y el promedio
+    del grupo siguiente"""
+
+    cantidad = len(x)
+    if puntos >= cantidad or puntos < 3:
+        return range(cantidad)
+
+    tamano = (cantidad - 2) / float(puntos - 2)
+    indices = [0]
+    anterior = 0
+
+    for grupo in range(puntos - 2):
+        inicio = int(grupo * tamano) + 1
+        fin = int((grupo + 1) * tamano) + 1
+        siguiente = min(int((grupo + 2) * tamano) + 1, cantidad)
+
+        promedio_x = sum(x[fin:siguiente]) / float(siguiente - fin)
+        promedio_y = sum(y[fin:siguiente]) / float(siguiente - fin)
+
+        mayor = -1
+        elegido = inicio
+        for n in range(inicio, fin):
+            area = abs((x[anterior] - promedio_x) * (y[n] - y[anterior]) -
+                       (x[anterior] - x[n]) * (promedio_y - y[anterior]))
+            if area > mayor:
+                mayor = area
+                elegido = n
+
+        indices.append(elegido)
+        anterior = elegido
+
+    indices.append(cantidad - 1)
+
+    return indices
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 """
 This file demonstrates writing tests using the unittest module. These will pass
 when you run "manage.py test".
@@ -5,7 +6,22 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
 from django.test import TestCase
+from django.utils import timezone
+
+from inventory.models import ItemTemplate, TipoVenta
+from nightingale.models import (Cargo, OxigenoTerapia, SignoVital, dot01,
+                                llave_signos, resumen_signos)
+from nightingale.series import reducir_serie
+from persona.models import Persona
+from spital.models import Admision
 
 
 class SimpleTest(TestCase):
@@ -14,3 +30,172 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class ContextoPrecioTest(TestCase):
+    """Verifica que el :class:`ContextoPrecio` obtenga los mismos montos que
+    el cálculo de cada registro"""
+
+    def setUp(self):
+        tipo_de_venta = TipoVenta.objects.create(
+            descripcion=u'Aseguradora', incremento=Decimal('0.15'),
+            disminucion=Decimal('0.10'))
+        self.admision = Admision.objects.create(
+            paciente=Persona.objects.create(nombre=u'Juan',
+                                            apellido=u'Pérez'),
+            admitio=User.objects.create_user('enfermera', 'e@example.com',
+                                             'clave'),
+            tipo_de_venta=tipo_de_venta)
+        ahora = timezone.now()
+
+        for n in range(1, 6):
+            item = ItemTemplate.objects.create(
+                descripcion=u'Item {0}'.format(n),
+                precio_de_venta=Decimal('12.35') * n)
+            Cargo.objects.create(admision=self.admision, cargo=item,
+                                 cantidad=Decimal('1.5') * n)
+            OxigenoTerapia.objects.create(admision=self.admision, cargo=item,
+                                          inicio=ahora - timedelta(hours=n),
+                                          fin=ahora)
+
+    def test_cargos(self):
+        for cargo in Cargo.objects.select_related('cargo'):
+            tipo_de_venta = cargo.admision.tipo_de_venta
+            precio = cargo.cargo.precio_de_venta
+            unitario = (precio + tipo_de_venta.incremento * precio).quantize(
+                dot01)
+            subtotal = (cargo.cantidad * unitario).quantize(dot01)
+            descuento = tipo_de_venta.disminucion * cargo.cantidad * precio
+
+            self.assertEqual(cargo.cotizar(), (
+                unitario, subtotal, descuento,
+                (subtotal - descuento).quantize(dot01)))
+
+    def test_oxigeno(self):
+        for terapia in OxigenoTerapia.objects.select_related('cargo'):
+            tipo_de_venta = terapia.admision.tipo_de_venta
+            unitario = terapia.precio_unitario()
+            descuento = tipo_de_venta.disminucion * terapia.litros() * unitario
+
+            self.assertFalse(hasattr(terapia, 'cotizar'))
+            self.assertEqual(terapia.descuento(), descuento)
+            self.assertEqual(terapia.valor(), terapia.subtotal() - descuento)
+
+    def test_lote(self):
+        contexto = self.admision.contexto_precio()
+
+        for modelo in (Cargo, OxigenoTerapia):
+            individuales = modelo.objects.order_by('id')
+            lote = contexto.asignar(individuales.select_related('cargo'))
+
+            for individual, cotizado in zip(individuales, lote):
+                self.assertEqual(
+                    (individual.precio_unitario(), individual.subtotal(),
+                     individual.descuento(), individual.valor()),
+                    (cotizado.precio_unitario(), cotizado.subtotal(),
+                     cotizado.descuento(), cotizado.valor()))
+
+
+class SignosMixin(object):
+    def setUp(self):
+        cache.clear()
+        self.admision = Admision.objects.create(
+            paciente=Persona.objects.create(nombre=u'Juan',
+                                            apellido=u'Pérez'),
+            admitio=User.objects.create_user('enfermera', 'e@example.com',
+                                             'clave'))
+
+    def registrar(self, pulso, temperatura, horas):
+        SignoVital.objects.create(admision=self.admision, pulso=pulso,
+                                  fecha_y_hora=timezone.now() - timedelta(
+                                      hours=horas),
+                                  temperatura=temperatura,
+                                  presion_sistolica=Decimal('120'),
+                                  presion_diastolica=Decimal('80'))
+
+
+class ResumenSignosTest(SignosMixin, TestCase):
+    def test_resumen(self):
+        resumen = resumen_signos(self.admision.id)
+        self.assertEqual(0, resumen['cantidad'])
+        self.assertIsNone(resumen['temperatura_promedio'])
+        self.assertIsNone(resumen['ultimo'])
+
+        self.registrar(70, Decimal('36.50'), 2)
+        self.registrar(90, Decimal('38.50'), 1)
+
+        resumen_signos(self.admision.id)
+        # el resumen y su versión se leen de la cache en la base de datos
+        with self.assertNumQueries(2):
+            resumen = resumen_signos(self.admision.id)
+
+        self.assertEqual(2, resumen['cantidad'])
+        self.assertEqual(80, resumen['pulso_promedio'])
+        self.assertEqual(Decimal('37.5'), resumen['temperatura_promedio'])
+        self.assertEqual(70, resumen['pulso_minimo'])
+        self.assertEqual(Decimal('38.50'), resumen['temperatura_maximo'])
+        self.assertEqual(90, resumen['ultimo']['pulso'])
+
+    def test_resumen_desactualizado(self):
+        resumen = resumen_signos(self.admision.id)
+        self.registrar(70, Decimal('36.50'), 1)
+
+        # un resumen calculado antes de registrar el signo no se utiliza
+        cache.set(llave_signos(self.admision.id), resumen)
+        self.assertEqual(1, resumen_signos(self.admision.id)['cantidad'])
+
+
+class SignosSerieTest(SignosMixin, TestCase):
+    def test_reducir_serie(self):
+        x = range(100)
+        y = [n % 10 for n in x]
+
+        self.assertEqual(range(5), reducir_serie(range(5), range(5), 10))
+
+        indices = reducir_serie(x, y, 12)
+        self.assertEqual(12, len(indices))
+        self.assertEqual((0, 99), (indices[0], indices[-1]))
+        self.assertEqual(sorted(set(indices)), indices)
+
+    def test_serie(self):
+        self.client.login(username='enfermera', password='clave')
+        for n in range(20):
+            self.registrar(60 + n, Decimal('37.00'), n)
+
+        url = reverse('nightingale-signos-serie', args=[self.admision.id])
+        respuesta = self.client.get(url, {'puntos': 5})
+        self.assertEqual(200, respuesta.status_code)
+
+        datos = json.loads(respuesta.content)
+        self.assertEqual(20, datos['cantidad'])
+        self.assertEqual(5, len(datos['fechas']))
+        self.assertEqual(5, len(datos['saturacion_de_oxigeno']))
+        self.assertEqual(79, datos['pulso'][0])
+        self.assertEqual(60, datos['pulso'][-1])
+
+        etag = respuesta['ETag']
+        respuesta = self.client.get(url, {'puntos': 5},
+                                    HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, respuesta.status_code)
+
+        self.registrar(100, Decimal('39.00'), 0)
+        respuesta = self.client.get(url, {'puntos': 5},
+                                    HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, respuesta.status_code)
+
+        # una lectura anterior modificada también cambia el ETag
+        etag = respuesta['ETag']
+        signo = SignoVital.objects.order_by('fecha_y_hora')[0]
+        signo.pulso = 50
+        signo.save()
+        respuesta = self.client.get(url, {'puntos': 5},
+                                    HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, respuesta.status_code)
+        self.assertEqual(50, json.loads(respuesta.content)['pulso'][0])
+
+    def test_serie_inexistente(self):
+        self.client.login(username='enfermera', password='clave')
+        url = reverse('nightingale-signos-serie', args=[self.admision.id + 1])
+
+        self.assertEqual(404, self.client.get(url).status_code)
+        self.assertIsNone(cache.get(llave_signos(self.admision.id + 1)))
@@ -23,7 +23,8 @@ from nightingale.views import (NightingaleIndexView, NightingaleDetailView,
                                InsulinaCreateView, GlucosuriaCreateView,
                                IngestaCreateView, OrdenCreateView,
                                NotaCreateView, SignoVitalCreateView,
-                               SignosDetailView, ExcretaCreateView,
+                               SignosDetailView, SignosSerieView,
+                               ExcretaCreateView,
                                MedicamentoCreateView, DosisSuministrarView,
                                NotaUpdateView, ResumenDetailView,
                                DosisCreateView,
@@ -66,6 +67,10 @@ urlpatterns = patterns('',
                            SignosDetailView.as_view(),
                            name='nightingale-signos-grafico'),
 
+                       url(r'^(?P<pk>\d+)/signos/serie$',
+                           SignosSerieView.as_view(),
+                           name='nightingale-signos-serie'),
+
                        url(r'^(?P<pk>\d+)/cargos$',
                            NightingaleDetailView.as_view(
                                template_name='enfermeria/cargos.html'),
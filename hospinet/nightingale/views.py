@@ -14,11 +14,16 @@
 #
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
+import calendar
+import hashlib
+import json
+
+from django.conf import settings
 from django.core.urlresolvers import reverse
-from django.db.models.query_utils import Q
-from django.http import HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.views.generic import (ListView, UpdateView, DetailView, CreateView,
                                   RedirectView, DeleteView, FormView)
 from django.contrib import messages
@@ -38,11 +43,19 @@ from nightingale.models import (Cargo, Evolucion, Glicemia, Insulina, Honorario,
                                 Glucosuria, Ingesta, Excreta, NotaEnfermeria,
                                 OrdenMedica, SignoVital,
                                 Medicamento, Dosis, Devolucion, Sumario,
-                                OxigenoTerapia)
+                                OxigenoTerapia, resumen_signos)
+from nightingale.series import reducir_serie
 from spital.models import Admision
 from spital.views import AdmisionFormMixin
 from users.mixins import LoginRequiredMixin, CurrentUserFormMixin
 
+# Lecturas que devuelve SignosSerieView cuando no se indica otra cantidad
+SIGNOS_PUNTOS = getattr(settings, 'SIGNOS_PUNTOS', 500)
+SIGNOS_PUNTOS_MAXIMO = 5000
+# El pulso siempre se registra, por lo que se utiliza para reducir la serie
+COLUMNAS_SIGNOS = ('pulso', 'temperatura', 'presion_sistolica',
+                   'presion_diastolica', 'saturacion_de_oxigeno')
+
 
 class EnfermeriaPermissionMixin(LoginRequiredMixin):
     @method_decorator(permission_required('nightingale.enfermeria'))
@@ -54,7 +67,8 @@ class NightingaleIndexView(ListView, EnfermeriaPermissionMixin):
     """Permite ingresar al lobby de Admisiones que estan siendo atendidas en
     una institucion hospitalaria"""
 
-    queryset = Admision.objects.filter(Q(estado='H'))
+    queryset = Admision.objects.filter(estado='H').select_related(
+        'paciente', 'habitacion')
     context_object_name = 'admitidos'
     template_name = 'enfermeria/index.html'
 
@@ -62,21 +76,19 @@ class NightingaleIndexView(ListView, EnfermeriaPermissionMixin):
 
         context = super(NightingaleIndexView, self).get_context_data(**kwargs)
 
-        admisiones = self.queryset.all()
-        context['hospitalizados'] = Admision.objects.filter(Q(estado='I'))
-        if self.queryset.count() == 0:
-            context['promedio'] = 0
+        context['hospitalizados'] = Admision.objects.filter(
+            estado='I').select_related('paciente', 'habitacion')
+
+        # Una sola lectura de las admisiones para el promedio y la gráfica
+        tiempos = [a.tiempo_hospitalizacion() for a in self.object_list]
+        if tiempos:
+            context['promedio'] = sum(tiempos) / len(tiempos)
         else:
-            context['promedio'] = sum(a.tiempo_hospitalizacion()
-                                      for a in
-                                      admisiones) / self.queryset.count()
+            context['promedio'] = 0
 
-        context['puntos'] = '[0 , 0],' + u','.join('[{0}, {1}]'.format(n + 1,
-                                                                       admisiones[
-                                                                           n]
-                                                                           .tiempo_hospitalizacion())
-                                                   for n in
-                                                   range(self.queryset.count()))
+        context['puntos'] = '[0 , 0],' + u','.join(
+            '[{0}, {1}]'.format(n, tiempo)
+            for n, tiempo in enumerate(tiempos, 1))
 
         return context
 
@@ -142,58 +154,84 @@ class SignosDetailView(DetailView, LoginRequiredMixin):
 
     def get_context_data(self, **kwargs):
 
-        """Formatea los datos para ser utilizado las graficas de signos
-        vitales
-        
-        Actualmente se generan gráficas separadas para Pulso y Temperatura; la
-        Presión Sistólica y Diastólica comparten una misma gráfica
+        """Agrega los promedios de los signos vitales
+
+        Las gráficas obtienen sus datos de :class:`SignosSerieView`; se
+        generan gráficas separadas para Pulso y Temperatura, la Presión
+        Sistólica y Diastólica comparten una misma gráfica
         """
 
         context = super(SignosDetailView, self).get_context_data(**kwargs)
-        signos = self.object.signos_vitales.extra(
-            order_by=['fecha_y_hora']).all()
+        resumen = resumen_signos(self.object.id)
 
-        context['min'] = self.object.hospitalizacion.strftime('%Y-%m-%d %H:%M')
-
-        if self.object.signos_vitales.count() == 0:
-            context['temp_promedio'] = 0
-            context['pulso_promedio'] = 0
-            context['presion_diastolica_promedio'] = 0
-            context['presion_sistolica_promedio'] = 0
-        else:
-            context['temp_promedio'] = self.object.temperatura_promedio
-            context['pulso_promedio'] = self.object.pulso_promedio
-            context[
-                'presion_diastolica_promedio'] = self.object \
-                .presion_diastolica_promedio
-            context[
-                'presion_sistolica_promedio'] = self.object \
-                .presion_sistolica_promedio
-            inicio = signos[0].fecha_y_hora - timezone.timedelta(minutes=5)
-            context['min'] = inicio.strftime('%Y-%m-%d %H:%M')
-
-        context['pulso'] = u','.join("['{0}', {1}]".format(
-            s.fecha_y_hora.strftime('%Y-%m-%d %H:%M'), s.pulso)
-                                     for s in signos)
-        context['temperatura'] = "['{0}', 37.00], ".format(context['min']) + \
-                                 u','.join("['{0}', {1}]".format(
-                                     s.fecha_y_hora.strftime('%Y-%m-%d %H:%M'),
-                                     s.temperatura)
-                                           for s in signos)
-
-        context['presion_sistolica'] = u','.join("['{0}', {1}]".format(
-            s.fecha_y_hora.strftime('%Y-%m-%d %H:%M'),
-            s.presion_sistolica)
-                                                 for s in signos)
-
-        context['presion_diastolica'] = u','.join("['{0}', {1}]".format(
-            s.fecha_y_hora.strftime('%Y-%m-%d %H:%M'),
-            s.presion_diastolica)
-                                                  for s in signos)
+        context['resumen'] = resumen
+        context['temp_promedio'] = resumen['temperatura_promedio'] or 0
+        context['pulso_promedio'] = resumen['pulso_promedio'] or 0
+        context['presion_diastolica_promedio'] = \
+            resumen['presion_diastolica_promedio'] or 0
+        context['presion_sistolica_promedio'] = \
+            resumen['presion_sistolica_promedio'] or 0
 
         return context
 
 
+def etag_signos(request, admision):
+    resumen = resumen_signos(admision.id)
+
+    return hashlib.md5(u'{0}:{1}:{2}:{3}:{4}:{5}'.format(
+        admision.id, resumen['cantidad'], resumen['ultimo_id'],
+        resumen['ultima_fecha'], resumen['version'],
+        request.GET.get('puntos', u'')).encode('utf-8')).hexdigest()
+
+
+def modificacion_signos(request, admision):
+    return resumen_signos(admision.id)['ultima_fecha']
+
+
+class SignosSerieView(LoginRequiredMixin):
+    """Obtiene los :class:`SignoVital`es de una :class:`Admision` en formato
+    JSON, con una lista por cada columna
+
+    El parámetro puntos indica la cantidad máxima de lecturas a devolver, las
+    series más largas se reducen conservando la forma de la gráfica del pulso.
+    Las respuestas incluyen ETag y Last-Modified obtenidos de la cantidad, la
+    última fecha y el último id de los :class:`SignoVital`es, junto con la
+    versión que se incrementa al modificar cualquiera de ellos"""
+
+    def get(self, request, *args, **kwargs):
+
+        admision = get_object_or_404(Admision, pk=kwargs['pk'])
+
+        return self.serie(request, admision)
+
+    @method_decorator(condition(etag_func=etag_signos,
+                                last_modified_func=modificacion_signos))
+    def serie(self, request, admision):
+
+        try:
+            puntos = int(request.GET.get('puntos', SIGNOS_PUNTOS))
+        except ValueError:
+            puntos = SIGNOS_PUNTOS
+        puntos = max(3, min(puntos, SIGNOS_PUNTOS_MAXIMO))
+
+        signos = list(admision.signos_vitales.order_by(
+            'fecha_y_hora').values_list('fecha_y_hora', *COLUMNAS_SIGNOS))
+        fechas = [calendar.timegm(s[0].utctimetuple()) * 1000 for s in signos]
+        indices = reducir_serie(fechas, [s[1] for s in signos], puntos)
+
+        datos = {
+            'admision': admision.id,
+            'cantidad': len(signos),
+            'fechas': [fechas[n] for n in indices],
+        }
+        for columna, nombre in enumerate(COLUMNAS_SIGNOS, 1):
+            datos[nombre] = [None if signos[n][columna] is None
+                             else float(signos[n][columna]) for n in indices]
+
+        return HttpResponse(json.dumps(datos),
+                            content_type='application/json')
+
+
 class ResumenDetailView(NightingaleDetailView, SignosDetailView):
     """Muestra la información de una :class:`Admision` de forma totalmente
     consolidada, para evitar grandes saltos de navegación. También permite
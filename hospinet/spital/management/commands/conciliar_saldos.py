@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+from decimal import Decimal
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from spital.models import Admision
+
+
+class Command(BaseCommand):
+
+    """Recalcula los saldos del estado de cuenta de las :class:`Admision`es
+    abiertas y muestra las diferencias con los saldos guardados
+
+    La migración llenar_saldos llena los saldos de las :class:`Admision`es
+    existentes con las reglas de precios vigentes al crearla, este comando
+    permite verificarlos después de cambiar dichas reglas"""
+
+    option_list = BaseCommand.option_list + (
+        make_option('--todas', action='store_true', default=False,
+                    help=u'Incluir las admisiones dadas de alta y canceladas'),
+        make_option('--corregir', action='store_true', default=False,
+                    help=u'Guardar los saldos recalculados'),
+    )
+
+    def handle(self, *args, **options):
+
+        admisiones = Admision.objects.order_by('id')
+        if not options['todas']:
+            admisiones = admisiones.exclude(estado__in=('C', 'Q'))
+
+        revisadas = diferentes = 0
+        for admision in admisiones.select_related('tipo_de_venta').iterator():
+            revisadas += 1
+            saldos = admision.calcular_saldos()
+            diferencias = [(campo, getattr(admision, campo), valor)
+                           for campo, valor in sorted(saldos.items())
+                           if getattr(admision, campo) != valor]
+
+            if not diferencias:
+                continue
+
+            diferentes += 1
+            for campo, guardado, calculado in diferencias:
+                self.stdout.write(u'Admision {0} {1}: {2} -> {3} ({4})'.format(
+                    admision.id, campo, guardado, calculado,
+                    calculado - Decimal(guardado)))
+
+            if options['corregir']:
+                admision.guardar_saldos(saldos)
+
+        self.stdout.write(u'{0} admisiones revisadas, {1} con diferencias{2}'
+                          .format(revisadas, diferentes,
+                                  u' corregidas' if options['corregir']
+                                  else u''))
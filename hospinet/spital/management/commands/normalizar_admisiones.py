@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+from django.core.management.base import BaseCommand
+
+from spital.models import (Admision, normalizar_doctor,
+                           normalizar_diagnostico)
+
+
+class Command(BaseCommand):
+
+    """Calcula las llaves normalizadas de doctor y diagnóstico de las
+    :class:`Admision`es existentes, actualizando de una vez todas las que
+    comparten el mismo texto"""
+
+    def handle(self, *args, **options):
+
+        campos = (
+            ('doctor', 'doctor_normalizado', normalizar_doctor),
+            ('diagnostico', 'diagnostico_normalizado', normalizar_diagnostico),
+        )
+
+        for campo, normalizado, normalizar in campos:
+            textos = Admision.objects.order_by().values_list(
+                campo, flat=True).distinct()
+
+            actualizadas = 0
+            for texto in textos:
+                actualizadas += Admision.objects.filter(
+                    **{campo: texto}
+                ).exclude(
+                    **{normalizado: normalizar(texto)}
+                ).update(**{normalizado: normalizar(texto)})
+
+            self.stdout.write(u'{0}: {1} admisiones actualizadas'.format(
+                campo, actualizadas))
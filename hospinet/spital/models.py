@@ -15,10 +15,14 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from decimal import Decimal
 
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Sum
+from django.db.models.query import QuerySet
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import Signal
 from django.utils import timezone
 from django.core.urlresolvers import reverse
 from django.contrib.auth.models import User
@@ -48,6 +52,67 @@ class CargoAdapter(object):
         return '{0} {1}'.format(self.precio_unitario, self.valor)
 
 
+Cotizacion = namedtuple('Cotizacion',
+                        'precio_unitario subtotal descuento valor')
+
+
+class ContextoPrecio(object):
+    """Calcula los precios de los cargos de una :class:`Admision` obteniendo
+    una sola vez el incremento y la disminución de su :class:`TipoVenta`
+
+    Los registros que se cotizan deben tener cargado su :class:`ItemTemplate`,
+    por ejemplo mediante select_related('cargo'), y pueden recibir el contexto
+    mediante :meth:`asignar` para que no lo obtengan de su :class:`Admision`"""
+
+    def __init__(self, tipo_de_venta=None):
+
+        self.incremento = None
+        self.disminucion = None
+
+        if tipo_de_venta is not None:
+            self.incremento = tipo_de_venta.incremento
+            self.disminucion = tipo_de_venta.disminucion
+
+    def precio_unitario(self, precio_de_venta):
+
+        if self.incremento is None:
+            return precio_de_venta
+
+        aumento = self.incremento * precio_de_venta
+
+        return (precio_de_venta + aumento).quantize(dot01)
+
+    def descuento(self, precio, cantidad):
+
+        if self.disminucion is None:
+            return Decimal(0)
+
+        disminucion = self.disminucion * cantidad
+
+        return disminucion * precio
+
+    def cotizar(self, precio_de_venta, cantidad):
+
+        """Obtiene la :class:`Cotizacion` de una cantidad de un producto"""
+
+        precio_unitario = self.precio_unitario(precio_de_venta)
+        subtotal = (cantidad * precio_unitario).quantize(dot01)
+        descuento = self.descuento(precio_de_venta, cantidad)
+
+        return Cotizacion(precio_unitario, subtotal, descuento,
+                          (subtotal - descuento).quantize(dot01))
+
+    def asignar(self, registros):
+
+        """Asigna este contexto a todos los registros indicados"""
+
+        registros = list(registros)
+        for registro in registros:
+            registro.contexto_precio = self
+
+        return registros
+
+
 class Habitacion(models.Model):
     """Permite llevar control acerca de las :class:`Habitacion`es que se
     encuentran en el hospital para asignar adecuadamente las mismas a cada
@@ -80,6 +145,75 @@ class Habitacion(models.Model):
         return reverse('habitacion-view', args=[self.id])
 
 
+def normalizar_doctor(doctor):
+    """Obtiene el nombre con que se agrupa un doctor, ignorando las
+    mayúsculas y todo lo que se escriba después de una diagonal"""
+
+    return (doctor or u'').upper().split('/')[0].rstrip()
+
+
+def normalizar_diagnostico(diagnostico):
+    """Obtiene el texto con que se agrupa un diagnóstico"""
+
+    return (diagnostico or u'').upper()
+
+
+# Se envía al guardar los saldos de una Admision sin llamar a save
+saldo_actualizado = Signal(providing_args=['instance', 'valores'])
+
+
+# Días hospitalizado de cada Admision con las mismas reglas que
+# Admision.tiempo_hospitalizado
+DIAS_HOSPITALIZADO = u"""CASE
+    WHEN spital_admision.hospitalizacion IS NULL THEN
+        GREATEST(FLOOR(EXTRACT(EPOCH FROM NOW() - spital_admision.momento)
+                       / 86400), 0)
+        + EXTRACT(EPOCH FROM NOW() - spital_admision.momento) / 86400
+    WHEN spital_admision.fecha_alta > spital_admision.hospitalizacion THEN
+        FLOOR(EXTRACT(EPOCH FROM spital_admision.fecha_alta
+                      - spital_admision.hospitalizacion) / 86400)
+    WHEN spital_admision.ingreso IS NULL
+         OR spital_admision.ingreso <= spital_admision.hospitalizacion THEN
+        GREATEST(FLOOR(EXTRACT(EPOCH FROM NOW()
+                               - spital_admision.hospitalizacion) / 86400), 0)
+    ELSE 0
+END"""
+
+
+class AdmisionQuerySet(QuerySet):
+    def con_dias(self):
+        """Anota a cada :class:`Admision` los días que ha estado hospitalizada
+        calculados en la base de datos"""
+
+        return self.extra(select={'anotado_dias': DIAS_HOSPITALIZADO})
+
+    def dias_por_habitacion(self):
+        """Cuenta las :class:`Admision`es y suma los días hospitalizado de
+        cada :class:`Habitacion` en una sola consulta
+
+        Devuelve un :class:`dict` del id de la :class:`Habitacion` a la
+        cantidad de :class:`Admision`es y sus días"""
+
+        consulta, parametros = self.order_by().con_dias().values(
+            'habitacion', 'anotado_dias').query.sql_with_params()
+        cursor = connection.cursor()
+        cursor.execute(
+            u'SELECT a.habitacion_id, COUNT(*), '
+            u'COALESCE(SUM(a.anotado_dias), 0) FROM ({0}) a '
+            u'GROUP BY a.habitacion_id'.format(consulta), parametros)
+
+        return dict((fila[0], (fila[1], Decimal(fila[2])))
+                    for fila in cursor.fetchall())
+
+
+class AdmisionManager(models.Manager):
+    def get_queryset(self):
+        return AdmisionQuerySet(self.model, using=self._db)
+
+    def con_dias(self):
+        return self.get_queryset().con_dias()
+
+
 class Admision(models.Model):
     """Permite registrar el Ingreso y estadía de una :class:`Persona` en el
     Hospital.
@@ -135,6 +269,10 @@ class Admision(models.Model):
 
     diagnostico = models.CharField(max_length=200, blank=True)
     doctor = models.CharField(max_length=200, blank=True)
+    diagnostico_normalizado = models.CharField(max_length=200, blank=True,
+                                               db_index=True, editable=False)
+    doctor_normalizado = models.CharField(max_length=200, blank=True,
+                                          db_index=True, editable=False)
 
     habitacion = models.ForeignKey(Habitacion, related_name='admisiones',
                                    null=True, blank=True)
@@ -173,6 +311,27 @@ class Admision(models.Model):
     ultimo_cobro = models.DateTimeField(default=timezone.now, null=True,
                                         blank=True)
     tipo_de_venta = models.ForeignKey(TipoVenta, blank=True, null=True)
+    saldo_cargos = models.DecimalField(max_digits=11, decimal_places=2,
+                                       default=0, editable=False)
+    descuento_cargos = models.DecimalField(max_digits=11, decimal_places=2,
+                                           default=0, editable=False)
+    saldo_oxigeno = models.DecimalField(max_digits=11, decimal_places=2,
+                                        default=0, editable=False)
+    descuento_oxigeno = models.DecimalField(max_digits=11, decimal_places=2,
+                                            default=0, editable=False)
+    saldo_honorarios = models.DecimalField(max_digits=11, decimal_places=2,
+                                           default=0, editable=False)
+    saldo_depositos = models.DecimalField(max_digits=11, decimal_places=2,
+                                          default=0, editable=False)
+
+    objects = AdmisionManager()
+
+    SALDOS = ('cargos', 'oxigeno', 'honorarios', 'depositos')
+
+    def __init__(self, *args, **kwargs):
+
+        super(Admision, self).__init__(*args, **kwargs)
+        self._tipo_de_venta_id = self.__dict__.get('tipo_de_venta_id')
 
     def autorizar(self):
 
@@ -299,15 +458,17 @@ class Admision(models.Model):
 
         return (ahora - ultimo).days
 
+    def contexto_precio(self):
+
+        """Obtiene el :class:`ContextoPrecio` de esta :class:`Admision`"""
+
+        return ContextoPrecio(self.tipo_de_venta)
+
     def precio_diario(self):
 
         precio = self.habitacion.item.precio_de_venta
 
-        if not self.tipo_de_venta:
-            return precio
-
-        aumento = self.tipo_de_venta.incremento * precio
-        return (precio + aumento).quantize(Decimal("0.01"))
+        return self.contexto_precio().precio_unitario(precio)
 
     def descuento_diario(self):
 
@@ -358,11 +519,104 @@ class Admision(models.Model):
         else:
             self.tiempo = self.tiempo_ahora()
 
+    def normalizar(self):
+
+        """Actualiza las llaves con que se agrupan el doctor y el diagnóstico
+        en las estadísticas"""
+
+        self.doctor_normalizado = normalizar_doctor(self.doctor)
+        self.diagnostico_normalizado = normalizar_diagnostico(
+            self.diagnostico)
+
     def save(self, *args, **kwargs):
 
         self.actualizar_tiempo()
+        self.normalizar()
         super(Admision, self).save(*args, **kwargs)
 
+        # Los precios de cargos y oxígeno dependen del tipo de venta
+        if self._tipo_de_venta_id != self.tipo_de_venta_id:
+            self._tipo_de_venta_id = self.tipo_de_venta_id
+            self.actualizar_saldo('cargos', 'oxigeno')
+
+    def calcular_cargos(self):
+
+        """Calcula el subtotal y el descuento de los :class:`Cargo`s"""
+
+        subtotal = descuento = Decimal(0)
+        cargos = self.cargos.filter(cargo__isnull=False).select_related(
+            'cargo')
+
+        for cargo in self.contexto_precio().asignar(cargos):
+            cotizacion = cargo.cotizar()
+            subtotal += cotizacion.subtotal
+            descuento += cotizacion.subtotal - cotizacion.valor
+
+        return {'saldo_cargos': subtotal, 'descuento_cargos': descuento}
+
+    def calcular_oxigeno(self):
+
+        """Calcula el subtotal y el descuento de las terapias de oxígeno"""
+
+        subtotal = descuento = Decimal(0)
+
+        terapias = self.oxigeno_terapias.filter(
+            cargo__isnull=False).select_related('cargo')
+
+        for terapia in self.contexto_precio().asignar(terapias):
+            subtotal += terapia.subtotal()
+            descuento += terapia.descuento()
+
+        return {'saldo_oxigeno': subtotal,
+                'descuento_oxigeno': descuento.quantize(dot01)}
+
+    def calcular_honorarios(self):
+
+        monto = self.honorarios.aggregate(monto=Sum('monto'))['monto']
+        return {'saldo_honorarios': monto or Decimal(0)}
+
+    def calcular_depositos(self):
+
+        monto = self.depositos.aggregate(monto=Sum('monto'))['monto']
+        return {'saldo_depositos': monto or Decimal(0)}
+
+    def calcular_saldos(self):
+
+        """Calcula todos los saldos del estado de cuenta a partir de los
+        registros de esta :class:`Admision`"""
+
+        saldos = dict()
+        for saldo in self.SALDOS:
+            saldos.update(getattr(self, 'calcular_' + saldo)())
+
+        return saldos
+
+    def actualizar_saldo(self, *saldos):
+
+        """Recalcula los saldos indicados y los guarda sin modificar los
+        demás campos de la :class:`Admision`"""
+
+        valores = dict()
+        for saldo in saldos or self.SALDOS:
+            valores.update(getattr(self, 'calcular_' + saldo)())
+
+        return self.guardar_saldos(valores)
+
+    def guardar_saldos(self, valores):
+
+        """Guarda los saldos indicados mediante una actualización directa y
+        envía :data:`saldo_actualizado`, ya que la actualización no envía las
+        señales de guardado de la :class:`Admision`"""
+
+        Admision.objects.filter(pk=self.pk).update(**valores)
+        for campo, valor in valores.items():
+            setattr(self, campo, valor)
+
+        saldo_actualizado.send(sender=Admision, instance=self,
+                               valores=valores)
+
+        return valores
+
     def get_absolute_url(self):
 
         """Obtiene la URL absoluta"""
@@ -378,16 +632,19 @@ class Admision(models.Model):
 
         items[self.habitacion.item] += self.tiempo_cobro()
 
-        for cargo in self.cargos.all():
-            print(cargo)
-            items[cargo.cargo] += cargo.cantidad
-            cargo.facturada = True
-            cargo.save()
+        with transaction.atomic():
+            cargos = self.cargos.order_by().values('cargo').annotate(
+                cantidad=models.Sum('cantidad'))
+            cargos = dict((c['cargo'], c['cantidad']) for c in cargos)
+
+            for item in ItemTemplate.objects.filter(pk__in=cargos.keys()):
+                items[item] += cargos[item.id]
 
-        for oxigeno in self.oxigeno_terapias.all():
-            items[oxigeno.cargo] += oxigeno.litros()
-            oxigeno.facturada = True
-            oxigeno.save()
+            for oxigeno in self.oxigeno_terapias.select_related('cargo'):
+                items[oxigeno.cargo] += oxigeno.litros()
+
+            self.cargos.update(facturada=True)
+            self.oxigeno_terapias.update(facturada=True)
 
         return items
 
@@ -410,42 +667,50 @@ class Admision(models.Model):
 
     def estado_de_cuenta(self, total=False, honorarios=True):
 
-        total = Decimal()
-        total += sum(c.valor() for c in self.cargos.all())
+        total = self.saldo_cargos - self.descuento_cargos
         total += self.debido() - self.descuento_hospitalizacion()
 
-        total += sum(h.monto for h in self.honorarios.all())
-        total += sum(o.valor() for o in self.oxigeno_terapias.all())
+        total += self.saldo_honorarios
+        total += self.saldo_oxigeno - self.descuento_oxigeno
 
         return total.quantize(dot01)
 
+    def saldo_pendiente(self):
+
+        """Calcula el monto que falta por cubrir luego de los
+        :class:`Deposito`s"""
+
+        return self.estado_de_cuenta() - self.saldo_depositos
+
     def agrupar_cargos(self):
 
         agrupados = defaultdict(CargoAdapter)
 
-        for cargo in self.cargos.all():
+        cargos = self.cargos.select_related('cargo')
+
+        for cargo in self.contexto_precio().asignar(cargos):
+            cotizacion = cargo.cotizar()
             agrupados[cargo.cargo].cantidad += cargo.cantidad
             agrupados[cargo.cargo].detalles.append(cargo)
-            agrupados[cargo.cargo].precio_unitario = cargo.precio_unitario()
-            agrupados[cargo.cargo].valor += cargo.valor()
-            agrupados[cargo.cargo].descuento += cargo.descuento()
-            agrupados[cargo.cargo].subtotal += cargo.subtotal()
+            agrupados[cargo.cargo].precio_unitario = cotizacion.precio_unitario
+            agrupados[cargo.cargo].valor += cotizacion.valor
+            agrupados[cargo.cargo].descuento += cotizacion.descuento
+            agrupados[cargo.cargo].subtotal += cotizacion.subtotal
 
         return dict(agrupados)
 
     def subtotal(self):
 
-        total = Decimal(0)
-        total += sum(c.subtotal() for c in self.cargos.all())
+        total = self.saldo_cargos
         total += self.debido()
-        total += sum(h.monto for h in self.honorarios.all())
-        total += sum(o.subtotal() for o in self.oxigeno_terapias.all())
+        total += self.saldo_honorarios
+        total += self.saldo_oxigeno
 
         return total.quantize(dot01)
 
     def descuento(self):
 
-        return sum(c.descuento() for c in self.cargos.all()) + self.descuento_hospitalizacion()
+        return self.descuento_cargos + self.descuento_hospitalizacion()
 
     def total(self):
 
@@ -498,3 +763,21 @@ class Deposito(TimeStampedModel):
         """Obtiene la URL absoluta"""
 
         return reverse('admision-view-id', args=[self.admision.id])
+
+
+def recordar_admision_deposito(sender, instance, **kwargs):
+    instance._admision_id = instance.__dict__.get('admision_id')
+
+
+def actualizar_saldo_depositos(sender, instance, **kwargs):
+    anterior = getattr(instance, '_admision_id', None)
+    for admision in Admision.objects.filter(
+            pk__in=set([instance.admision_id, anterior]) - set([None])):
+        admision.actualizar_saldo('depositos')
+
+    instance._admision_id = instance.admision_id
+
+
+post_init.connect(recordar_admision_deposito, sender=Deposito)
+post_save.connect(actualizar_saldo_depositos, sender=Deposito)
+post_delete.connect(actualizar_saldo_depositos, sender=Deposito)
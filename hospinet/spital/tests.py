@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 """
 This file demonstrates writing tests using the unittest module. These will pass
 when you run "manage.py test".
@@ -5,7 +6,17 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+
+from inventory.models import ItemTemplate, TipoVenta
+from nightingale.models import Cargo, Honorario, OxigenoTerapia
+from persona.models import Persona
+from spital.models import Admision, Deposito, Habitacion
 
 
 class SimpleTest(TestCase):
@@ -14,3 +25,101 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class SaldoAdmisionTest(TestCase):
+    """Verifica que los saldos guardados de la :class:`Admision` coincidan
+    con los calculados a partir de sus registros"""
+
+    def setUp(self):
+        usuario = User.objects.create_user('enfermera', 'e@example.com',
+                                           'clave')
+        self.item = ItemTemplate.objects.create(
+            descripcion=u'Suero', precio_de_venta=Decimal('12.35'))
+        self.tipo_de_venta = TipoVenta.objects.create(
+            descripcion=u'Aseguradora', incremento=Decimal('0.15'),
+            disminucion=Decimal('0.10'))
+        habitacion = Habitacion.objects.create(numero=1, tipo='N',
+                                               estado='O', item=self.item)
+        self.admision = Admision.objects.create(
+            paciente=Persona.objects.create(nombre=u'Juan',
+                                            apellido=u'Pérez'),
+            admitio=usuario, habitacion=habitacion,
+            tipo_de_venta=self.tipo_de_venta)
+
+    def recargar(self):
+        return Admision.objects.get(pk=self.admision.pk)
+
+    def test_saldos(self):
+        ahora = timezone.now()
+        cargo = Cargo.objects.create(admision=self.admision, cargo=self.item,
+                                     cantidad=3)
+        Cargo.objects.create(admision=self.admision, cargo=self.item)
+        Honorario.objects.create(admision=self.admision, item=self.item,
+                                 monto=Decimal('100'))
+        OxigenoTerapia.objects.create(admision=self.admision, cargo=self.item,
+                                      inicio=ahora - timedelta(hours=2),
+                                      fin=ahora)
+        Deposito.objects.create(admision=self.admision, monto=Decimal('50'))
+
+        admision = self.recargar()
+        self.assertEqual(admision.calcular_saldos(), dict(
+            (campo, getattr(admision, campo))
+            for campo in admision.calcular_saldos()))
+        self.assertEqual(Decimal('100'), admision.saldo_honorarios)
+        self.assertEqual(Decimal('50'), admision.saldo_depositos)
+        self.assertEqual(
+            sum(c.valor() for c in admision.cargos.all()),
+            admision.saldo_cargos - admision.descuento_cargos)
+
+        cargo.delete()
+        admision = self.recargar()
+        self.assertEqual(admision.calcular_cargos()['saldo_cargos'],
+                         admision.saldo_cargos)
+
+        admision.tipo_de_venta = None
+        admision.save()
+        admision = self.recargar()
+        self.assertEqual(Decimal('12.35'), admision.saldo_cargos)
+        self.assertEqual(Decimal(0), admision.descuento_cargos)
+
+    def assertSaldosActualizados(self, admision):
+        admision = Admision.objects.get(pk=admision.pk)
+        self.assertEqual(admision.calcular_saldos(), dict(
+            (campo, getattr(admision, campo))
+            for campo in admision.calcular_saldos()))
+
+    def test_cambio_de_precios(self):
+        Cargo.objects.create(admision=self.admision, cargo=self.item,
+                             cantidad=2)
+        OxigenoTerapia.objects.create(admision=self.admision, cargo=self.item,
+                                      inicio=timezone.now() -
+                                      timedelta(hours=1), fin=timezone.now())
+
+        self.item.precio_de_venta = Decimal('20.00')
+        self.item.save()
+        self.assertSaldosActualizados(self.admision)
+        self.assertEqual(Decimal('46.00'), self.recargar().saldo_cargos)
+
+        self.tipo_de_venta.disminucion = Decimal('0.20')
+        self.tipo_de_venta.save()
+        self.assertSaldosActualizados(self.admision)
+
+    def test_mover_registros(self):
+        otra = Admision.objects.create(paciente=self.admision.paciente,
+                                       admitio=self.admision.admitio)
+        cargo = Cargo.objects.create(admision=self.admision, cargo=self.item)
+        deposito = Deposito.objects.create(admision=self.admision,
+                                           monto=Decimal('50'))
+
+        cargo = Cargo.objects.get(pk=cargo.pk)
+        cargo.admision = otra
+        cargo.save()
+        deposito = Deposito.objects.get(pk=deposito.pk)
+        deposito.admision = otra
+        deposito.save()
+
+        for admision in (self.admision, otra):
+            self.assertSaldosActualizados(admision)
+        self.assertEqual(Decimal(0), self.recargar().saldo_cargos)
+        self.assertEqual(Decimal(0), self.recargar().saldo_depositos)
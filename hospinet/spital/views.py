@@ -15,14 +15,13 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
-from datetime import datetime, time
 from django.contrib.auth.decorators import permission_required
 
 from django.db.models import Q
 from django.core.paginator import Paginator, EmptyPage, InvalidPage
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseRedirect
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views.generic import (CreateView, ListView, TemplateView,
                                   DeleteView,
@@ -40,6 +39,7 @@ from emergency.models import Emergencia
 from persona.forms import PersonaForm, PersonaSearchForm
 from users.mixins import LoginRequiredMixin
 from invoice.forms import PeriodoForm
+from statistics.reportes import PeriodoView
 
 
 class AdmisionPermissionMixin(LoginRequiredMixin):
@@ -52,8 +52,9 @@ class AdmisionIndexView(ListView, AdmisionPermissionMixin):
     """Muestra la pagina principal de el Centro de :class:`Admisiones`"""
 
     context_object_name = 'admisiones'
-    queryset = Admision.objects.filter(~Q(estado='H') & ~Q(estado='C')
-                                       & ~Q(estado='I'))
+    queryset = Admision.objects.filter(
+        ~Q(estado='H') & ~Q(estado='C') & ~Q(estado='I')
+    ).select_related('paciente', 'habitacion')
     template_name = 'admision/index.html'
 
     def get_context_data(self, **kwargs):
@@ -63,7 +64,8 @@ class AdmisionIndexView(ListView, AdmisionPermissionMixin):
 
         context = super(AdmisionIndexView, self).get_context_data(**kwargs)
 
-        context['preadmisiones'] = PreAdmision.objects.filter(completada=False)
+        context['preadmisiones'] = PreAdmision.objects.filter(
+            completada=False).select_related('emergencia__persona')
         context['admision_periodo'] = PeriodoForm(prefix='admisiones')
         context[
             'admision_periodo'].helper.form_action = 'estadisticas-hospitalizacion'
@@ -278,35 +280,17 @@ class PagarView(RedirectView, LoginRequiredMixin):
         return reverse('admision-view-id', args=[admision.id])
 
 
-class AdmisionPeriodoView(TemplateView, LoginRequiredMixin):
-    def dispatch(self, request, *args, **kwargs):
+class AdmisionPeriodoView(PeriodoView, LoginRequiredMixin):
+    """Muestra las :class:`Admision`es ingresadas durante un periodo"""
 
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        self.form = PeriodoForm(request.GET, prefix='admisiones')
-        if self.form.is_valid():
-
-            inicio = self.form.cleaned_data['inicio']
-            fin = self.form.cleaned_data['fin']
-            self.inicio = datetime.combine(inicio, time.min)
-            self.fin = datetime.combine(fin, time.max)
-            self.admisiones = Admision.objects.filter(
-                admision__range=(inicio, fin))
-
-        else:
-
-            return redirect('admision-index')
-
-        return super(AdmisionPeriodoView, self).dispatch(request, *args,
-                                                         **kwargs)
+    prefijo = 'admisiones'
+    redireccion = 'admision-index'
 
     def get_context_data(self, **kwargs):
 
         context = super(AdmisionPeriodoView, self).get_context_data(**kwargs)
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
-        context['admisiones'] = self.admisiones
+        context['admisiones'] = Admision.objects.filter(
+            admision__range=(self.inicio, self.fin))
 
         return context
 
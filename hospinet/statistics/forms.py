@@ -12,3 +12,5 @@ class ReporteMensualForm(FieldSetFormMixin):
     
     anio = forms.IntegerField(label=_(u'Año'))
     mes = forms.IntegerField()
+    anio_fin = forms.IntegerField(label=_(u'Año final'), required=False)
+    mes_fin = forms.IntegerField(label=_(u'Mes final'), required=False)
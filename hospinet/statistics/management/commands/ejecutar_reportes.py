@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+from django.core.management.base import BaseCommand
+
+from statistics.models import Reporte
+
+
+class Command(BaseCommand):
+
+    """Genera los :class:`Reporte`s pendientes, útil para aquellos que quedaron
+    en cola cuando se reinició el servidor"""
+
+    def handle(self, *args, **options):
+
+        reportes = Reporte.objects.filter(estado=Reporte.PENDIENTE).order_by(
+            'created')
+
+        for reporte in reportes:
+            reporte.ejecutar()
+            self.stdout.write(u'Reporte {0}: {1}'.format(
+                reporte.id, reporte.get_estado_display()))
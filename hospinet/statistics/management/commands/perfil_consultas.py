@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+from collections import defaultdict
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ORDENES = ('p95', 'duplicadas', 'consultas', 'peticiones')
+
+
+def percentil(valores, fraccion):
+    ordenados = sorted(valores)
+    posicion = int(round(fraccion * (len(ordenados) - 1)))
+    return ordenados[posicion]
+
+
+class Command(BaseCommand):
+
+    """Resume las muestras del perfilado de consultas SQL, ordenando las vistas
+    por el percentil 95 de su duración o por la proporción de consultas
+    duplicadas que efectúan"""
+
+    option_list = BaseCommand.option_list + (
+        make_option('--orden', default='p95', choices=ORDENES,
+                    help=u'Criterio de orden: {0}'.format(u', '.join(ORDENES))),
+        make_option('--limite', type='int', default=20,
+                    help=u'Cantidad de vistas a mostrar'),
+    )
+
+    def archivos(self):
+        archivo = settings.PERFILADO_SQL_ARCHIVO
+        respaldos = getattr(settings, 'PERFILADO_SQL_RESPALDOS', 5)
+        candidatos = [archivo] + ['{0}.{1}'.format(archivo, n)
+                                  for n in range(1, respaldos + 1)]
+
+        return [nombre for nombre in candidatos if os.path.exists(nombre)]
+
+    def handle(self, *args, **options):
+
+        archivos = self.archivos()
+        if not archivos:
+            raise CommandError(u'No existen muestras del perfilado, active '
+                               u'PERFILADO_SQL para registrarlas')
+
+        muestras = defaultdict(list)
+        for nombre in archivos:
+            with open(nombre) as archivo:
+                for linea in archivo:
+                    try:
+                        muestra = json.loads(linea)
+                    except ValueError:
+                        continue
+                    muestras[muestra['vista']].append(muestra)
+
+        vistas = list()
+        for vista, datos in muestras.items():
+            consultas = sum(m['consultas'] for m in datos)
+            vistas.append({
+                'vista': vista,
+                'peticiones': len(datos),
+                'p95': percentil([m['duracion'] for m in datos], 0.95),
+                'sql': percentil([m['sql'] for m in datos], 0.95),
+                'consultas': consultas / float(len(datos)),
+                'duplicadas': sum(m['duplicadas'] for m in datos) /
+                              float(consultas or 1),
+            })
+
+        vistas.sort(key=lambda v: v[options['orden']], reverse=True)
+
+        self.stdout.write(u'{0:>10} {1:>9} {2:>9} {3:>10} {4:>8}  {5}'.format(
+            u'peticiones', u'p95 (s)', u'sql (s)', u'consultas',
+            u'duplic.', u'vista'))
+        for v in vistas[:options['limite']]:
+            self.stdout.write(
+                u'{peticiones:>10} {p95:>9.3f} {sql:>9.3f} {consultas:>10.1f} '
+                u'{duplicadas:>8.0%}  {vista}'.format(**v))
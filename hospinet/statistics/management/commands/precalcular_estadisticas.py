@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import date
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from statistics.models import llave_instantanea
+from statistics.views import (contar_condiciones, series_atencion,
+                              PRODUCTIVIDAD)
+
+
+class Command(BaseCommand):
+
+    """Calcula y guarda las estadísticas de los meses cerrados más recientes,
+    de manera que los reportes no tengan que calcularlas al consultarse"""
+
+    args = '[meses]'
+
+    def handle(self, *args, **options):
+
+        try:
+            cantidad = int(args[0]) if args else 12
+        except ValueError:
+            cantidad = 0
+
+        if cantidad < 1:
+            raise CommandError(u'La cantidad de meses debe ser un número '
+                               u'mayor que cero')
+
+        hoy = date.today()
+        meses = list()
+        for n in range(1, cantidad + 1):
+            anio, mes = divmod(hoy.year * 12 + hoy.month - 1 - n, 12)
+            meses.append((anio, mes + 1))
+
+        conteos = contar_condiciones(PRODUCTIVIDAD, meses[-1], meses[0])
+        for anio, mes in meses:
+            cache.set(llave_instantanea('productividad', anio, mes, ()),
+                      conteos[(anio, mes)], None)
+
+        series_atencion(['adulto', 'infantil', 'ingresos', 'hospitalizacion'],
+                        sorted(set(anio for anio, mes in meses)))
+
+        self.stdout.write(u'Estadísticas de {0} meses precalculadas'.format(
+            cantidad))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import random
+import re
+from logging.handlers import RotatingFileHandler
+from timeit import default_timer
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger('hospinet.perfil')
+
+# Valores literales que se eliminan de las consultas para obtener su huella
+LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+LISTAS = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+
+
+def huella(sql):
+    """Obtiene la forma de una consulta sin sus parámetros, de manera que las
+    consultas repetidas con distintos valores tengan la misma huella"""
+
+    return LISTAS.sub('(...)', LITERALES.sub('?', sql))
+
+
+def nombre_vista(view_func):
+    return u'{0}.{1}'.format(view_func.__module__,
+                             getattr(view_func, '__name__', 'vista'))
+
+
+class PerfilConsultasMiddleware(object):
+    """Registra, por cada petición, la cantidad de consultas, el tiempo que
+    tomaron en la base de datos y las consultas repetidas de cada vista
+
+    Solo se activa cuando PERFILADO_SQL es verdadero, PERFILADO_SQL_MUESTREO
+    indica la fracción de las peticiones que se registran. Las muestras se
+    escriben como líneas JSON en PERFILADO_SQL_ARCHIVO, el cual rota al
+    alcanzar su tamaño máximo, y se analizan con el comando perfil_consultas"""
+
+    def __init__(self):
+        if not getattr(settings, 'PERFILADO_SQL', False):
+            raise MiddlewareNotUsed
+
+        self.muestreo = getattr(settings, 'PERFILADO_SQL_MUESTREO', 1.0)
+
+        if not logger.handlers:
+            manejador = RotatingFileHandler(
+                settings.PERFILADO_SQL_ARCHIVO,
+                maxBytes=getattr(settings, 'PERFILADO_SQL_TAMANO',
+                                 10 * 1024 * 1024),
+                backupCount=getattr(settings, 'PERFILADO_SQL_RESPALDOS', 5),
+                delay=True)
+            manejador.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(manejador)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+
+    def process_request(self, request):
+
+        if random.random() >= self.muestreo:
+            return
+
+        request._perfil = {
+            'depuracion': connection.use_debug_cursor,
+            'inicio': default_timer(),
+            'consultas': len(connection.queries),
+            'vista': None,
+        }
+        connection.use_debug_cursor = True
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+
+        if hasattr(request, '_perfil'):
+            request._perfil['vista'] = nombre_vista(view_func)
+
+    def process_response(self, request, response):
+
+        perfil = getattr(request, '_perfil', None)
+        if perfil is None:
+            return response
+
+        del request._perfil
+        connection.use_debug_cursor = perfil['depuracion']
+        if perfil['vista'] is None:
+            return response
+
+        consultas = connection.queries[perfil['consultas']:]
+        huellas = dict()
+        for consulta in consultas:
+            llave = huella(consulta['sql'])
+            huellas[llave] = huellas.get(llave, 0) + 1
+
+        repetidas = sorted(((n, h) for h, n in huellas.items() if n > 1),
+                           reverse=True)
+
+        logger.info(json.dumps({
+            'vista': perfil['vista'],
+            'metodo': request.method,
+            'estado': response.status_code,
+            'duracion': default_timer() - perfil['inicio'],
+            'consultas': len(consultas),
+            'sql': sum(float(c['time']) for c in consultas),
+            'duplicadas': len(consultas) - len(huellas),
+            'repetidas': [(h, n) for n, h in repetidas[:3]],
+        }))
+
+        return response
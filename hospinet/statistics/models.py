@@ -1,3 +1,332 @@
-from django.db import models
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
-# Create your models here.
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from multiprocessing.pool import ThreadPool
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse, resolve
+from django.db import models, connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from django_extensions.db.models import TimeStampedModel
+
+from emergency.models import Emergencia
+from imaging.models import Examen
+from spital.models import Admision, saldo_actualizado
+
+logger = logging.getLogger(__name__)
+
+# Campos de fecha que determinan en que mes se contabiliza cada modelo
+CAMPOS_FECHA = {
+    Admision: ('momento', 'admision'),
+    Emergencia: ('created', ),
+    Examen: ('fecha', ),
+}
+
+
+def mes_cerrado(anio, mes):
+    """Indica si el mes ya finalizó, por lo que sus estadísticas solo cambian
+    cuando se modifican los registros que pertenecen al mismo"""
+
+    hoy = date.today()
+    return (anio, mes) < (hoy.year, hoy.month)
+
+
+def llave_version(anio, mes):
+    return 'estadisticas:version:{0}:{1}'.format(anio, mes)
+
+
+def llave_instantanea(reporte, anio, mes, parametros):
+    version = cache.get(llave_version(anio, mes), 0)
+
+    return u'estadisticas:{0}:{1}:{2}:{3}:{4}'.format(
+        reporte, anio, mes, version,
+        u':'.join(u'{0}'.format(p) for p in parametros)).encode('utf-8')
+
+
+def instantanea(reporte, anio, mes, calcular, *parametros):
+    """Obtiene el resultado de un reporte para un mes, los meses cerrados se
+    guardan en la cache y solo se recalculan cuando se invalida el mes"""
+
+    if not mes_cerrado(anio, mes):
+        return calcular()
+
+    llave = llave_instantanea(reporte, anio, mes, parametros)
+    valor = cache.get(llave)
+
+    if valor is None:
+        valor = calcular()
+        cache.set(llave, valor, None)
+
+    return valor
+
+
+def instantaneas(reporte, periodos, calcular):
+    """Obtiene varios resultados de un reporte, cada periodo se indica como
+    (año, mes, parámetros)
+
+    Los periodos de meses cerrados que se encuentren en la cache se toman de
+    la misma, calcular recibe la lista de periodos restantes y devuelve un
+    :class:`dict` de periodo a valor"""
+
+    llaves = dict((periodo, llave_instantanea(reporte, *periodo))
+                  for periodo in periodos if mes_cerrado(*periodo[:2]))
+    guardados = cache.get_many(llaves.values())
+
+    valores = dict()
+    for periodo, llave in llaves.items():
+        if llave in guardados:
+            valores[periodo] = guardados[llave]
+
+    pendientes = [periodo for periodo in periodos if periodo not in valores]
+    if pendientes:
+        valores.update(calcular(pendientes))
+        cache.set_many(dict((llaves[periodo], valores[periodo])
+                            for periodo in pendientes if periodo in llaves),
+                       None)
+
+    return valores
+
+
+def invalidar_mes(momento):
+    """Descarta las estadísticas guardadas del mes al que pertenece el
+    momento indicado"""
+
+    if momento is None:
+        return
+
+    if isinstance(momento, datetime) and timezone.is_aware(momento):
+        momento = timezone.localtime(momento)
+
+    llave = llave_version(momento.year, momento.month)
+    try:
+        cache.incr(llave)
+    except ValueError:
+        cache.set(llave, 1, None)
+
+
+def invalidar_estadisticas(sender, instance, **kwargs):
+    for campo in CAMPOS_FECHA[sender]:
+        invalidar_mes(getattr(instance, campo))
+
+
+def invalidar_estadisticas_anteriores(sender, instance, **kwargs):
+    """Invalida también los meses en que se encontraba el registro antes de
+    modificar sus fechas"""
+
+    if instance.pk is None:
+        return
+
+    anteriores = sender.objects.filter(pk=instance.pk).values_list(
+        *CAMPOS_FECHA[sender]).first()
+
+    for momento in anteriores or ():
+        invalidar_mes(momento)
+
+
+for modelo in CAMPOS_FECHA:
+    pre_save.connect(invalidar_estadisticas_anteriores, sender=modelo)
+    post_save.connect(invalidar_estadisticas, sender=modelo)
+    post_delete.connect(invalidar_estadisticas, sender=modelo)
+
+# Admision.actualizar_saldo guarda mediante update, que no envía post_save
+saldo_actualizado.connect(invalidar_estadisticas, sender=Admision)
+
+
+# Cantidad de hilos que generan reportes en cada proceso del servidor
+REPORTES_HILOS = getattr(settings, 'REPORTES_HILOS', 2)
+# Tiempo durante el cual se reutiliza un reporte con los mismos parámetros
+REPORTES_VIGENCIA = getattr(settings, 'REPORTES_VIGENCIA', timedelta(hours=1))
+# Tiempo tras el cual un reporte pendiente se considera perdido, los hilos no
+# sobreviven al reinicio del proceso que los creó
+REPORTES_LIMITE = getattr(settings, 'REPORTES_LIMITE', timedelta(hours=1))
+
+_grupo = None
+_candado = threading.Lock()
+
+
+def grupo_reportes():
+    """Obtiene el grupo de hilos del proceso actual, creándolo la primera vez
+    que se utiliza"""
+
+    global _grupo
+    with _candado:
+        if _grupo is None:
+            _grupo = ThreadPool(REPORTES_HILOS)
+    return _grupo
+
+
+def reporte_fallido(pk, error):
+    """Registra la excepción que detuvo al hilo que generaba el
+    :class:`Reporte` indicado y lo marca como fallido para que no quede
+    pendiente hasta que se descarte por REPORTES_LIMITE"""
+
+    logger.error(u'No se pudo generar el reporte %s', pk, exc_info=True)
+    Reporte.objects.filter(
+        pk=pk,
+        estado__in=(Reporte.PENDIENTE, Reporte.EJECUTANDO),
+    ).update(estado=Reporte.FALLIDO, terminado=timezone.now(),
+             error=unicode(error))
+
+
+def ejecutar_reporte(pk):
+    """Genera el :class:`Reporte` indicado desde un hilo del grupo, cerrando la
+    conexión a la base de datos que utilizó el mismo
+
+    El ThreadPool de Python 2.7 no acepta error_callback en apply_async y
+    descarta las excepciones del hilo, por lo que se atrapan aquí y se
+    entregan a :func:`reporte_fallido`"""
+
+    try:
+        reporte = Reporte.objects.get(pk=pk)
+        reporte.ejecutar()
+    except Exception as error:
+        reporte_fallido(pk, error)
+    finally:
+        connection.close()
+
+
+class ReporteManager(models.Manager):
+    def descartar_interrumpidos(self):
+        """Marca como fallidos los :class:`Reporte`s que no han avanzado
+        desde hace más de REPORTES_LIMITE, ya que el proceso que debía
+        generarlos se reinició y su grupo de hilos se perdió"""
+
+        return self.filter(
+            estado__in=(Reporte.PENDIENTE, Reporte.EJECUTANDO),
+            modified__lt=timezone.now() - REPORTES_LIMITE,
+        ).update(estado=Reporte.FALLIDO, terminado=timezone.now(),
+                 error=u'El reporte fue interrumpido, solicítelo nuevamente')
+
+    def encolar(self, usuario, vista, parametros):
+        """Registra un :class:`Reporte` y lo envía al grupo de hilos, si el
+        usuario ya solicitó el mismo reporte recientemente se devuelve el
+        existente
+
+        El hilo utiliza su propia conexión y solo puede leer el reporte una
+        vez confirmado, por lo que no debe llamarse dentro de una
+        transacción"""
+
+        if connection.in_atomic_block:
+            raise TransactionManagementError(
+                u'Los reportes deben encolarse fuera de una transacción')
+
+        self.descartar_interrumpidos()
+        reporte = self.filter(
+            usuario=usuario,
+            vista=vista,
+            parametros=parametros,
+            estado__in=(Reporte.PENDIENTE, Reporte.EJECUTANDO,
+                        Reporte.TERMINADO),
+            created__gte=timezone.now() - REPORTES_VIGENCIA,
+        ).order_by('-created').first()
+
+        if reporte is None:
+            with transaction.atomic():
+                reporte = self.create(usuario=usuario, vista=vista,
+                                      parametros=parametros)
+            grupo_reportes().apply_async(ejecutar_reporte, (reporte.pk, ))
+
+        return reporte
+
+
+class Reporte(TimeStampedModel):
+    """Reporte solicitado para ser generado en segundo plano, almacena el
+    resultado de la vista para que pueda ser consultado posteriormente sin
+    ocupar el servidor"""
+
+    PENDIENTE = 'P'
+    EJECUTANDO = 'E'
+    TERMINADO = 'T'
+    FALLIDO = 'F'
+    ESTADOS = (
+        (PENDIENTE, u'Pendiente'),
+        (EJECUTANDO, u'Ejecutando'),
+        (TERMINADO, u'Terminado'),
+        (FALLIDO, u'Fallido'),
+    )
+
+    usuario = models.ForeignKey(User, related_name='reportes')
+    vista = models.CharField(max_length=100)
+    parametros = models.TextField(blank=True)
+    estado = models.CharField(max_length=1, choices=ESTADOS,
+                              default=PENDIENTE, db_index=True)
+    terminado = models.DateTimeField(null=True, blank=True)
+    tipo = models.CharField(max_length=100, blank=True)
+    contenido = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+
+    objects = ReporteManager()
+
+    def get_absolute_url(self):
+        return reverse('estadisticas-reporte', args=[self.id])
+
+    def pendiente(self):
+        return self.estado in (Reporte.PENDIENTE, Reporte.EJECUTANDO)
+
+    def ejecutar(self):
+        """Genera el contenido llamando a la vista con los parámetros y
+        el usuario que la solicitó
+
+        Solo se ejecutan los reportes pendientes, por lo que un reporte no se
+        genera dos veces aunque se envíe a varios hilos"""
+
+        if not Reporte.objects.filter(pk=self.pk, estado=Reporte.PENDIENTE) \
+                .update(estado=Reporte.EJECUTANDO, modified=timezone.now()):
+            return
+
+        try:
+            request = HttpRequest()
+            request.method = 'GET'
+            request.path = request.path_info = reverse(self.vista)
+            request.GET = QueryDict(self.parametros)
+            request.META['SERVER_NAME'] = 'localhost'
+            request.META['SERVER_PORT'] = '80'
+            request.user = self.usuario
+
+            coincidencia = resolve(request.path_info)
+            response = coincidencia.func(request, *coincidencia.args,
+                                         **coincidencia.kwargs)
+
+            if response.status_code != 200:
+                raise ValueError(u'La vista respondió con el estado {0}'
+                                 .format(response.status_code))
+
+            if response.streaming:
+                contenido = b''.join(response.streaming_content)
+            else:
+                if hasattr(response, 'render'):
+                    response.render()
+                contenido = response.content
+
+            self.tipo = response['Content-Type']
+            self.contenido = contenido.decode('utf-8')
+            self.estado = Reporte.TERMINADO
+
+        except Exception as error:
+            self.error = unicode(error)
+            self.estado = Reporte.FALLIDO
+
+        self.terminado = timezone.now()
+        self.save()
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2011-2013 Carlos Flores <cafg10@gmail.com>
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import csv
+import hashlib
+import logging
+from datetime import datetime, time
+from timeit import default_timer
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.encoding import force_text
+from django.views.generic.base import TemplateView
+
+from invoice.forms import PeriodoForm
+
+logger = logging.getLogger(__name__)
+
+
+class BufferCSV(object):
+    """Permite que :func:`csv.writer` devuelva cada fila escrita en lugar de
+    acumularla en memoria"""
+
+    def write(self, value):
+        return value
+
+
+def exportar_csv(encabezados, filas, tamano=500):
+    """Genera el contenido de un archivo CSV en bloques de filas, de manera que
+    pueda enviarse mediante un :class:`StreamingHttpResponse` sin construir
+    todo el archivo en memoria
+
+    psycopg2 obtiene el resultado completo de cada consulta aunque se utilice
+    iterator(), por lo que las filas de la base de datos sí se cargan"""
+
+    codificar = lambda fila: [
+        '' if c is None else force_text(c).encode('utf-8') for c in fila]
+
+    writer = csv.writer(BufferCSV())
+    bloque = [writer.writerow(codificar(encabezados))]
+
+    for fila in filas:
+        bloque.append(writer.writerow(codificar(fila)))
+
+        if len(bloque) >= tamano:
+            yield ''.join(bloque)
+            bloque = list()
+
+    if bloque:
+        yield ''.join(bloque)
+
+
+def fecha_local(momento):
+    return timezone.localtime(momento).strftime('%Y-%m-%d %H:%M')
+
+
+def respuesta_csv(nombre, encabezados, filas):
+    respuesta = StreamingHttpResponse(exportar_csv(encabezados, filas),
+                                      content_type='text/csv')
+    respuesta['Content-Disposition'] = \
+        'attachment; filename="{0}.csv"'.format(nombre)
+
+    return respuesta
+
+
+class ContadorConsultas(object):
+    """Cuenta las consultas que se efectúan dentro de un bloque with,
+    registrándolas en la conexión solo mientras dura el bloque, igual que
+    :class:`PerfilConsultasMiddleware`"""
+
+    def __enter__(self):
+        self.depuracion = connection.use_debug_cursor
+        self.inicial = len(connection.queries)
+        self.cantidad = 0
+        connection.use_debug_cursor = True
+
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cantidad = len(connection.queries) - self.inicial
+        connection.use_debug_cursor = self.depuracion
+
+
+class Agregado(object):
+    """Declara un reporte de un periodo que se calcula completamente en la base
+    de datos, agrupando los registros de un modelo por sus dimensiones y
+    calculando sus medidas mediante funciones de agregado
+
+    Las dimensiones que son llaves foráneas pueden indicarse en relaciones
+    para que las filas muestren los objetos en lugar de sus llaves, los cuales
+    se cargan con una sola consulta luego de obtener el resultado"""
+
+    def __init__(self, modelo, dimensiones, medidas, campo_fecha='created',
+                 filtros=None, orden=None, relaciones=None, vigencia=600,
+                 max_consultas=1):
+        self.modelo = modelo
+        self.dimensiones = tuple(dimensiones)
+        self.medidas = tuple(medidas)
+        self.campo_fecha = campo_fecha
+        self.filtros = filtros or {}
+        self.orden = orden or self.dimensiones
+        self.relaciones = relaciones or {}
+        self.vigencia = vigencia
+        self.max_consultas = max_consultas
+
+    @property
+    def encabezados(self):
+        return self.dimensiones + tuple(nombre for nombre, _ in self.medidas)
+
+    def consulta(self, inicio, fin):
+        return self.modelo.objects.filter(
+            **{self.campo_fecha + '__range': (inicio, fin)}
+        ).filter(**self.filtros).order_by().values(
+            *self.dimensiones
+        ).annotate(**dict(self.medidas)).order_by(*self.orden)
+
+    def llave(self, nombre, inicio, fin):
+        parametros = u'{0}:{1}:{2}:{3}:{4}:{5}'.format(
+            self.modelo._meta.db_table, nombre, self.encabezados,
+            inicio.isoformat(), fin.isoformat(), sorted(self.filtros.items()))
+
+        return 'reporte:{0}'.format(
+            hashlib.md5(parametros.encode('utf-8')).hexdigest())
+
+    def calcular(self, inicio, fin):
+        return [tuple(fila[campo] for campo in self.encabezados)
+                for fila in self.consulta(inicio, fin)]
+
+    def resultados(self, nombre, inicio, fin):
+        """Obtiene las filas del reporte en el periodo indicado, utilizando la
+        cache mientras el resultado se encuentre vigente
+
+        Devuelve las filas junto con las métricas de su cálculo"""
+
+        llave = self.llave(nombre, inicio, fin)
+        filas = cache.get(llave)
+        metricas = {'cache': filas is not None, 'duracion': 0, 'consultas': 0}
+
+        if filas is None:
+            comienzo = default_timer()
+            with ContadorConsultas() as consultas:
+                filas = self.calcular(inicio, fin)
+            metricas['duracion'] = default_timer() - comienzo
+            metricas['consultas'] = consultas.cantidad
+
+            logger.info(u'Reporte %s calculado en %.3f s con %d consultas',
+                        nombre, metricas['duracion'], metricas['consultas'])
+            if metricas['consultas'] > self.max_consultas:
+                logger.warning(u'Reporte %s realizó %d consultas, se esperaban'
+                               u' %d', nombre, metricas['consultas'],
+                               self.max_consultas)
+
+            cache.set(llave, filas, self.vigencia)
+
+        return self.relacionar(filas), metricas
+
+    def relacionar(self, filas):
+        """Sustituye las llaves de las dimensiones relacionadas por sus
+        objetos"""
+
+        for dimension, modelo in self.relaciones.items():
+            posicion = self.dimensiones.index(dimension)
+            objetos = modelo.objects.in_bulk(
+                set(fila[posicion] for fila in filas))
+            filas = [fila[:posicion] + (objetos.get(fila[posicion]), ) +
+                     fila[posicion + 1:] for fila in filas]
+
+        return filas
+
+
+class PeriodoView(TemplateView):
+    """Vista que muestra la información de un periodo indicado mediante un
+    :class:`PeriodoForm`, redirigiendo a la página indicada cuando el
+    formulario es inválido"""
+
+    prefijo = None
+    redireccion = 'estadisticas'
+
+    def dispatch(self, request, *args, **kwargs):
+
+        self.form = PeriodoForm(request.GET, prefix=self.prefijo)
+        if not self.form.is_valid():
+            return redirect(self.redireccion)
+
+        # El fin del periodo incluye todo el último día
+        self.inicio = self.form.cleaned_data['inicio']
+        self.fin = timezone.make_aware(datetime.combine(
+            timezone.localtime(self.form.cleaned_data['fin']).date(),
+            time.max), timezone.get_current_timezone())
+
+        return super(PeriodoView, self).dispatch(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+
+        context = super(PeriodoView, self).get_context_data(**kwargs)
+        context['inicio'] = self.inicio
+        context['fin'] = self.fin
+
+        return context
+
+
+class ReportePeriodoView(PeriodoView):
+    """Muestra uno o más :class:`Agregado`s de un periodo, cada uno se agrega
+    al contexto con su nombre y puede descargarse en CSV mediante el parámetro
+    csv"""
+
+    reportes = {}
+
+    def get(self, request, *args, **kwargs):
+
+        nombre = request.GET.get('csv')
+        if nombre in self.reportes:
+            filas, metricas = self.reportes[nombre].resultados(
+                nombre, self.inicio, self.fin)
+            return respuesta_csv(nombre, self.reportes[nombre].encabezados,
+                                 filas)
+
+        return super(ReportePeriodoView, self).get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+
+        context = super(ReportePeriodoView, self).get_context_data(**kwargs)
+        context['metricas'] = dict()
+
+        for nombre, reporte in self.reportes.items():
+            context[nombre], context['metricas'][nombre] = reporte.resultados(
+                nombre, self.inicio, self.fin)
+
+        return context
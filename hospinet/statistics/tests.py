@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 """
 This file demonstrates writing tests using the unittest module. These will pass
 when you run "manage.py test".
@@ -5,7 +6,36 @@ when you run "manage.py test".
 Replace this with more appropriate tests for your application.
 """
 
-from django.test import TestCase
+import logging
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.db.transaction import TransactionManagementError
+from django.db.models import Count
+from django.test import TestCase, TransactionTestCase
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from clinique.models import Cita, Consultorio, DiagnosticoClinico, Paciente
+from contracts.models import Contrato, Plan, Vendedor
+from emergency.models import Cobro, Emergencia
+from imaging.models import Examen, Radiologo, TipoExamen
+from inventory.models import Inventario, Item, ItemTemplate, TipoVenta
+from invoice.models import Pago, Recibo, TipoPago, Venta
+from nightingale.models import Cargo
+from persona.models import Persona
+from spital.models import Admision, Habitacion, PreAdmision
+from statistics.middleware import huella
+from statistics.models import (REPORTES_LIMITE, Reporte, ejecutar_reporte,
+                               llave_version)
+from statistics.reportes import Agregado
+from statistics.views import Estadisticas
 
 
 class SimpleTest(TestCase):
@@ -14,3 +44,416 @@ class SimpleTest(TestCase):
         Tests that 1 + 1 always equals 2.
         """
         self.assertEqual(1 + 1, 2)
+
+
+class EstadisticasTest(TestCase):
+    """Verifica que el tablero de estadísticas efectúe la misma cantidad de
+    consultas sin importar cuantos registros existan"""
+
+    def setUp(self):
+        self.persona = Persona.objects.create(nombre=u'Juan',
+                                              apellido=u'Pérez')
+        self.radiologo = Radiologo.objects.create(nombre=u'Radiologo')
+        self.tipo_de_venta = TipoVenta.objects.create(
+            descripcion=u'Particular', incremento=Decimal('0'),
+            disminucion=Decimal('0'))
+        self.registros = 0
+
+    def crear_registros(self, cantidad):
+        for n in range(self.registros, self.registros + cantidad):
+            usuario = User.objects.create_user('usuario{0}'.format(n),
+                                               'usuario@example.com', 'clave')
+            habitacion = Habitacion.objects.create(numero=n, tipo='N',
+                                                   estado='D')
+            Admision.objects.create(paciente=self.persona, admitio=usuario,
+                                    habitacion=habitacion,
+                                    diagnostico=u'Diagnostico {0}'.format(n),
+                                    doctor=u'Doctor {0}'.format(n))
+            emergencia = Emergencia.objects.create(persona=self.persona,
+                                                   usuario=usuario)
+            PreAdmision.objects.create(emergencia=emergencia)
+            item = ItemTemplate.objects.create(
+                descripcion=u'Examen {0}'.format(n),
+                precio_de_venta=Decimal('100'))
+            tipo = TipoExamen.objects.create(nombre=u'Tipo {0}'.format(n),
+                                             item=item)
+            Examen.objects.create(persona=self.persona, tipo_de_examen=tipo,
+                                  radiologo=self.radiologo, usuario=usuario,
+                                  tipo_de_venta=self.tipo_de_venta)
+
+        self.registros += cantidad
+
+    def contar_consultas(self):
+        vista = Estadisticas()
+        vista.request = RequestFactory().get('/')
+
+        with CaptureQueriesContext(connection) as consultas:
+            context = vista.get_context_data()
+            for llave in ('doctores', 'emergencia_doctores',
+                          'preadmision_doctores', 'examenes_tipo'):
+                list(context[llave])
+
+        return len(consultas)
+
+    def test_consultas_constantes(self):
+        self.crear_registros(1)
+        # La primera consulta guarda las fotografías de los meses cerrados
+        self.contar_consultas()
+        pocas = self.contar_consultas()
+
+        self.crear_registros(5)
+        self.assertEqual(pocas, self.contar_consultas())
+
+
+class InstantaneaTest(TestCase):
+    def test_actualizar_saldo(self):
+        cache.clear()
+        anterior = timezone.now() - timedelta(days=40)
+        admision = Admision.objects.create(
+            paciente=Persona.objects.create(nombre=u'Juan',
+                                            apellido=u'Pérez'),
+            admitio=User.objects.create_user('enfermera', 'e@example.com',
+                                             'clave'),
+            momento=anterior, admision=anterior)
+        local = timezone.localtime(anterior)
+        llave = llave_version(local.year, local.month)
+        version = cache.get(llave)
+
+        admision.actualizar_saldo()
+        self.assertGreater(cache.get(llave), version)
+
+
+class PeriodoViewTest(TestCase):
+    def test_ultimo_dia(self):
+        usuario = User.objects.create_superuser('usuario', 'u@example.com',
+                                                'clave')
+        persona = Persona.objects.create(nombre=u'Juan', apellido=u'Pérez')
+        habitacion = Habitacion.objects.create(numero=1, tipo='N', estado='O')
+        zona = timezone.get_current_timezone()
+        for dia, hora in ((1, 10), (3, 0), (3, 23)):
+            momento = timezone.make_aware(datetime(2013, 5, dia, hora), zona)
+            Admision.objects.create(paciente=persona, admitio=usuario,
+                                    habitacion=habitacion, momento=momento,
+                                    admision=momento)
+
+        self.client.login(username='usuario', password='clave')
+        respuesta = self.client.get(
+            reverse('estadisticas-habitacion-popular'),
+            {'popular-inicio': '2013-05-01', 'popular-fin': '2013-05-03'})
+
+        self.assertEqual(3, respuesta.context['total'])
+
+
+class ProductividadTest(TestCase):
+    def test_rango(self):
+        cache.clear()
+        usuario = User.objects.create_superuser('usuario', 'u@example.com',
+                                                'clave')
+        persona = Persona.objects.create(nombre=u'Juan', apellido=u'Pérez',
+                                         sexo='M', nacimiento=date(1980, 1, 1))
+        zona = timezone.get_current_timezone()
+        for mes in (1, 1, 3):
+            momento = timezone.make_aware(datetime(2013, mes, 15), zona)
+            Admision.objects.create(paciente=persona, admitio=usuario,
+                                    momento=momento, admision=momento)
+
+        self.client.login(username='usuario', password='clave')
+        respuesta = self.client.get(reverse('estadisticas-productividad'), {
+            'anio': 2013, 'mes': 1, 'anio_fin': 2013, 'mes_fin': 3})
+
+        self.assertEqual(date(2013, 1, 1), respuesta.context['inicio'])
+        self.assertEqual(date(2013, 3, 1), respuesta.context['fin'])
+        self.assertEqual([2, 0, 1], [conteos['adultos_m'] for mes, conteos
+                                     in respuesta.context['meses']])
+        self.assertEqual(3, respuesta.context['admisiones'])
+
+
+class ReporteTest(TestCase):
+    def test_descartar_interrumpidos(self):
+        usuario = User.objects.create_user('usuario', 'u@example.com',
+                                           'clave')
+        perdido = Reporte.objects.create(usuario=usuario, vista='estadisticas')
+        reciente = Reporte.objects.create(usuario=usuario,
+                                          vista='estadisticas')
+        Reporte.objects.filter(pk=perdido.pk).update(
+            modified=timezone.now() - REPORTES_LIMITE - timedelta(minutes=1))
+
+        self.assertEqual(1, Reporte.objects.descartar_interrumpidos())
+        self.assertEqual(Reporte.FALLIDO,
+                         Reporte.objects.get(pk=perdido.pk).estado)
+        self.assertEqual(Reporte.PENDIENTE,
+                         Reporte.objects.get(pk=reciente.pk).estado)
+
+    def test_encolar_en_transaccion(self):
+        """El hilo no vería un reporte que aún no se ha confirmado"""
+
+        usuario = User.objects.create_user('usuario', 'u@example.com',
+                                           'clave')
+
+        with self.assertRaises(TransactionManagementError):
+            Reporte.objects.encolar(usuario, 'estadisticas', '')
+        self.assertFalse(Reporte.objects.exists())
+
+
+class EjecutarReporteTest(TransactionTestCase):
+    def test_error_del_hilo(self):
+        """Una excepción en el hilo marca el reporte como fallido"""
+
+        usuario = User.objects.create_user('usuario', 'u@example.com',
+                                           'clave')
+        reporte = Reporte.objects.create(usuario=usuario,
+                                         vista='estadisticas')
+
+        def ejecutar(self):
+            raise ValueError(u'Error inesperado')
+
+        registros = []
+        manejador = logging.Handler()
+        manejador.emit = registros.append
+        logger = logging.getLogger('statistics.models')
+        logger.addHandler(manejador)
+        original = Reporte.ejecutar
+        Reporte.ejecutar = ejecutar
+        try:
+            ejecutar_reporte(reporte.pk)
+        finally:
+            Reporte.ejecutar = original
+            logger.removeHandler(manejador)
+
+        reporte = Reporte.objects.get(pk=reporte.pk)
+        self.assertEqual(Reporte.FALLIDO, reporte.estado)
+        self.assertEqual(u'Error inesperado', reporte.error)
+        self.assertIsNotNone(reporte.terminado)
+        self.assertEqual(1, len(registros))
+        self.assertIsNotNone(registros[0].exc_info)
+
+
+class AgregadoTest(TestCase):
+    """Verifica que los :class:`Agregado`s se calculen con una sola consulta y
+    que se reutilice el resultado guardado"""
+
+    def setUp(self):
+        cache.clear()
+        persona = Persona.objects.create(nombre=u'Juan', apellido=u'Pérez')
+        self.usuarios = [User.objects.create_user(
+            'usuario{0}'.format(n), 'usuario@example.com', 'clave')
+            for n in range(2)]
+
+        for usuario, cantidad in zip(self.usuarios, (1, 3)):
+            for n in range(cantidad):
+                Emergencia.objects.create(persona=persona, usuario=usuario)
+
+        self.reporte = Agregado(Emergencia, ('usuario', ),
+                                (('cantidad', Count('id')), ),
+                                orden=('-cantidad', ),
+                                relaciones={'usuario': User})
+        hoy = datetime.now().date()
+        self.inicio = datetime.combine(hoy, time.min)
+        self.fin = datetime.combine(hoy, time.max)
+
+    def test_resultados(self):
+        filas, metricas = self.reporte.resultados('doctores', self.inicio,
+                                                  self.fin)
+
+        self.assertEqual([(self.usuarios[1], 3), (self.usuarios[0], 1)],
+                         filas)
+        self.assertEqual(1, metricas['consultas'])
+        self.assertFalse(metricas['cache'])
+
+        filas, metricas = self.reporte.resultados('doctores', self.inicio,
+                                                  self.fin)
+
+        self.assertEqual([(self.usuarios[1], 3), (self.usuarios[0], 1)],
+                         filas)
+        self.assertTrue(metricas['cache'])
+
+
+class HuellaTest(TestCase):
+    def test_huella(self):
+        """Las consultas que solo difieren en sus parámetros comparten la
+        misma huella"""
+
+        self.assertEqual(
+            huella(u"SELECT * FROM t1 WHERE id = 10 AND nombre = 'a''b'"),
+            huella(u"SELECT * FROM t1 WHERE id = 7 AND nombre = 'c'"))
+        self.assertEqual(huella(u'SELECT * FROM t1 WHERE id IN (1, 2, 3)'),
+                         huella(u'SELECT * FROM t1 WHERE id IN (4, 5)'))
+
+
+class PresupuestoConsultasTest(TestCase):
+    """Siembra un conjunto de datos de todas las aplicaciones y verifica que
+    cada vista se mantenga dentro de su presupuesto de consultas
+
+    Cada presupuesto indica el nombre de la url, sus argumentos, los
+    parámetros GET y la cantidad máxima de consultas. Las vistas se miden
+    antes y después de duplicar los datos, por lo que una vista que efectúe
+    consultas por cada registro falla aunque no exceda su máximo.
+
+    RENDIMIENTO_ESCALA indica cuantos registros se siembran en cada paso, de
+    manera que las pruebas puedan ejecutarse localmente con miles de
+    registros"""
+
+    escala = getattr(settings, 'RENDIMIENTO_ESCALA', 10)
+
+    def setUp(self):
+        self.usuario = User.objects.create_superuser(
+            'rendimiento', 'rendimiento@example.com', 'rendimiento')
+        self.client.login(username='rendimiento', password='rendimiento')
+
+        self.tipo_de_venta = TipoVenta.objects.create(
+            descripcion=u'Aseguradora', incremento=Decimal('0.15'),
+            disminucion=Decimal('0.10'))
+        self.tipo_pago = TipoPago.objects.create(nombre=u'Efectivo')
+        self.items = [
+            ItemTemplate.objects.create(descripcion=u'Item {0}'.format(n),
+                                        precio_de_venta=Decimal('12.35') * n,
+                                        impuestos=Decimal('0.15') * (n % 2),
+                                        comision=Decimal('30.00'))
+            for n in range(1, 6)]
+        self.radiologo = Radiologo.objects.create(nombre=u'Radiologo')
+        self.tipo_examen = TipoExamen.objects.create(nombre=u'Rayos X',
+                                                     item=self.items[0])
+        self.inventario = Inventario.objects.create(lugar=u'Bodega')
+        self.consultorio = Consultorio.objects.create(
+            nombre=u'Consultorio', usuario=self.usuario,
+            secretaria=self.usuario)
+        self.plan = Plan.objects.create(nombre=u'Plan', edad_maxima=65,
+                                        adicionales=2)
+        self.vendedor = Vendedor.objects.create(usuario=self.usuario)
+        self.sembrados = 0
+
+    def sembrar(self, cantidad):
+        """Crea la cantidad indicada de registros en cada aplicación"""
+
+        hoy = timezone.now()
+
+        for n in range(self.sembrados, self.sembrados + cantidad):
+            item = self.items[n % len(self.items)]
+            persona = Persona.objects.create(nombre=u'Persona {0}'.format(n),
+                                             apellido=u'Apellido',
+                                             sexo='MF'[n % 2])
+            habitacion = Habitacion.objects.create(numero=n, tipo='N',
+                                                   estado='D')
+
+            ingresada = Admision.objects.create(
+                paciente=persona, admitio=self.usuario, estado='I',
+                habitacion=habitacion, hospitalizacion=hoy, ingreso=hoy,
+                diagnostico=u'Diagnostico {0}'.format(n % 7),
+                doctor=u'Doctor {0}'.format(n % 5))
+            Admision.objects.create(paciente=persona, admitio=self.usuario,
+                                    estado='A')
+            Admision.objects.create(paciente=persona, admitio=self.usuario,
+                                    estado='H', habitacion=habitacion,
+                                    hospitalizacion=hoy)
+            for cargo in self.items[:2]:
+                Cargo.objects.create(admision=ingresada, cargo=cargo,
+                                     usuario=self.usuario)
+
+            recibo = Recibo.objects.create(
+                cliente=persona, cajero=self.usuario,
+                tipo_de_venta=self.tipo_de_venta,
+                radiologo=u'Radiologo {0}'.format(n % 3),
+                remite=u'Doctor {0}'.format(n % 5))
+            for cantidad_venta in range(1, 4):
+                Venta.objects.create(recibo=recibo, item=item,
+                                     cantidad=cantidad_venta,
+                                     precio=item.precio_de_venta,
+                                     impuesto=item.impuestos)
+            Pago.objects.create(recibo=recibo, tipo=self.tipo_pago,
+                                monto=Decimal('10.00'))
+
+            emergencia = Emergencia.objects.create(persona=persona,
+                                                   usuario=self.usuario)
+            Cobro.objects.create(emergencia=emergencia, cargo=item)
+            PreAdmision.objects.create(emergencia=emergencia)
+
+            Examen.objects.create(persona=persona,
+                                  tipo_de_examen=self.tipo_examen,
+                                  radiologo=self.radiologo,
+                                  usuario=self.usuario,
+                                  tipo_de_venta=self.tipo_de_venta)
+
+            Contrato.objects.create(persona=persona, numero=n,
+                                    vendedor=self.vendedor, plan=self.plan,
+                                    inicio=hoy.date(),
+                                    vencimiento=hoy.date() +
+                                    timedelta(days=365))
+
+            paciente = Paciente.objects.create(persona=persona,
+                                               consultorio=self.consultorio)
+            DiagnosticoClinico.objects.create(paciente=paciente,
+                                              diagnostico=u'Diagnostico')
+            Cita.objects.create(persona=persona, consultorio=self.consultorio)
+
+            Item.objects.create(inventario=self.inventario,
+                                plantilla=ItemTemplate.objects.create(
+                                    descripcion=u'Plantilla {0}'.format(n)),
+                                cantidad=n)
+
+        self.sembrados += cantidad
+
+    def periodo(self, prefijo, **parametros):
+        """Obtiene los parámetros de un :class:`PeriodoForm` que abarca los
+        registros sembrados"""
+
+        hoy = date.today()
+        parametros[prefijo + '-inicio'] = (hoy - timedelta(days=1)).isoformat()
+        parametros[prefijo + '-fin'] = hoy.isoformat()
+
+        return parametros
+
+    def get_presupuestos(self):
+        return (
+            ('estadisticas-diagnostico', (), self.periodo('diagnostico'), 13),
+            ('estadisticas-doctor', (), self.periodo('doctor'), 13),
+            ('estadisticas-emergencias', (), self.periodo('emergencia'), 14),
+            ('estadisticas-habitacion-popular', (), self.periodo('popular'),
+             8),
+            ('invoice-periodo', (), self.periodo('recibo'), 8),
+            ('invoice-periodo-producto', (), self.periodo('producto'), 8),
+            ('invoice-periodo-remite', (), self.periodo('remite'), 9),
+            ('invoice-periodo-radiologo', (), self.periodo('rad'), 11),
+            ('periodo-venta', (),
+             self.periodo('venta', **{'venta-item': self.items[0].id}), 10),
+            ('admision-index', (), {}, 8),
+            ('nightingale-index', (), {}, 8),
+            ('contrato-periodo', (), self.periodo('contrato-periodo'), 7),
+            ('diagnostico-periodo', (), self.periodo('diagnostico-periodo'),
+             15),
+            ('cita-periodo', (), self.periodo('cita-periodo'), 7),
+            ('inventario-index', (), {}, 7),
+            ('inventario', (self.inventario.id, ), {}, 11),
+        )
+
+    def medir(self):
+        """Obtiene la cantidad de consultas de cada vista"""
+
+        mediciones = dict()
+        for nombre, args, parametros, maximo in self.get_presupuestos():
+            cache.clear()
+            with CaptureQueriesContext(connection) as consultas:
+                respuesta = self.client.get(reverse(nombre, args=args),
+                                            parametros)
+
+            self.assertEqual(200, respuesta.status_code, nombre)
+            mediciones[nombre] = len(consultas)
+
+        return mediciones
+
+    def test_presupuesto_consultas(self):
+        self.sembrar(self.escala)
+        antes = self.medir()
+        self.sembrar(self.escala)
+        despues = self.medir()
+
+        for nombre, args, parametros, maximo in self.get_presupuestos():
+            consultas = despues[nombre]
+
+            self.assertLessEqual(
+                consultas, antes[nombre],
+                u'{0} aumentó de {1} a {2} consultas'.format(
+                    nombre, antes[nombre], consultas))
+            self.assertLessEqual(
+                consultas, maximo,
+                u'{0} excede su presupuesto con {1} consultas'.format(
+                    nombre, consultas))
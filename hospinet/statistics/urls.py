@@ -18,7 +18,8 @@
 from django.conf.urls import patterns, url
 from statistics.views import (AtencionAdulto, Estadisticas, AtencionInfantil,
     Productividad, IngresosHospitalarios, AdmisionPeriodo, EmergenciaPeriodo,
-    HabitacionPopularView, DiagnosticoView, DoctorView, CargoView)
+    HabitacionPopularView, DiagnosticoView, DoctorView, CargoView,
+    ReporteDetailView, ReporteDescargarView)
 
 urlpatterns = patterns('',
     
@@ -65,4 +66,12 @@ urlpatterns = patterns('',
     url(r'^admision/cargos$',
         CargoView.as_view(),
         name='estadisticas-cargo'),
+
+    url(r'^reporte/(?P<pk>\d+)$',
+        ReporteDetailView.as_view(),
+        name='estadisticas-reporte'),
+
+    url(r'^reporte/(?P<pk>\d+)/contenido$',
+        ReporteDescargarView.as_view(),
+        name='estadisticas-reporte-contenido'),
 )
@@ -17,16 +17,26 @@
 
 import calendar
 from datetime import date
-from decimal import Decimal
 from datetime import datetime, time
 from collections import defaultdict
 
+from django.contrib.auth.models import User
+from django.db import connection
+from django.core.urlresolvers import resolve
+from django.db.models import Count, Sum
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.generic import DetailView
 from django.views.generic.base import TemplateView
 from django.shortcuts import redirect
 from crispy_forms.layout import Fieldset
 from imaging.models import Examen
+from inventory.models import ItemTemplate
+from nightingale.models import Cargo
 
 from statistics.forms import ReporteAnualForm, ReporteMensualForm
+from statistics.models import instantanea, instantaneas, Reporte
+from statistics.reportes import Agregado, PeriodoView, ReportePeriodoView
 from spital.models import Habitacion, Admision, PreAdmision
 from invoice.forms import PeriodoForm
 from emergency.models import Emergencia
@@ -39,6 +49,112 @@ class HabitacionAdapter(object):
         self.dias = 0
 
 
+def resumir_habitaciones(admisiones):
+    """Obtiene la cantidad de :class:`Admision`es y los días hospitalizado de
+    cada :class:`Habitacion` mediante una sola consulta agrupada"""
+
+    habitaciones = defaultdict(HabitacionAdapter)
+    cuartos = dict((h.id, h) for h in Habitacion.objects.all())
+
+    for habitacion in cuartos.values():
+        habitaciones[habitacion].admisiones = 0
+
+    for habitacion, (cantidad, dias) in \
+            admisiones.dias_por_habitacion().items():
+        habitaciones[cuartos.get(habitacion)].admisiones = cantidad
+        habitaciones[cuartos.get(habitacion)].dias = dias
+
+    return habitaciones
+
+
+def sumar_cargos(admisiones):
+    """Suma las cantidades de cada :class:`ItemTemplate` cargado a las
+    :class:`Admision`es"""
+
+    filas = Cargo.objects.filter(admision__in=admisiones).order_by().values(
+        'cargo').annotate(cantidad=Sum('cantidad'))
+    items = ItemTemplate.objects.in_bulk([fila['cargo'] for fila in filas])
+
+    return dict((items.get(fila['cargo']), fila['cantidad']) for fila in filas)
+
+
+def contar_normalizado(admisiones, campo):
+    """Cuenta las :class:`Admision`es agrupándolas por una de sus llaves
+    normalizadas, devuelve una lista ordenada de parejas de llave y
+    cantidad"""
+
+    return list(admisiones.order_by(campo).values_list(campo).annotate(
+        cantidad=Count('id')))
+
+
+def contar_usuarios(queryset, campo):
+    """Cuenta los registros agrupados por el :class:`User` indicado en el
+    campo y obtiene todos los :class:`User` en una sola consulta"""
+
+    filas = queryset.order_by().values(campo).annotate(cantidad=Count('id'))
+    usuarios = User.objects.in_bulk([fila[campo] for fila in filas])
+
+    conteo = defaultdict(int)
+    for fila in filas:
+        conteo[usuarios.get(fila[campo])] += fila['cantidad']
+
+    return conteo
+
+
+class SegundoPlanoMixin(object):
+    """Permite solicitar que un reporte se genere en segundo plano, para lo
+    cual el formulario debe enviar el parámetro segundo_plano; en ese caso se
+    registra un :class:`Reporte` y se muestra el avance del mismo"""
+
+    def get(self, request, *args, **kwargs):
+
+        if 'segundo_plano' not in request.GET:
+            return super(SegundoPlanoMixin, self).get(request, *args, **kwargs)
+
+        parametros = request.GET.copy()
+        del parametros['segundo_plano']
+        reporte = Reporte.objects.encolar(request.user,
+                                          resolve(request.path_info).url_name,
+                                          parametros.urlencode())
+
+        return redirect(reporte)
+
+
+class ReporteMixin(LoginRequiredMixin):
+    def get_queryset(self):
+        Reporte.objects.descartar_interrumpidos()
+        return Reporte.objects.filter(usuario=self.request.user)
+
+
+class ReporteDetailView(ReporteMixin, DetailView):
+    """Muestra el estado de un :class:`Reporte` mientras se genera"""
+
+    model = Reporte
+    context_object_name = 'reporte'
+    template_name = 'estadisticas/reporte_detail.html'
+
+
+class ReporteDescargarView(ReporteMixin, DetailView):
+    """Devuelve el contenido generado de un :class:`Reporte`"""
+
+    model = Reporte
+
+    def render_to_response(self, context, **response_kwargs):
+
+        if self.object.estado != Reporte.TERMINADO:
+            return redirect(self.object)
+
+        response = HttpResponse(self.object.contenido,
+                                content_type=self.object.tipo)
+        if 'descargar' in self.request.GET:
+            extension = 'csv' if 'csv' in self.object.tipo else 'html'
+            response['Content-Disposition'] = \
+                'attachment; filename="reporte-{0}.{1}"'.format(
+                    self.object.id, extension)
+
+        return response
+
+
 class Estadisticas(TemplateView, LoginRequiredMixin):
     template_name = 'estadisticas/index.html'
 
@@ -51,6 +167,7 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
         context['admision_periodo'].helper.layout = Fieldset(
             u'Admisiones por Periodo',
             *context['admision_periodo'].field_names)
+        context['admision_periodo'].permitir_segundo_plano()
 
         context['emergencia_periodo'] = PeriodoForm(prefix='emergencia')
         context['emergencia_periodo'].helper.form_action = \
@@ -83,6 +200,7 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
         context['cargo'].helper.layout = Fieldset(
             u'Cargos por Periodo',
             *context['cargo'].field_names)
+        context['cargo'].permitir_segundo_plano()
 
     def get_fechas(self):
 
@@ -101,58 +219,33 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
 
     def get_diagnosticos(self, context):
 
-        diangosticos = defaultdict(int)
-        for admision in self.admisiones.all():
-            diangosticos[admision.diagnostico.upper()] += 1
-        context['diagnosticos'] = sorted(diangosticos.iteritems())
+        context['diagnosticos'] = contar_normalizado(self.admisiones,
+                                                     'diagnostico_normalizado')
 
     def get_habitaciones(self, context):
-        habitaciones = defaultdict(HabitacionAdapter)
-        context['dias'] = 0
-        context['total'] = 0
+        habitaciones = resumir_habitaciones(self.admisiones)
 
-        for habitacion in Habitacion.objects.all():
-            habitaciones[habitacion].admisiones += self.admisiones.filter(
-                habitacion=habitacion).count()
-        for admision in self.admisiones.all():
-            habitaciones[
-                admision.habitacion].dias += admision.tiempo_hospitalizado()
         context['habitaciones'] = sorted(habitaciones.items(),
                                          key=lambda x: x[0].tipo)
-
-        for habitacion in Habitacion.objects.all():
-            context['total'] += habitaciones[habitacion].admisiones
-            context['dias'] += habitaciones[habitacion].dias
+        context['total'] = sum(h.admisiones for h in habitaciones.values())
+        context['dias'] = sum(h.dias for h in habitaciones.values())
 
     def get_doctor(self, context):
 
-        doctores = defaultdict(int)
+        doctores = contar_normalizado(self.admisiones, 'doctor_normalizado')
 
-        for admision in self.admisiones.all():
-            doctor = admision.doctor.upper().split('/')[0].rstrip()
-
-            doctores[doctor] += 1
-
-        context['doctores'] = reversed(
-            sorted(doctores.iteritems(), key=lambda x: x[1]))
-        context['total_doctores'] = sum(doctores[d] for d in doctores)
+        context['doctores'] = reversed(sorted(doctores, key=lambda x: x[1]))
+        context['total_doctores'] = sum(d[1] for d in doctores)
         return context
 
     def get_year(self, context):
 
-        today = date.today()
-        admisiones = Admision.objects.filter(momento__year=today.year,
-                                             habitacion__isnull=False)
-        meses = defaultdict(int)
-        for n in range(1, 13):
-            meses[n] = 0
-
-        for admision in admisiones.all():
-            meses[admision.momento.month] += 1
+        anio = date.today().year
+        meses = series_atencion(['hospitalizacion'], [anio])
 
         context['meses'] = list()
-        for mes in sorted(meses.iteritems()):
-            context['meses'].append((calendar.month_name[mes[0]], mes[1]))
+        for mes, cantidad in enumerate(meses['hospitalizacion'][anio]):
+            context['meses'].append((calendar.month_name[mes + 1], cantidad))
 
         return context
 
@@ -165,9 +258,7 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
 
         context['emergencias'] = self.emergencias
 
-        doctores = defaultdict(int)
-        for emergencia in self.emergencias:
-            doctores[emergencia.usuario] += 1
+        doctores = contar_usuarios(self.emergencias, 'usuario')
 
         context['emergencia_doctores'] = reversed(
             sorted(doctores.items(), key=lambda x: x[1]))
@@ -175,7 +266,7 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
             sorted(doctores.items(), key=lambda x: x[1]))
         context['emergencia_grafico2'] = reversed(
             sorted(doctores.items(), key=lambda x: x[1]))
-        context['emergencia_total'] = self.emergencias.count()
+        context['emergencia_total'] = sum(doctores.values())
 
         return context
 
@@ -188,9 +279,7 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
 
         context['preadmisiones'] = self.emergencias
 
-        doctores = defaultdict(int)
-        for preadmision in self.preadmisiones:
-            doctores[preadmision.emergencia.usuario] += 1
+        doctores = contar_usuarios(self.preadmisiones, 'emergencia__usuario')
 
         context['preadmision_doctores'] = reversed(
             sorted(doctores.items(), key=lambda x: x[1]))
@@ -198,7 +287,7 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
             sorted(doctores.items(), key=lambda x: x[1]))
         context['preadmision_grafico2'] = reversed(
             sorted(doctores.items(), key=lambda x: x[1]))
-        context['preadmision_total'] = self.preadmisiones.count()
+        context['preadmision_total'] = sum(doctores.values())
 
         return context
 
@@ -211,11 +300,16 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
 
         context['examenes'] = self.examenes
 
-        doctores = defaultdict(int)
+        doctores = contar_usuarios(self.examenes, 'usuario')
+
+        cantidades = self.examenes.order_by().values(
+            'tipo_de_examen__item').annotate(cantidad=Count('id'))
+        items = ItemTemplate.objects.in_bulk(
+            [fila['tipo_de_examen__item'] for fila in cantidades])
         examenes = defaultdict(int)
-        for examen in self.examenes:
-            doctores[examen.usuario] += 1
-            examenes[examen.tipo_de_examen.item] += 1
+        for fila in cantidades:
+            examenes[items.get(fila['tipo_de_examen__item'])] += \
+                fila['cantidad']
 
         context['examenes_tecnicos'] = reversed(
             sorted(doctores.items(), key=lambda x: x[1]))
@@ -226,7 +320,7 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
         context['examenes_tipo'] = reversed(
             sorted(examenes.items(), key=lambda x: x[1]))
 
-        context['examenes_total'] = self.examenes.count()
+        context['examenes_total'] = sum(doctores.values())
 
         return context
 
@@ -249,19 +343,126 @@ class Estadisticas(TemplateView, LoginRequiredMixin):
         return context
 
 
+# Condiciones con que se cuentan las Admisiones de cada mes, los adultos e
+# infantes se separan por la fecha de nacimiento al final del año en que
+# cumplen 18 años
+LIMITE_EDAD = "CAST(CAST(m.anio - 18 AS integer) || '-12-31' AS date)"
+ADULTO = 'm.nacimiento <= ' + LIMITE_EDAD
+INFANTE = 'm.nacimiento >= ' + LIMITE_EDAD
+PRODUCTIVIDAD = (
+    ('adultos_m', ADULTO + " AND m.sexo = 'M'"),
+    ('adultos_f', ADULTO + " AND m.sexo = 'F'"),
+    ('adultos', ADULTO),
+    ('infantes_m', INFANTE + " AND m.sexo = 'M'"),
+    ('infantes_f', INFANTE + " AND m.sexo = 'F'"),
+    ('infantes', INFANTE),
+    ('neonatos_m', "m.neonato AND m.sexo = 'M'"),
+    ('neonatos_f', "m.neonato AND m.sexo = 'F'"),
+    ('neonatos', 'm.neonato'),
+    ('admisiones', 'TRUE'),
+)
+
+SERIES = {
+    'adulto': ADULTO,
+    'infantil': INFANTE,
+    'hospitalizacion': 'm.habitacion_id IS NOT NULL',
+    'ingresos': 'TRUE',
+}
+
+
+def rango_meses(inicio, fin):
+    """Obtiene el comienzo del mes inicial y el final del mes final, ambos
+    indicados como (año, mes), en la zona horaria actual"""
+
+    zona = timezone.get_current_timezone()
+    ultimo = calendar.monthrange(fin[0], fin[1])[1]
+
+    return (timezone.make_aware(datetime(inicio[0], inicio[1], 1), zona),
+            timezone.make_aware(datetime.combine(
+                date(fin[0], fin[1], ultimo), time.max), zona))
+
+
+def contar_condiciones(condiciones, inicio, fin):
+    """Cuenta las :class:`Admision`es de cada mes entre inicio y fin,
+    indicados como (año, mes), que cumplen cada una de las condiciones en una
+    sola consulta agrupada por mes
+
+    Las condiciones son parejas de nombre y expresión SQL sobre las columnas
+    momento, neonato, habitacion_id, nacimiento, sexo, anio y mes. Devuelve un
+    :class:`dict` de (año, mes) a los conteos de ese mes"""
+
+    consulta, parametros = Admision.objects.filter(
+        momento__range=rango_meses(inicio, fin)
+    ).order_by().values('momento', 'neonato', 'habitacion',
+                        'paciente__nacimiento',
+                        'paciente__sexo').query.sql_with_params()
+
+    momento = "a.momento AT TIME ZONE '{0}'".format(
+        timezone.get_current_timezone_name())
+    cursor = connection.cursor()
+    cursor.execute(
+        u'SELECT m.anio, m.mes, {0} FROM ('
+        u'SELECT a.*, EXTRACT(YEAR FROM {1}) AS anio, '
+        u'EXTRACT(MONTH FROM {1}) AS mes FROM ({2}) a) m '
+        u'GROUP BY m.anio, m.mes'.format(
+            u', '.join(u'SUM(CASE WHEN {0} THEN 1 ELSE 0 END)'.format(
+                condicion) for llave, condicion in condiciones),
+            momento, consulta),
+        parametros)
+
+    conteos = dict()
+    for anio in range(inicio[0], fin[0] + 1):
+        for mes in range(1, 13):
+            if inicio <= (anio, mes) <= fin:
+                conteos[(anio, mes)] = dict(
+                    (llave, 0) for llave, condicion in condiciones)
+
+    for fila in cursor.fetchall():
+        conteos[(int(fila[0]), int(fila[1]))] = dict(
+            (llave, int(valor or 0))
+            for (llave, condicion), valor in zip(condiciones, fila[2:]))
+
+    return conteos
+
+
+def series_atencion(tipos, anios):
+    """Cuenta las :class:`Admision`es de cada mes de los años indicados para
+    varios tipos de atención a la vez: adulto, infantil, hospitalizacion o
+    ingresos
+
+    Devuelve un :class:`dict` de tipo a un :class:`dict` de año a una lista
+    con la cantidad de cada mes. Los meses cerrados se toman de las
+    estadísticas guardadas y el resto se calcula en una sola consulta"""
+
+    periodos = [(anio, mes, (tipo, )) for tipo in tipos for anio in anios
+                for mes in range(1, 13)]
+
+    def calcular(pendientes):
+        meses = [periodo[:2] for periodo in pendientes]
+        condiciones = [(tipo, SERIES[tipo]) for tipo in tipos]
+        conteos = contar_condiciones(condiciones, min(meses), max(meses))
+
+        return dict((periodo, conteos[periodo[:2]][periodo[2][0]])
+                    for periodo in pendientes)
+
+    valores = instantaneas('atencion', periodos, calcular)
+
+    return dict((tipo, dict(
+        (anio, [valores[(anio, mes, (tipo, ))] for mes in range(1, 13)])
+        for anio in anios)) for tipo in tipos)
+
+
 class Atencion(object):
     """Permite calcular los puntos de ploteo para mostrar en un informe"""
 
-    def calcular_meses(self, context, admisiones):
-        dict_mes = dict((k, v) for k, v in enumerate(calendar.month_abbr))
-        calc_mes = lambda m: (m, admisiones.filter(momento__month=m).count())
-        context['meses'] = dict()
-        parejas = map(calc_mes, range(1, 13))
-        for pareja in parejas:
-            mes = dict_mes[pareja[0]]
-            context['meses'][mes] = pareja[1]
+    def calcular_meses(self, context, tipo, anio):
+        serie = series_atencion([tipo], [anio])[tipo][anio]
+        context['meses'] = dict(
+            (calendar.month_abbr[mes + 1], cantidad)
+            for mes, cantidad in enumerate(serie))
 
-        return ','.join('[{0}, {1}]'.format(p[0], p[1]) for p in parejas)
+        return ','.join('[{0}, {1}]'.format(mes + 1, cantidad)
+                        for mes, cantidad in enumerate(serie))
 
 
 class AtencionAdulto(TemplateView, Atencion, LoginRequiredMixin):
@@ -273,13 +474,8 @@ class AtencionAdulto(TemplateView, Atencion, LoginRequiredMixin):
         if not form.is_valid():
             redirect('admision-estadisticas')
         anio = form.cleaned_data['anio']
-        # obtener la fecha de nacimiento máxima
-        edad_min = date(anio - 18, 12, 31)
-        admisiones = Admision.objects.filter(
-            momento__year=anio,
-            paciente__nacimiento__lte=edad_min)
 
-        context['puntos'] = self.calcular_meses(context, admisiones)
+        context['puntos'] = self.calcular_meses(context, 'adulto', anio)
 
         return context
 
@@ -293,18 +489,38 @@ class AtencionInfantil(TemplateView, Atencion, LoginRequiredMixin):
         if not form.is_valid():
             redirect('admision-estadisticas')
         anio = form.cleaned_data['anio']
-        # obtener la fecha de nacimiento mínima
-        edad_min = date(anio - 18, 12, 31)
-        admisiones = Admision.objects.filter(
-            momento__year=anio,
-            paciente__nacimiento__gte=edad_min)
 
-        context['puntos'] = self.calcular_meses(context, admisiones)
+        context['puntos'] = self.calcular_meses(context, 'infantil', anio)
 
         return context
 
 
+def productividad(inicio, fin):
+    """Cuenta las :class:`Admision`es de cada mes entre inicio y fin,
+    indicados como (año, mes), por edad, sexo y neonatos
+
+    Los meses cerrados se toman de las estadísticas guardadas y el resto se
+    calcula en una sola consulta. Devuelve una lista de parejas de (año, mes)
+    y los conteos de ese mes"""
+
+    periodos = [(anio, mes, ()) for anio in range(inicio[0], fin[0] + 1)
+                for mes in range(1, 13) if inicio <= (anio, mes) <= fin]
+
+    def calcular(pendientes):
+        meses = [periodo[:2] for periodo in pendientes]
+        conteos = contar_condiciones(PRODUCTIVIDAD, min(meses), max(meses))
+
+        return dict((periodo, conteos[periodo[:2]]) for periodo in pendientes)
+
+    valores = instantaneas('productividad', periodos, calcular)
+
+    return [(periodo[:2], valores[periodo]) for periodo in periodos]
+
+
 class Productividad(TemplateView, LoginRequiredMixin):
+    """Muestra la productividad de un mes o, si se indican anio_fin y
+    mes_fin, la de cada mes del rango junto con el total del mismo"""
+
     template_name = 'estadisticas/productividad.html'
 
     def get_context_data(self, **kwargs):
@@ -312,61 +528,18 @@ class Productividad(TemplateView, LoginRequiredMixin):
         form = ReporteMensualForm(self.request.GET)
         if not form.is_valid():
             redirect('admision-estadisticas')
-        anio = form.cleaned_data['anio']
-        mes = form.cleaned_data['mes']
-        # obtener la fecha de nacimiento máxima
-        edad_min = date(anio - 18, 12, 31)
-
-        context['adultos_m'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            paciente__nacimiento__lte=edad_min,
-            paciente__sexo='M').count()
-        context['adultos_f'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            paciente__nacimiento__lte=edad_min,
-            paciente__sexo='F').count()
-        context['adultos'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            paciente__nacimiento__lte=edad_min).count()
-
-        context['infantes_m'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            paciente__nacimiento__gte=edad_min,
-            sexo='M').count()
-        context['infantes_f'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            paciente__nacimiento__gte=edad_min,
-            paciente__sexo='F').count()
-        context['adultos'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            paciente__nacimiento__lte=edad_min).count()
-
-        context['neonatos_m'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            neonato=True,
-            sexo='M').count()
-        context['neonatos_f'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            neonato=True,
-            paciente__sexo='F').count()
-
-        context['neonatos'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            neonato=True).count()
-
-        context['admisiones'] = Admision.objects.filter(
-            momento__year=anio,
-            momento__month=mes,
-            neonato=True).count()
+        inicio = (form.cleaned_data['anio'], form.cleaned_data['mes'])
+        fin = max(inicio, (form.cleaned_data['anio_fin'] or inicio[0],
+                           form.cleaned_data['mes_fin'] or inicio[1]))
+
+        meses = productividad(inicio, fin)
+        for llave, condicion in PRODUCTIVIDAD:
+            context[llave] = sum(conteos[llave] for mes, conteos in meses)
+
+        context['inicio'] = date(inicio[0], inicio[1], 1)
+        context['fin'] = date(fin[0], fin[1], 1)
+        context['meses'] = [(date(anio, mes, 1), conteos)
+                            for (anio, mes), conteos in meses]
 
         return context
 
@@ -380,166 +553,65 @@ class IngresosHospitalarios(TemplateView, Atencion, LoginRequiredMixin):
         if not form.is_valid():
             redirect('admision-estadisticas')
         anio = form.cleaned_data['anio']
-        # obtener la fecha de nacimiento mínima
-        admisiones = Admision.objects.filter(
-            momento__year=anio)
-
-        context['puntos'] = self.calcular_meses(context, admisiones)
-
-        return context
-
-
-class PeriodoMixin(TemplateView):
-    def dispatch(self, request, *args, **kwargs):
-
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        if self.form.is_valid():
-
-            self.inicio = datetime.combine(self.form.cleaned_data['inicio'],
-                                           time.min)
-            self.fin = datetime.combine(self.form.cleaned_data['fin'], time.max)
-
-        else:
-            return redirect('estadisticas')
-
-        return super(PeriodoMixin, self).dispatch(request, *args, **kwargs)
-
-    def get_context_data(self, **kwargs):
-
-        context = super(PeriodoMixin, self).get_context_data(**kwargs)
 
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
+        context['puntos'] = self.calcular_meses(context, 'ingresos', anio)
 
         return context
 
 
-class AdmisionPeriodoMixin(TemplateView):
-    def dispatch(self, request, *args, **kwargs):
-
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        if self.form.is_valid():
-
-            self.inicio = self.form.cleaned_data['inicio']
-            self.fin = self.form.cleaned_data['fin']
-            self.inicio = datetime.combine(self.inicio, time.min)
-            self.fin = datetime.combine(self.fin, time.max)
-            self.admisiones = Admision.objects.filter(
-                admision__range=(self.inicio, self.fin),
-                habitacion__isnull=False)
-
-        else:
-            return redirect('estadisticas')
-
-        return super(AdmisionPeriodoMixin, self).dispatch(request, *args,
-                                                          **kwargs)
-
-    def get_context_data(self, **kwargs):
+class AdmisionPeriodoMixin(PeriodoView):
+    """Obtiene las :class:`Admision`es hospitalizadas durante el periodo"""
 
-        context = super(AdmisionPeriodoMixin, self).get_context_data(**kwargs)
+    def get(self, request, *args, **kwargs):
 
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
+        self.admisiones = Admision.objects.filter(
+            admision__range=(self.inicio, self.fin),
+            habitacion__isnull=False)
 
-        return context
+        return super(AdmisionPeriodoMixin, self).get(request, *args, **kwargs)
 
 
 class HabitacionPopularView(AdmisionPeriodoMixin, LoginRequiredMixin):
     template_name = 'estadisticas/habitacion_popular.html'
-
-    def dispatch(self, request, *args, **kwargs):
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        self.form = PeriodoForm(request.GET, prefix='popular')
-
-        return super(HabitacionPopularView, self).dispatch(request, *args,
-                                                           **kwargs)
+    prefijo = 'popular'
 
     def get_context_data(self, **kwargs):
         context = super(HabitacionPopularView, self).get_context_data(**kwargs)
 
-        habitaciones = defaultdict(HabitacionAdapter)
-        context['total'] = 0
-        context['dias'] = 0
-        for habitacion in Habitacion.objects.all():
-            habitaciones[habitacion].admisiones += self.admisiones.filter(
-                habitacion=habitacion).count()
-
-        for admision in self.admisiones.all():
-            habitaciones[
-                admision.habitacion].dias += admision.tiempo_hospitalizado()
-
-        for habitacion in Habitacion.objects.all():
-            context['total'] += habitaciones[habitacion].admisiones
-            context['dias'] += habitaciones[habitacion].dias
+        habitaciones = resumir_habitaciones(self.admisiones)
+        context['total'] = sum(h.admisiones for h in habitaciones.values())
+        context['dias'] = sum(h.dias for h in habitaciones.values())
 
         context['habitaciones'] = sorted(habitaciones.iteritems())
         return context
 
 
-class DiagnosticoView(AdmisionPeriodoMixin, LoginRequiredMixin):
+class DiagnosticoView(ReportePeriodoView, LoginRequiredMixin):
     template_name = 'estadisticas/diagnostico.html'
+    prefijo = 'diagnostico'
+    reportes = {
+        'diagnosticos': Agregado(Admision, ('diagnostico_normalizado', ),
+                                 (('cantidad', Count('id')), ),
+                                 campo_fecha='admision',
+                                 filtros={'habitacion__isnull': False}),
+    }
 
-    def dispatch(self, request, *args, **kwargs):
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        self.form = PeriodoForm(request.GET, prefix='diagnostico')
-
-        return super(DiagnosticoView, self).dispatch(request, *args, **kwargs)
-
-    def get_context_data(self, **kwargs):
-        context = super(DiagnosticoView, self).get_context_data(**kwargs)
-
-        diangosticos = defaultdict(int)
-
-        for admision in self.admisiones.all():
-            diangosticos[admision.diagnostico.upper()] += 1
 
-        context['diagnosticos'] = sorted(diangosticos.iteritems())
-        return context
-
-
-class DoctorView(AdmisionPeriodoMixin, LoginRequiredMixin):
+class DoctorView(ReportePeriodoView, LoginRequiredMixin):
     template_name = 'estadisticas/doctor.html'
+    prefijo = 'doctor'
+    reportes = {
+        'doctores': Agregado(Admision, ('doctor_normalizado', ),
+                             (('cantidad', Count('id')), ),
+                             campo_fecha='admision',
+                             filtros={'habitacion__isnull': False}),
+    }
 
-    def dispatch(self, request, *args, **kwargs):
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        self.form = PeriodoForm(request.GET, prefix='doctor')
-
-        return super(DoctorView, self).dispatch(request, *args, **kwargs)
-
-    def get_context_data(self, **kwargs):
-        context = super(DoctorView, self).get_context_data(**kwargs)
-
-        doctores = defaultdict(int)
 
-        for admision in self.admisiones.all():
-            doctor = admision.doctor.upper().split('/')[0].rstrip()
-
-            doctores[doctor] += 1
-
-        context['doctores'] = sorted(doctores.iteritems())
-        return context
-
-
-class CargoView(AdmisionPeriodoMixin, LoginRequiredMixin):
+class CargoView(SegundoPlanoMixin, AdmisionPeriodoMixin,
+                LoginRequiredMixin):
     template_name = 'estadisticas/cargo.html'
-
-    def dispatch(self, request, *args, **kwargs):
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        self.form = PeriodoForm(request.GET, prefix='cargos')
-
-        return super(CargoView, self).dispatch(request, *args, **kwargs)
+    prefijo = 'cargos'
 
     def get_context_data(self, **kwargs):
         context = super(CargoView, self).get_context_data(**kwargs)
@@ -557,37 +629,27 @@ class CargoView(AdmisionPeriodoMixin, LoginRequiredMixin):
         return context
 
 
-class AdmisionPeriodo(AdmisionPeriodoMixin, LoginRequiredMixin):
+class AdmisionPeriodo(SegundoPlanoMixin, AdmisionPeriodoMixin,
+                      LoginRequiredMixin):
     template_name = 'estadisticas/admision.html'
-
-    def dispatch(self, request, *args, **kwargs):
-
-        self.form = PeriodoForm(request.GET, prefix='admisiones')
-
-        return super(AdmisionPeriodo, self).dispatch(request, *args, **kwargs)
+    prefijo = 'admisiones'
 
     def get_context_data(self, **kwargs):
 
         context = super(AdmisionPeriodo, self).get_context_data(**kwargs)
         context['admisiones'] = self.admisiones
-        if self.admisiones.count():
-            context['tiempo_promedio'] = sum(a.tiempo_hospitalizado() for a in
-                                             self.admisiones.all()) / self \
-                                             .admisiones.count()
+        habitaciones = resumir_habitaciones(self.admisiones)
+        cantidad = sum(h.admisiones for h in habitaciones.values())
+        if cantidad:
+            context['tiempo_promedio'] = sum(
+                h.dias for h in habitaciones.values()) / cantidad
         else:
             context['tiempo_promedio'] = 0
-            # Calcular todos los cargos efectuados en estas hospitalizaciones
-        cargos = defaultdict(Decimal)
-        habitaciones = defaultdict(int)
-        for admision in self.admisiones:
-
-            for cargo in admision.cargos.all():
-                cargos[cargo.cargo] += cargo.cantidad
-
-            habitaciones[admision.habitacion] += admision.tiempo_hospitalizado()
 
-        context['cargos'] = cargos.items()
-        context['habitaciones'] = habitaciones.items()
+        # Calcular todos los cargos efectuados en estas hospitalizaciones
+        context['cargos'] = sumar_cargos(self.admisiones).items()
+        context['habitaciones'] = [(h, d.dias) for h, d in
+                                   habitaciones.items() if d.admisiones]
         context['total'] = sum(
             a.estado_de_cuenta(True) for a in self.admisiones)
         return context
@@ -595,88 +657,40 @@ class AdmisionPeriodo(AdmisionPeriodoMixin, LoginRequiredMixin):
 
 class TratanteEstadisticaView(AdmisionPeriodoMixin, LoginRequiredMixin):
     template_name = 'estadisticas/tratante.html'
-
-    def dispatch(self, request, *args, **kwargs):
-
-        self.form = PeriodoForm(request.GET, prefix='admisiones')
-
-        return super(TratanteEstadisticaView, self).dispatch(request, *args,
-                                                             **kwargs)
+    prefijo = 'admisiones'
 
     def get_context_data(self, **kwargs):
 
         context = super(TratanteEstadisticaView, self).get_context_data(
             **kwargs)
         context['admisiones'] = self.admisiones
-        if self.admisiones.count():
-            context['tiempo_promedio'] = sum(a.tiempo_hospitalizado() for a in
-                                             self.admisiones.all()) / self \
-                                             .admisiones.count()
+        habitaciones = resumir_habitaciones(self.admisiones)
+        cantidad = sum(h.admisiones for h in habitaciones.values())
+        if cantidad:
+            context['tiempo_promedio'] = sum(
+                h.dias for h in habitaciones.values()) / cantidad
         else:
             context['tiempo_promedio'] = 0
-            # Calcular todos los cargos efectuados en estas hospitalizaciones
-        cargos = defaultdict(Decimal)
-        habitaciones = defaultdict(int)
-        for admision in self.admisiones:
-
-            for cargo in admision.cargos.all():
-                cargos[cargo.cargo] += cargo.cantidad
 
-            habitaciones[admision.habitacion] += admision.tiempo_hospitalizado()
-
-        context['cargos'] = cargos.items()
-        context['habitaciones'] = habitaciones.items()
+        # Calcular todos los cargos efectuados en estas hospitalizaciones
+        context['cargos'] = sumar_cargos(self.admisiones).items()
+        context['habitaciones'] = [(h, d.dias) for h, d in
+                                   habitaciones.items() if d.admisiones]
         return context
 
 
-class EmergenciaPeriodo(TemplateView):
+class EmergenciaPeriodo(ReportePeriodoView, LoginRequiredMixin):
     template_name = 'estadisticas/emergencia.html'
-
-    def dispatch(self, request, *args, **kwargs):
-
-        """Filtra las :class:`Admision` de acuerdo a los datos ingresados en
-        el formulario"""
-
-        self.form = PeriodoForm(request.GET, prefix='emergencia')
-        if self.form.is_valid():
-
-            self.inicio = self.form.cleaned_data['inicio']
-            self.fin = datetime.combine(self.form.cleaned_data['fin'], time.max)
-            self.emergencias = Emergencia.objects.filter(
-                created__gte=self.inicio,
-                created__lte=self.fin
-            )
-
-        else:
-
-            return redirect('estadisticas')
-
-        return super(EmergenciaPeriodo, self).dispatch(request, *args,
-                                                       **kwargs)
+    prefijo = 'emergencia'
+    reportes = {
+        'doctores': Agregado(Emergencia, ('usuario', ),
+                             (('cantidad', Count('id')), ),
+                             orden=('-cantidad', ),
+                             relaciones={'usuario': User}),
+    }
 
     def get_context_data(self, **kwargs):
 
         context = super(EmergenciaPeriodo, self).get_context_data(**kwargs)
-        context['inicio'] = self.inicio
-        context['fin'] = self.fin
-        context['emergencias'] = self.emergencias
-        # Calcular todos los cargos efectuados en estas emergencias
-        cargos = defaultdict(Decimal)
-
-        doctores = defaultdict(int)
-        for emergencia in self.emergencias:
-
-            for cobro in emergencia.cobros.all():
-                cargos[cobro.cargo] += cobro.cantidad
-            doctores[emergencia.usuario] += 1
-
-        context['cargos'] = cargos.items()
-
-        context['doctores'] = reversed(
-            sorted(doctores.items(), key=lambda x: x[1]))
-        context['grafico'] = reversed(
-            sorted(doctores.items(), key=lambda x: x[1]))
-        context['grafico2'] = reversed(
-            sorted(doctores.items(), key=lambda x: x[1]))
-        context['total'] = sum(e.total() for e in self.emergencias)
+        context['grafico'] = context['grafico2'] = context['doctores']
         return context